@@ -0,0 +1,267 @@
+"""
+Computer opponents for the Pong simulation.
+
+``ChaseOpponent`` is the original AI: it moves toward the ball's current
+height every tick. ``InterceptOpponent`` instead predicts where the ball will
+cross its paddle, folding the straight-line path back into the playfield to
+account for wall reflections. The prediction only depends on the ball's
+position and velocity, so it is computed once when the velocity changes
+(paddle hit, wall bounce, serve) and cached; every other tick just moves the
+paddle toward the cached target.
+
+``"policy"`` loads a network trained with ``pong_rl.py`` instead.
+
+Difficulty levels set how long the opponent takes to react to a new
+trajectory, how far off its aim is, and how fast its paddle moves.
+
+Run ``python pong_ai.py`` to compare the cost and the results of the
+opponents.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import random
+import time
+
+
+# Difficulty presets:
+#   reaction: ticks before the opponent reacts to a new ball trajectory
+#   error:    standard deviation of the aiming error in pixels
+#   speed:    fraction of Config.OPPONENT_SPEED the paddle moves per tick
+DIFFICULTIES = {
+    "easy": {"reaction": 18, "error": 60.0, "speed": 0.6},
+    "medium": {"reaction": 8, "error": 30.0, "speed": 0.8},
+    "hard": {"reaction": 3, "error": 10.0, "speed": 1.0},
+}
+
+
+def reflect_into(value, low, high):
+    """
+    Fold a coordinate into [low, high] as if it bounced off both bounds.
+
+    Args:
+        value (float): Unbounded coordinate
+        low (float): Lower bound
+        high (float): Upper bound
+
+    Returns:
+        float: The reflected coordinate
+    """
+    span = high - low
+    if span <= 0:
+        return low
+    offset = (value - low) % (2 * span)
+    return low + (offset if offset <= span else 2 * span - offset)
+
+
+def predict_intercept(x, y, speed_x, speed_y, target_x, low, high):
+    """
+    Where and when a ball crosses a vertical line, including wall reflections.
+
+    Args:
+        x (float): Ball center x
+        y (float): Ball center y
+        speed_x (float): Horizontal speed per tick
+        speed_y (float): Vertical speed per tick
+        target_x (float): x of the line to cross
+        low (float): Smallest reachable ball center y
+        high (float): Largest reachable ball center y
+
+    Returns:
+        tuple: (y, ticks) at the crossing, or None if the ball moves away
+    """
+    if speed_x == 0 or (target_x - x) * speed_x < 0:
+        return None
+    ticks = (target_x - x) / speed_x
+    return reflect_into(y + speed_y * ticks, low, high), ticks
+
+
+class ChaseOpponent:
+    """The original AI: step toward the ball's current height every tick."""
+
+    def __init__(self, simulation):
+        """
+        Args:
+            simulation (PongSimulation): Simulation whose opponent paddle is driven
+        """
+        self.speed = simulation.config.OPPONENT_SPEED
+
+    def reset(self):
+        """Forget any per-rally state (nothing to forget)."""
+
+    def update(self, state):
+        """
+        Move the opponent paddle for one tick.
+
+        Args:
+            state (PongState): State to update in place
+        """
+        if state.opponent_y < state.ball_y:
+            state.opponent_y += self.speed
+        if state.opponent_y > state.ball_y:
+            state.opponent_y -= self.speed
+
+
+class InterceptOpponent:
+    """Moves to the predicted intercept point, recomputed only when the ball's velocity changes."""
+
+    def __init__(self, simulation, difficulty="medium"):
+        """
+        Args:
+            simulation (PongSimulation): Simulation whose opponent paddle is driven
+            difficulty (str): Key of ``DIFFICULTIES``
+        """
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty {difficulty!r}; "
+                             f"expected one of {', '.join(DIFFICULTIES)}")
+        config = simulation.config
+        preset = DIFFICULTIES[difficulty]
+        self.simulation = simulation
+        self.difficulty = difficulty
+        self.reaction = preset["reaction"]
+        self.error = preset["error"]
+        self.speed = config.OPPONENT_SPEED * preset["speed"]
+
+        half_ball = config.BALL_SIZE / 2
+        self.low = half_ball
+        self.high = simulation.height - half_ball
+        # Ball center x when it touches the opponent paddle's face
+        self.contact_x = simulation.opponent_x - half_ball
+        self.recomputes = 0
+        self.reset()
+
+    def reset(self):
+        """Drop the cached trajectory (new game or serve)."""
+        self._speed_x = None
+        self._speed_y = None
+        self._target = self.simulation.height / 2
+        self._pending = None
+        self._react_at = 0
+
+    def _plan(self, state):
+        """Aim point for the current ball trajectory."""
+        multiplier = self.simulation.speed_multiplier
+        hit = predict_intercept(state.ball_x, state.ball_y,
+                                state.ball_speed_x * multiplier,
+                                state.ball_speed_y * multiplier,
+                                self.contact_x, self.low, self.high)
+        if hit is None:
+            # Ball heading to the player: drift back to the center
+            return self.simulation.height / 2
+        return hit[0] + self.simulation.rng.gauss(0.0, self.error)
+
+    def update(self, state):
+        """
+        Move the opponent paddle for one tick.
+
+        Args:
+            state (PongState): State to update in place
+        """
+        if state.ball_speed_x != self._speed_x or state.ball_speed_y != self._speed_y:
+            # New trajectory: plan once, act on it after the reaction delay
+            self._speed_x = state.ball_speed_x
+            self._speed_y = state.ball_speed_y
+            self._pending = self._plan(state)
+            self._react_at = state.tick_count + self.reaction
+            self.recomputes += 1
+        if self._pending is not None and state.tick_count >= self._react_at:
+            self._target = self._pending
+            self._pending = None
+
+        # Most ticks end here: the paddle already waits at the intercept point
+        target = self._target
+        if state.opponent_y == target:
+            return
+        if target > state.opponent_y + self.speed:
+            state.opponent_y += self.speed
+        elif target < state.opponent_y - self.speed:
+            state.opponent_y -= self.speed
+        else:
+            state.opponent_y = target
+
+
+def create_opponent(simulation, kind, difficulty="medium"):
+    """
+    Build the opponent AI selected by name.
+
+    Args:
+        simulation (PongSimulation): Simulation whose opponent paddle is driven
+        kind (str): "intercept", "chase" or "policy" (loads
+            ``Config.OPPONENT_POLICY_PATH``)
+        difficulty (str): Key of ``DIFFICULTIES`` (intercept only)
+
+    Returns:
+        object: Opponent with ``reset()`` and ``update(state)``
+    """
+    if kind == "intercept":
+        return InterceptOpponent(simulation, difficulty)
+    if kind == "chase":
+        return ChaseOpponent(simulation)
+    if kind == "policy":
+        from pong_rl import PolicyOpponent
+        return PolicyOpponent(simulation, simulation.config.OPPONENT_POLICY_PATH)
+    raise ValueError(f"Unknown opponent {kind!r}; expected 'intercept', 'chase' or 'policy'")
+
+
+def benchmark(ticks=200000, seed=0):
+    """
+    Compare the per-tick cost of the opponents and how they fare.
+
+    The player side is driven by a perfect tracker of the ball so that every
+    point is decided by the opponent. ``update`` is timed inside real ticks,
+    so re-planning after hits and bounces is part of the cost; the cost of
+    the timer itself is measured once and subtracted.
+
+    Args:
+        ticks (int): Ticks simulated per opponent
+        seed (int): Seed for the simulations
+
+    Returns:
+        dict: opponent label -> {"us_per_tick", "points_lost", "points_won"}
+    """
+    from pong_config import Config
+    from pong_simulation import EVENT_OPPONENT_SCORED, EVENT_PLAYER_SCORED, PongSimulation
+
+    def timed(update, spent):
+        def timed_update(state):
+            start = time.perf_counter()
+            update(state)
+            spent[0] += time.perf_counter() - start
+        return timed_update
+
+    # Cost of timing a call that does nothing
+    spent = [0.0]
+    nothing = timed(lambda state: None, spent)
+    for _ in range(ticks):
+        nothing(None)
+    overhead = spent[0] / ticks
+
+    candidates = [("chase", None)] + [("intercept", level) for level in DIFFICULTIES]
+    results = {}
+    for kind, level in candidates:
+        simulation = PongSimulation(Config.DEFAULT_WIDTH, Config.DEFAULT_HEIGHT, Config,
+                                    rng=random.Random(seed))
+        opponent = simulation.opponent = create_opponent(simulation, kind, level or "medium")
+        spent = [0.0]
+        opponent.update = timed(opponent.update, spent)
+        simulation.reset_game()
+
+        won = lost = 0
+        for _ in range(ticks):
+            events = simulation.tick(simulation.state.ball_y)
+            won += events.count(EVENT_OPPONENT_SCORED)
+            lost += events.count(EVENT_PLAYER_SCORED)
+            if simulation.winner is not None:
+                simulation.reset_game()
+        cost = max(spent[0] / ticks - overhead, 0.0) * 1e6
+
+        label = kind if level is None else f"{kind}/{level}"
+        results[label] = {"us_per_tick": cost, "points_lost": lost, "points_won": won}
+        print(f"{label:<18}{cost:8.3f} us/tick   points lost {lost:5d}   won {won:5d}")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,487 @@
+"""
+Vectorized batch simulator for many concurrent Pong matches.
+
+``BatchSimulation`` holds N independent matches as structure-of-arrays NumPy
+buffers and advances all of them with one vectorized ``tick``. The rules are
+those of ``PongSimulation.tick`` under the same settings: walls, paddles,
+randomized collision speed, minimum vertical speed and scoring, with
+``BALL_SPEED_MULTIPLIER``, swept or discrete collisions
+(``SWEPT_COLLISIONS``) and the intercept or chase opponent (``OPPONENT_AI``,
+``OPPONENT_DIFFICULTY``). That makes it suitable for tuning
+``Config.OPPONENT_SPEED``, the ball speed ranges and
+``BALL_MIN_VERTICAL_SPEED`` over huge numbers of matches.
+
+Every match has its own SplitMix64 random stream, so results are reproducible
+per match regardless of how many matches share the batch. The streams differ
+from ``random.Random``, so single matches are not bit-identical to
+``PongSimulation``; match statistics are the same.
+
+Run ``python pong_batch.py`` for a throughput benchmark.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import time
+
+import numpy as np
+
+from pong_ai import DIFFICULTIES
+from pong_config import Config
+from pong_simulation import MAX_SWEEP_CONTACTS
+
+
+# Winner codes stored in BatchSimulation.winner
+NO_WINNER = 0
+PLAYER_WON = 1
+COMPUTER_WON = 2
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+class BatchSimulation:
+    """
+    N Pong matches advanced in lock-step.
+
+    Args:
+        width (int): Playfield width in pixels
+        height (int): Playfield height in pixels
+        config: Object exposing the ``Config`` game/ball/paddle attributes
+        count (int): Number of concurrent matches
+        seed (int): Base seed for the per-match random streams
+        opponent (str): "intercept" or "chase" for ticks without an
+            ``opponent_move``; defaults to ``config.OPPONENT_AI``
+    """
+
+    def __init__(self, width, height, config, count, seed=0, opponent=None):
+        self.width = width
+        self.height = height
+        self.config = config
+        self.count = count
+
+        self.player_x = config.PADDLE_MARGIN
+        self.opponent_x = width - config.PADDLE_MARGIN - config.PADDLE_WIDTH
+        self.swept = config.SWEPT_COLLISIONS
+        self.speed_multiplier = config.BALL_SPEED_MULTIPLIER
+
+        self.opponent = opponent or config.OPPONENT_AI
+        if self.opponent not in ("intercept", "chase"):
+            raise ValueError(f"Unknown batch opponent {self.opponent!r}; expected 'intercept' "
+                             f"or 'chase' (drive a policy through opponent_move)")
+        preset = DIFFICULTIES[config.OPPONENT_DIFFICULTY]
+        self.reaction = preset["reaction"]
+        self.aim_error = preset["error"]
+        self.intercept_speed = config.OPPONENT_SPEED * preset["speed"]
+
+        # Per-match RNG state (SplitMix64)
+        self.rng_state = (np.arange(count, dtype=np.uint64) * _GOLDEN_GAMMA
+                          + np.uint64(seed))
+
+        self.ball_x = np.empty(count)
+        self.ball_y = np.empty(count)
+        self.ball_speed_x = np.empty(count)
+        self.ball_speed_y = np.empty(count)
+        self.player_y = np.empty(count)
+        self.opponent_y = np.empty(count)
+        self.player_score = np.zeros(count, dtype=np.int32)
+        self.opponent_score = np.zeros(count, dtype=np.int32)
+        self.winner = np.zeros(count, dtype=np.int8)
+        self.tick_count = np.zeros(count, dtype=np.int64)
+        self.paddle_hits = np.zeros(count, dtype=np.int64)
+
+        # Intercept opponent: trajectory it planned for (NaN = none yet), the
+        # aim point it moves to, a planned aim waiting for the reaction delay
+        # (NaN = none) and the tick it takes over
+        self.planned_speed_x = np.empty(count)
+        self.planned_speed_y = np.empty(count)
+        self.aim = np.empty(count)
+        self.pending_aim = np.empty(count)
+        self.react_at = np.zeros(count, dtype=np.int64)
+
+        self.reset_game(np.ones(count, dtype=bool))
+
+    # -------------------------------------------------------------------------
+    # Random streams
+    # -------------------------------------------------------------------------
+
+    def _random(self, mask=None):
+        """Next uniform float in [0, 1) from each selected match's stream."""
+        if mask is None:
+            self.rng_state += _GOLDEN_GAMMA
+            z = self.rng_state.copy()
+        else:
+            self.rng_state[mask] += _GOLDEN_GAMMA
+            z = self.rng_state[mask]
+        z ^= z >> np.uint64(30)
+        z *= _MIX_1
+        z ^= z >> np.uint64(27)
+        z *= _MIX_2
+        z ^= z >> np.uint64(31)
+        return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+    def _randint(self, low, high, mask):
+        """Inclusive integer range, like random.randint."""
+        return np.floor(low + self._random(mask) * (high - low + 1))
+
+    def _sign(self, mask):
+        """Random +1/-1, like random.choice([1, -1])."""
+        return np.where(self._random(mask) < 0.5, 1.0, -1.0)
+
+    def _gauss(self, mask):
+        """Standard normal samples (Box-Muller), like random.gauss(0, 1)."""
+        radius = np.sqrt(-2.0 * np.log(1.0 - self._random(mask)))
+        return radius * np.cos(2.0 * np.pi * self._random(mask))
+
+    # -------------------------------------------------------------------------
+    # Resetting
+    # -------------------------------------------------------------------------
+
+    def reset_game(self, mask):
+        """
+        Start a fresh game in the selected matches.
+
+        Args:
+            mask (numpy.ndarray): Boolean array selecting matches to reset
+        """
+        config = self.config
+        self.player_score[mask] = 0
+        self.opponent_score[mask] = 0
+        self.player_y[mask] = self.height / 2
+        self.opponent_y[mask] = self.height / 2
+        self.ball_x[mask] = self.width / 2
+        self.ball_y[mask] = self.height / 2
+        self.winner[mask] = NO_WINNER
+        self.tick_count[mask] = 0
+        self.paddle_hits[mask] = 0
+        self.planned_speed_x[mask] = np.nan
+        self.planned_speed_y[mask] = np.nan
+        self.aim[mask] = self.height / 2
+        self.pending_aim[mask] = np.nan
+        self.react_at[mask] = 0
+
+        speed = self._randint(config.BALL_INITIAL_SPEED_MIN, config.BALL_INITIAL_SPEED_MAX, mask)
+        self.ball_speed_x[mask] = speed * self._sign(mask)
+        self.ball_speed_y[mask] = speed * self._sign(mask)
+
+    def _reset_ball(self, mask):
+        self.ball_x[mask] = self.width / 2
+        self.ball_y[mask] = self.height / 2
+        self.ball_speed_x[mask] *= -1
+        self.ball_speed_y[mask] *= self._sign(mask)
+
+    # -------------------------------------------------------------------------
+    # Stepping
+    # -------------------------------------------------------------------------
+
+    def tick(self, player_input=None, opponent_move=None):
+        """
+        Advance every unfinished match by one fixed physics update.
+
+        Args:
+            player_input (numpy.ndarray): Target paddle center y per match (NaN for
+                no input), or None to leave the player paddles where they are
+            opponent_move (numpy.ndarray): Opponent paddle movement per match in
+                pixels, replacing the built-in opponent, or None
+        """
+        config = self.config
+        active = self.winner == NO_WINNER
+        half_ball = config.BALL_SIZE / 2
+        half_paddle = config.PADDLE_HEIGHT / 2
+
+        # Player control
+        if player_input is not None:
+            has_input = active & ~np.isnan(player_input)
+            self.player_y += np.where(
+                has_input, (player_input - self.player_y) * config.SMOOTHING_FACTOR, 0.0
+            )
+
+        if opponent_move is not None:
+            # Externally controlled opponent (e.g. a policy being trained)
+            self.opponent_y += np.where(active, opponent_move, 0.0)
+        elif self.opponent == "intercept":
+            self._intercept(active)
+        else:
+            # Chase opponent (two sequential checks, as in pong_ai.ChaseOpponent)
+            speed = np.where(active, config.OPPONENT_SPEED, 0.0)
+            self.opponent_y += np.where(self.opponent_y < self.ball_y, speed, 0.0)
+            self.opponent_y -= np.where(self.opponent_y > self.ball_y, speed, 0.0)
+
+        # Move ball and resolve collisions
+        if self.swept:
+            self._move_ball_swept(active)
+        else:
+            self._move_ball_discrete(active)
+
+        # Scoring & win condition
+        opponent_point = active & (self.ball_x - half_ball <= 0)
+        self.opponent_score[opponent_point] += 1
+        computer_won = opponent_point & (self.opponent_score >= config.WINNING_SCORE)
+        self.winner[computer_won] = COMPUTER_WON
+
+        player_point = active & ~opponent_point & (self.ball_x + half_ball >= self.width)
+        self.player_score[player_point] += 1
+        player_won = player_point & (self.player_score >= config.WINNING_SCORE)
+        self.winner[player_won] = PLAYER_WON
+
+        serve = (opponent_point & ~computer_won) | (player_point & ~player_won)
+        if serve.any():
+            self._reset_ball(serve)
+
+        # Paddle bounds
+        np.clip(self.player_y, half_paddle, self.height - half_paddle, out=self.player_y)
+        np.clip(self.opponent_y, half_paddle, self.height - half_paddle, out=self.opponent_y)
+
+        self.tick_count += active
+
+    def _intercept(self, active):
+        """Vectorized ``pong_ai.InterceptOpponent.update``."""
+        config = self.config
+        multiplier = self.speed_multiplier
+        # Plan once per new trajectory, act on it after the reaction delay
+        new = active & ((self.ball_speed_x != self.planned_speed_x) |
+                        (self.ball_speed_y != self.planned_speed_y))
+        if new.any():
+            self.planned_speed_x[new] = self.ball_speed_x[new]
+            self.planned_speed_y[new] = self.ball_speed_y[new]
+            self.react_at[new] = self.tick_count[new] + self.reaction
+
+            half_ball = config.BALL_SIZE / 2
+            speed_x = self.ball_speed_x * multiplier
+            distance = self.opponent_x - half_ball - self.ball_x
+            incoming = new & (speed_x != 0) & (distance * speed_x >= 0)
+            self.pending_aim[new] = self.height / 2  # Ball heading away: back to the center
+            if incoming.any():
+                ticks = distance[incoming] / speed_x[incoming]
+                low, span = half_ball, self.height - 2 * half_ball
+                y = (self.ball_y[incoming] + self.ball_speed_y[incoming] * multiplier * ticks
+                     - low) % (2 * span)
+                y = low + np.where(y <= span, y, 2 * span - y)
+                self.pending_aim[incoming] = y + self._gauss(incoming) * self.aim_error
+        react = active & ~np.isnan(self.pending_aim) & (self.tick_count >= self.react_at)
+        self.aim[react] = self.pending_aim[react]
+        self.pending_aim[react] = np.nan
+
+        speed = self.intercept_speed
+        up = active & (self.aim > self.opponent_y + speed)
+        down = active & ~up & (self.aim < self.opponent_y - speed)
+        snap = active & ~up & ~down
+        self.opponent_y[up] += speed
+        self.opponent_y[down] -= speed
+        self.opponent_y[snap] = self.aim[snap]
+
+    def _move_ball_discrete(self, active):
+        """Move a full step, then test for overlaps (``SWEPT_COLLISIONS = False``)."""
+        half_ball = self.config.BALL_SIZE / 2
+        self.ball_x += np.where(active, self.ball_speed_x * self.speed_multiplier, 0.0)
+        self.ball_y += np.where(active, self.ball_speed_y * self.speed_multiplier, 0.0)
+
+        # Collisions: walls
+        wall = active & ((self.ball_y - half_ball <= 0) |
+                         (self.ball_y + half_ball >= self.height))
+        self.ball_speed_y[wall] *= -1
+
+        # Collisions: paddles
+        hit = active & (self._overlaps(self.player_x, self.player_y) |
+                        self._overlaps(self.opponent_x, self.opponent_y))
+        if hit.any():
+            self._paddle_bounce(hit)
+
+    def _move_ball_swept(self, active):
+        """
+        Vectorized ``PongSimulation._move_ball_swept``: every contact within
+        the tick is resolved at its time of impact.
+        """
+        config = self.config
+        half_ball = config.BALL_SIZE / 2
+        dx = np.where(active, self.ball_speed_x * self.speed_multiplier, 0.0)
+        dy = np.where(active, self.ball_speed_y * self.speed_multiplier, 0.0)
+
+        # Only balls whose path reaches a wall or a paddle column need sweeping
+        end_y = self.ball_y + dy
+        left = self.ball_x - half_ball + np.minimum(dx, 0.0)
+        right = self.ball_x + half_ball + np.maximum(dx, 0.0)
+        near = active & ((end_y <= half_ball) | (end_y >= self.height - half_ball) |
+                         ((left < self.player_x + config.PADDLE_WIDTH) &
+                          (right > self.player_x)) |
+                         ((left < self.opponent_x + config.PADDLE_WIDTH) &
+                          (right > self.opponent_x)))
+        free = active & ~near
+        self.ball_x[free] += dx[free]
+        self.ball_y[free] = end_y[free]
+
+        index = np.flatnonzero(near)
+        remaining = np.ones(len(index))
+        for _ in range(MAX_SWEEP_CONTACTS):
+            if len(index) == 0:
+                return
+            contact_time, paddle_contact = self._sweep(index, remaining)
+            contact = np.isfinite(contact_time)
+            step = np.where(contact, contact_time, 1.0)
+            self.ball_x[index] += self.ball_speed_x[index] * self.speed_multiplier * \
+                remaining * step
+            self.ball_y[index] += self.ball_speed_y[index] * self.speed_multiplier * \
+                remaining * step
+            remaining *= 1.0 - step
+
+            bounced = np.zeros(self.count, dtype=bool)
+            bounced[index[paddle_contact]] = True
+            if paddle_contact.any():
+                self._paddle_bounce(bounced)
+            self.ball_speed_y[index[contact & ~paddle_contact]] *= -1
+            index, remaining = index[contact], remaining[contact]
+        # Out of contact budget: the rest of the step is dropped, as in PongSimulation
+
+    def _sweep(self, index, remaining):
+        """
+        First contact of the selected balls over the rest of their step.
+
+        Args:
+            index (numpy.ndarray): Indices of the matches to sweep
+            remaining (numpy.ndarray): Fraction of the step left per match
+
+        Returns:
+            tuple: (contact_time, paddle_contact) per match; contact_time is
+            inf where the ball meets nothing
+        """
+        config = self.config
+        size = config.BALL_SIZE
+        half_ball = size / 2
+        dx = self.ball_speed_x[index] * self.speed_multiplier * remaining
+        dy = self.ball_speed_y[index] * self.speed_multiplier * remaining
+        ball_y = self.ball_y[index]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Walls (pong_collision.sweep_bounds)
+            wall_time = np.where(dy < 0, (half_ball - ball_y) / dy,
+                                 (self.height - half_ball - ball_y) / dy)
+            wall_time = np.where((dy == 0) | (wall_time > 1), np.inf,
+                                 np.maximum(wall_time, 0.0))
+
+            # The paddle guarding the goal the ball moves toward
+            # (pong_collision.sweep_aabb against the ball's box)
+            toward_player = dx < 0
+            paddle_x = np.where(toward_player, self.player_x, self.opponent_x)
+            paddle_top = np.where(toward_player, self.player_y[index],
+                                  self.opponent_y[index]) - config.PADDLE_HEIGHT / 2
+            x = self.ball_x[index] - half_ball
+            y = ball_y - half_ball
+            t1 = (paddle_x - size - x) / dx
+            t2 = (paddle_x + config.PADDLE_WIDTH - x) / dx
+            x_entry, x_exit = np.minimum(t1, t2), np.maximum(t1, t2)
+            t1 = (paddle_top - size - y) / dy
+            t2 = (paddle_top + config.PADDLE_HEIGHT - y) / dy
+            y_entry = np.where(dy == 0, -np.inf, np.minimum(t1, t2))
+            y_exit = np.where(dy == 0, np.inf, np.maximum(t1, t2))
+            entry = np.maximum(x_entry, y_entry)
+            exit_ = np.minimum(x_exit, y_exit)
+        inside_y = (paddle_top - size < y) & (y < paddle_top + config.PADDLE_HEIGHT)
+        paddle_hit = (dx != 0) & ((dy != 0) | inside_y) & \
+            (entry < exit_) & (exit_ > 0) & (entry <= 1)
+        # Already overlapping: only a contact while still moving into the paddle
+        center_x = x + half_ball - (paddle_x + config.PADDLE_WIDTH / 2)
+        center_y = y + half_ball - (paddle_top + config.PADDLE_HEIGHT / 2)
+        paddle_hit &= (entry >= 0) | (center_x * dx + center_y * dy < 0)
+        paddle_time = np.where(paddle_hit, np.maximum(entry, 0.0), np.inf)
+        return np.minimum(wall_time, paddle_time), paddle_time < wall_time
+
+    def _paddle_bounce(self, hit):
+        """Reverse the selected balls and randomize their speed after a paddle hit."""
+        config = self.config
+        sign_x = np.where(-self.ball_speed_x[hit] > 0, 1.0, -1.0)  # Reversed direction
+        new_speed_x = self._randint(config.BALL_COLLISION_SPEED_MIN,
+                                    config.BALL_COLLISION_SPEED_MAX, hit)
+        self.ball_speed_x[hit] = new_speed_x * sign_x
+        speed_y = self.ball_speed_y[hit] + (self._random(hit) * 6.0 - 3.0)
+        too_flat = np.abs(speed_y) < config.BALL_MIN_VERTICAL_SPEED
+        speed_y[too_flat] = np.where(speed_y[too_flat] >= 0, 1.0, -1.0) * \
+            config.BALL_MIN_VERTICAL_SPEED
+        self.ball_speed_y[hit] = speed_y
+        self.paddle_hits[hit] += 1
+
+    def _overlaps(self, paddle_x, paddle_y):
+        """Rect-style overlap test between every ball and one paddle column."""
+        config = self.config
+        ball_left = self.ball_x - config.BALL_SIZE / 2
+        ball_top = self.ball_y - config.BALL_SIZE / 2
+        paddle_top = paddle_y - config.PADDLE_HEIGHT / 2
+        return ((ball_left < paddle_x + config.PADDLE_WIDTH) &
+                (ball_left + config.BALL_SIZE > paddle_x) &
+                (ball_top < paddle_top + config.PADDLE_HEIGHT) &
+                (ball_top + config.BALL_SIZE > paddle_top))
+
+    def run(self, max_ticks, player_input_fn=None):
+        """
+        Tick until every match is decided or ``max_ticks`` is reached.
+
+        Args:
+            max_ticks (int): Upper bound on the number of ticks
+            player_input_fn (callable): Called with this batch each tick and
+                returning the ``player_input`` array (or None)
+
+        Returns:
+            int: Number of ticks run
+        """
+        for ticks in range(max_ticks):
+            if not (self.winner == NO_WINNER).any():
+                return ticks
+            self.tick(player_input_fn(self) if player_input_fn else None)
+        return max_ticks
+
+    def summary(self):
+        """
+        Aggregate results over all matches.
+
+        Returns:
+            dict: Win counts, unfinished matches, mean match length and rally hits
+        """
+        return {
+            "matches": self.count,
+            "player_wins": int((self.winner == PLAYER_WON).sum()),
+            "computer_wins": int((self.winner == COMPUTER_WON).sum()),
+            "unfinished": int((self.winner == NO_WINNER).sum()),
+            "mean_ticks": float(self.tick_count.mean()),
+            "mean_paddle_hits": float(self.paddle_hits.mean()),
+        }
+
+
+def chase_ball(batch):
+    """
+    Player input that tracks the ball exactly, useful as a baseline opponent.
+
+    Args:
+        batch (BatchSimulation): The batch being simulated
+
+    Returns:
+        numpy.ndarray: Target paddle center y per match
+    """
+    return batch.ball_y
+
+
+def benchmark(count=10000, ticks=2000):
+    """
+    Measure batch throughput in match-steps per second.
+
+    Args:
+        count (int): Number of concurrent matches
+        ticks (int): Number of ticks to run
+
+    Returns:
+        float: Match-steps per second
+    """
+    batch = BatchSimulation(Config.DEFAULT_WIDTH, Config.DEFAULT_HEIGHT, Config, count)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        batch.tick(batch.ball_y)
+    elapsed = time.perf_counter() - start
+    rate = count * ticks / elapsed
+    print(f"{count} matches x {ticks} ticks in {elapsed:.2f}s "
+          f"-> {rate / 1e6:.2f}M match-steps/s")
+    print(batch.summary())
+    return rate
+
+
+if __name__ == "__main__":
+    benchmark()
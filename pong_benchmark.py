@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Camera-free benchmark of the full tracking and game pipeline.
+
+Replays a recorded session, a video file, an image sequence or a synthetic
+hand motion through the tracking pipeline, the simulation and the renderer
+as fast as possible, then reports throughput and per-stage latency.
+
+Examples::
+
+    python pong_benchmark.py --synthetic 3000
+    python pong_benchmark.py --session recordings/session1
+    python pong_benchmark.py --session recordings/session1 --inference mediapipe
+    python pong_benchmark.py --video clip.mp4 --export bench.json
+    python pong_benchmark.py --video clip.mp4 --inference color
+
+Sessions are recorded in game by setting ``Config.RECORD_SESSION``.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pygame
+
+from pong_capture import open_capture
+from pong_config import Config, add_config_arguments, configure
+from pong_filters import PaddleTargets
+from pong_frames import FrameSurface
+from pong_pipeline import HandRegion, TrackingPipeline, finger_diffs, hand_points, hands_needed
+from pong_profiler import FrameProfiler
+from pong_render import GameRenderer
+from pong_simulation import PongSimulation
+from pong_sources import RecordedHands, RecordedSession, open_frame_source, synthetic_session
+from pong_trackers import TRACKERS, create_tracker
+
+
+def build_pipeline(args, profiler):
+    """
+    Create the frame source and tracking pipeline described by the arguments.
+
+    Args:
+        args (argparse.Namespace): Parsed command line
+        profiler (FrameProfiler): Profiler for the pipeline stages
+
+    Returns:
+        TrackingPipeline: A pipeline ready for ``process_next`` calls
+    """
+    if args.synthetic:
+        session = synthetic_session(args.synthetic, hands=args.players)
+    elif args.session:
+        session = RecordedSession(args.session)
+    else:
+        session = None
+
+    if session is not None:
+        source = session.frame_source()
+    else:
+        spec = args.camera if args.camera is not None else (args.video or args.images)
+        if args.camera is not None:
+            source = open_capture(Config, spec, loop=False, realtime=False)
+        else:
+            source = open_frame_source(spec)
+        if not source.isOpened():
+            print(f"Error: Could not open {spec}")
+            sys.exit(1)
+
+    if args.inference == "recorded":
+        if session is None:
+            print("Error: --inference recorded needs --session or --synthetic")
+            sys.exit(1)
+        # Replayed landmarks: one process() call per frame, so no region of interest
+        return TrackingPipeline(source, RecordedHands(session), None, None,
+                                draw_landmarks=False, profiler=profiler)
+
+    tracker = create_tracker(args.inference, Config, hands_needed(Config))
+    region = None
+    if Config.TRACKING_ROI and tracker.supports_region:
+        region = HandRegion(Config.TRACKING_ROI_PADDING, Config.TRACKING_ROI_MIN_SIZE,
+                            hands_needed(Config))
+    return TrackingPipeline(source, tracker, tracker.mp_hands, tracker.mp_drawing,
+                            region=region, inference_scale=Config.TRACKING_INFERENCE_SCALE,
+                            profiler=profiler)
+
+
+def run_benchmark(args):
+    """
+    Replay the selected input through tracking, physics and rendering.
+
+    Args:
+        args (argparse.Namespace): Parsed command line
+
+    Returns:
+        dict: Per-stage statistics in milliseconds plus overall throughput
+    """
+    # Render off-screen unless a real display driver was requested
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    Config.TWO_PLAYER = args.players == 2
+    pygame.init()
+    screen = pygame.display.set_mode((args.width, args.height))
+    width, height = screen.get_size()
+
+    profiler = FrameProfiler(enabled=True, window=args.window)
+    pipeline = build_pipeline(args, profiler)
+    simulation = PongSimulation(width, height, Config)
+    renderer = GameRenderer(screen, pygame.font.Font(None, 74), Config)
+    preview = FrameSurface((Config.CAMERA_PREVIEW_WIDTH, Config.CAMERA_PREVIEW_HEIGHT))
+
+    paddle_size = (Config.PADDLE_WIDTH, Config.PADDLE_HEIGHT)
+    player_paddle = pygame.Rect((simulation.player_x, 0), paddle_size)
+    opponent_paddle = pygame.Rect((simulation.opponent_x, 0), paddle_size)
+    ball = pygame.Rect(0, 0, Config.BALL_SIZE, Config.BALL_SIZE)
+
+    # Same input path as the game: calibrated finger measures through the paddle filters
+    paddles = PaddleTargets([tuple(args.calibration)] * args.players, height, Config)
+    simulation.input_smoothing = 1.0
+    last_sequence = 0
+    frames = 0
+    start = time.perf_counter()
+
+    # Ctrl+C ends a run on a live camera and still prints the statistics
+    try:
+        while args.frames is None or frames < args.frames:
+            if pipeline.process_next() is None:
+                break
+            result = pipeline.latest()
+            if result is None:
+                continue  # Frame read, but an asynchronous tracker has no result yet
+
+            with profiler.scope("control"):
+                if result.sequence != last_sequence:
+                    last_sequence = result.sequence
+                    paddles.update(finger_diffs(hand_points(result.hand_landmarks),
+                                                result.handedness, args.players,
+                                                Config.PLAYER_ASSIGNMENT),
+                                   result.timestamp)
+                targets = paddles.predict(time.perf_counter() + Config.INPUT_DISPLAY_LATENCY)
+
+            if not args.no_render:
+                with profiler.scope("preview"):
+                    frame_surface = preview.update(result.frame)
+
+            with profiler.scope("physics"):
+                simulation.tick(targets[0], targets[1])
+                if simulation.winner is not None:
+                    simulation.reset_game()
+
+            if not args.no_render:
+                with profiler.scope("draw"):
+                    state = simulation.state
+                    player_paddle.centery = round(state.player_y)
+                    opponent_paddle.centery = round(state.opponent_y)
+                    ball.center = (round(state.ball_x), round(state.ball_y))
+                    renderer.draw((player_paddle, opponent_paddle), ball, state.trail.newest(),
+                                  (state.player_score, state.opponent_score), frame_surface, True)
+                with profiler.scope("present"):
+                    renderer.present()
+
+            profiler.record("capture_to_present", time.perf_counter() - result.timestamp)
+            profiler.end_frame()
+            frames += 1
+    except KeyboardInterrupt:
+        pass
+
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+
+    summary = profiler.stats()
+    print(f"\n{frames} frames in {elapsed:.2f}s -> {frames / elapsed if elapsed else 0:.1f} FPS")
+    print(f"{'stage':<20}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    for name, values in summary.items():
+        print(f"{name:<20}{values['mean']:9.3f}{values['p50']:9.3f}"
+              f"{values['p95']:9.3f}{values['p99']:9.3f}")
+    print(f"Pipeline: {pipeline.stats()}")
+
+    if args.export:
+        profiler.export(args.export)
+        print(f"Exported stage statistics to {args.export}")
+
+    summary["throughput_fps"] = frames / elapsed if elapsed else 0.0
+    return summary
+
+
+def parse_args(argv=None, configured=False):
+    """
+    Parse the benchmark command line and apply the layered settings to ``Config``.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+        configured (bool): The caller already applied the settings layers
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Pong pipeline without a camera.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--session", help="recorded session base name (.npz/.avi)")
+    source.add_argument("--video", help="video file to run hand tracking on")
+    source.add_argument("--images", help="image directory or glob pattern")
+    source.add_argument("--synthetic", type=int, metavar="FRAMES",
+                        help="generate a synthetic session with this many frames")
+    source.add_argument("--camera", metavar="SOURCE",
+                        help="live camera index (or any Config.CAMERA_SOURCE value)")
+    parser.add_argument("--inference", choices=("recorded",) + TRACKERS,
+                        help="replay recorded landmarks or run a tracking backend "
+                             "(default: recorded for sessions, Config.TRACKER_BACKEND otherwise)")
+    parser.add_argument("--frames", type=int, help="stop after this many frames")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1,
+                        help="drive one paddle, or both in a two-player game")
+    parser.add_argument("--no-render", action="store_true", help="skip preview and drawing")
+    parser.add_argument("--width", type=int, help="default: Config.DEFAULT_WIDTH")
+    parser.add_argument("--height", type=int, help="default: Config.DEFAULT_HEIGHT")
+    parser.add_argument("--calibration", type=float, nargs=2, default=(0.0, 0.2),
+                        metavar=("MIN", "MAX"), help="finger range used for control")
+    parser.add_argument("--window", type=int, default=100000,
+                        help="samples kept per stage for percentiles")
+    parser.add_argument("--export", help="write stage statistics to a CSV or JSON file")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    if not configured:
+        configure(parser, args)
+    args.width = args.width or Config.DEFAULT_WIDTH
+    args.height = args.height or Config.DEFAULT_HEIGHT
+    if args.inference is None:
+        args.inference = ("recorded" if (args.session or args.synthetic)
+                          else Config.TRACKER_BACKEND)
+    return args
+
+
+if __name__ == "__main__":
+    run_benchmark(parse_args())
@@ -0,0 +1,231 @@
+"""
+Statistics-based calibration of the player's finger motion range.
+
+Each calibration stage collects finger measurements into a fixed-size NumPy
+ring buffer and estimates the extreme of the range with a percentile instead
+of the single most extreme frame, so one misdetected frame cannot ruin the
+range. A stage ends early once it has run for a minimum time, the estimate
+has moved away from the pose the hand was in when the stage began (the
+player reacted to the prompt) and has then stopped moving (the player holds
+the position). Otherwise it ends when its countdown runs out.
+
+Calibrated ranges can be stored per player in a JSON file and reloaded on the
+next start to skip calibration.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+
+class SampleRing:
+    """Fixed-capacity ring buffer of float samples."""
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity (int): Number of most recent samples kept
+        """
+        self.capacity = capacity
+        self._data = np.empty(capacity, dtype=np.float64)
+        self._next = 0
+        self.count = 0
+
+    def append(self, value):
+        """
+        Store a sample, overwriting the oldest one when full.
+
+        Args:
+            value (float): Sample to store
+        """
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def values(self):
+        """
+        Samples currently stored (unordered).
+
+        Returns:
+            numpy.ndarray: View of the stored samples
+        """
+        return self._data[:self.count]
+
+    def clear(self):
+        """Drop all samples."""
+        self._next = 0
+        self.count = 0
+
+
+class RangeEstimator:
+    """
+    Robust estimate of one end of the finger range.
+
+    Args:
+        high (bool): True to estimate the raised (maximum) end, False for the lowered end
+        capacity (int): Samples kept in the ring buffer
+        percentile (float): Percentile used as the extreme, e.g. 90 (mirrored for the low end)
+        min_samples (int): Samples needed before the estimate can converge
+        tolerance (float): Largest estimate change that still counts as stable
+        stable_samples (int): Consecutive stable samples that end the stage
+        min_time (float): Seconds of samples needed before the estimate can converge
+        initial_samples (int): Samples whose estimate is the starting pose
+    """
+
+    def __init__(self, high, capacity=90, percentile=90, min_samples=20, tolerance=0.005,
+                 stable_samples=15, min_time=1.5, initial_samples=5):
+        self.high = high
+        self.samples = SampleRing(capacity)
+        self.percentile = percentile if high else 100 - percentile
+        self.min_samples = min_samples
+        self.tolerance = tolerance
+        self.stable_samples = stable_samples
+        self.min_time = min_time
+        self.initial_samples = initial_samples
+        self.estimate = None
+        self.initial = None  # Estimate of the pose held when the stage began
+        self._stable = 0
+        self._first_time = None
+        self._last_time = None
+
+    def add(self, value, timestamp=None):
+        """
+        Add a measurement and update the estimate.
+
+        Args:
+            value (float): Finger measurement (``finger_diff``)
+            timestamp (float): Capture time of the measurement in seconds,
+                or None to use ``time.perf_counter()``
+
+        Returns:
+            float: The updated estimate
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        if self._first_time is None:
+            self._first_time = timestamp
+        self._last_time = timestamp
+        self.samples.append(value)
+        estimate = float(np.percentile(self.samples.values(), self.percentile))
+        if self.samples.count == self.initial_samples:
+            self.initial = estimate
+        if self.estimate is not None and abs(estimate - self.estimate) <= self.tolerance:
+            self._stable += 1
+        else:
+            self._stable = 0
+        self.estimate = estimate
+        return estimate
+
+    @property
+    def moved(self):
+        """bool: True once the estimate left the starting pose towards its end of the range."""
+        if self.initial is None:
+            return False
+        change = self.estimate - self.initial if self.high else self.initial - self.estimate
+        return change > self.tolerance
+
+    @property
+    def converged(self):
+        """bool: True once the hand moved and enough samples over enough time agree."""
+        return (self.samples.count >= self.min_samples
+                and self._last_time - self._first_time >= self.min_time
+                and self.moved
+                and self._stable >= self.stable_samples)
+
+
+def estimator_from_config(high, config):
+    """
+    Build a ``RangeEstimator`` from the ``CALIBRATION_*`` settings.
+
+    Args:
+        high (bool): True for the raised end of the range
+        config: Object exposing the ``Config`` calibration attributes
+
+    Returns:
+        RangeEstimator: The estimator
+    """
+    return RangeEstimator(
+        high,
+        capacity=config.CALIBRATION_BUFFER_SIZE,
+        percentile=config.CALIBRATION_PERCENTILE,
+        min_samples=config.CALIBRATION_MIN_SAMPLES,
+        tolerance=config.CALIBRATION_TOLERANCE,
+        stable_samples=config.CALIBRATION_STABLE_SAMPLES,
+        min_time=config.CALIBRATION_MIN_TIME
+    )
+
+
+def validate_range(min_diff, max_diff, min_range):
+    """
+    Check that a calibrated range is usable.
+
+    Args:
+        min_diff (float): Lowered end of the range, or None
+        max_diff (float): Raised end of the range, or None
+        min_range (float): Smallest acceptable range
+
+    Returns:
+        bool: True if both ends exist and are far enough apart
+    """
+    return min_diff is not None and max_diff is not None and max_diff - min_diff >= min_range
+
+
+# =============================================================================
+# PROFILES
+# =============================================================================
+
+def _read_profiles(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profiles = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read calibration profiles from {path}: {e}")
+        return {}
+    return profiles if isinstance(profiles, dict) else {}
+
+
+def load_profile(path, player):
+    """
+    Load a player's saved calibration.
+
+    Args:
+        path (str): Profiles JSON file
+        player (str): Player name
+
+    Returns:
+        tuple: (min_diff, max_diff), or None if there is no usable profile
+    """
+    profile = _read_profiles(path).get(player)
+    try:
+        return float(profile["min_diff"]), float(profile["max_diff"])
+    except (TypeError, KeyError, ValueError):
+        return None
+
+
+def save_profile(path, player, min_diff, max_diff):
+    """
+    Store a player's calibration, keeping other players' profiles.
+
+    Args:
+        path (str): Profiles JSON file
+        player (str): Player name
+        min_diff (float): Lowered end of the range
+        max_diff (float): Raised end of the range
+    """
+    profiles = _read_profiles(path)
+    profiles[player] = {"min_diff": min_diff, "max_diff": max_diff, "saved_at": time.time()}
+    try:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not save calibration profile to {path}: {e}")
@@ -0,0 +1,528 @@
+"""
+Camera capture: backend selection, format negotiation and fresh frames.
+
+``cv2.VideoCapture.read`` returns the oldest frame the driver has queued, not
+the newest one. Whenever tracking is slower than the camera, the queue fills
+up and every frame the game sees is several frame intervals old. This module
+keeps that latency down:
+
+- ``open_capture`` opens ``Config.CAMERA_SOURCE`` with the capture API named
+  by ``Config.CAMERA_BACKEND``, negotiates pixel format (MJPG), resolution,
+  frame rate and a one-frame driver queue, and warns when the camera settles
+  on something else.
+- ``LatestFrameCapture`` reads the camera on its own thread and hands out the
+  newest frame only, dropping the ones nobody had time for. It measures the
+  camera's actual frame rate and, where the driver timestamps its buffers
+  (V4L2), the time from capture to hand-out.
+- ``VirtualCamera`` turns a video file, image directory or blank frames into
+  a device with a real camera's clock and driver queue, so all of the above
+  can be tried without hardware: ``CAMERA_SOURCE = "virtual:clip.avi"``.
+
+Run ``python pong_capture.py --list`` to find the cameras and backends that
+work on this machine, and ``python pong_capture.py --camera 1 --compare`` to
+measure a camera's frame rate and latency with and without the newest-frame
+reader.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import argparse
+import glob
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from pong_config import Config, add_config_arguments, configure
+from pong_sources import capture_format, configure_capture, is_camera, open_frame_source
+
+
+# Capture APIs selectable with Config.CAMERA_BACKEND
+BACKENDS = {
+    "auto": cv2.CAP_ANY,
+    "v4l2": cv2.CAP_V4L2,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+    "gstreamer": cv2.CAP_GSTREAMER,
+    "ffmpeg": cv2.CAP_FFMPEG,
+}
+
+VIRTUAL_PREFIX = "virtual:"
+MAX_PROBE_INDEX = 4  # Indices probed where devices cannot be listed
+MAX_FRAME_AGE = 2.0  # Older buffer timestamps are not monotonic-clock times
+
+
+def frame_age(source):
+    """
+    Seconds since the frame last read from a source was captured.
+
+    Uses the buffer timestamp the source reports as ``CAP_PROP_POS_MSEC``.
+    V4L2 and ``VirtualCamera`` report ``time.monotonic`` milliseconds there;
+    files report their playback position, which is rejected.
+
+    Args:
+        source: ``cv2.VideoCapture``-like frame source
+
+    Returns:
+        float: Age in seconds, or None if the source has no capture timestamps
+    """
+    stamp = source.get(cv2.CAP_PROP_POS_MSEC)
+    if not stamp or stamp <= 0:
+        return None
+    age = time.monotonic() - stamp / 1000.0
+    return age if 0.0 <= age < MAX_FRAME_AGE else None
+
+
+def _mean_ms(values):
+    return round(float(np.mean(values)) * 1000, 2) if values else None
+
+
+# =============================================================================
+# VIRTUAL CAMERA
+# =============================================================================
+
+class VirtualCamera:
+    """
+    A frame source with a camera's clock and driver queue.
+
+    Frames "arrive" every ``1 / fps`` seconds whether or not anybody reads
+    them. Up to ``buffer_size`` of them wait in the queue; later arrivals are
+    dropped until a read frees a slot, as in a V4L2 driver. ``read`` returns
+    the oldest queued frame, and ``CAP_PROP_POS_MSEC`` its arrival time in
+    ``time.monotonic`` milliseconds.
+    """
+
+    def __init__(self, source, fps=30, buffer_size=4):
+        """
+        Args:
+            source: Frame source supplying the images (read once per arrival)
+            fps (float): Arrival rate
+            buffer_size (int): Frames the emulated driver queues (OpenCV's
+                V4L2 default is 4)
+        """
+        self.source = source
+        self.interval = 1.0 / fps
+        self.buffer_size = buffer_size
+        self.frames_dropped = 0
+        self._start = time.monotonic()
+        self._arrived = 0
+        self._queue = deque()
+        self._timestamp = 0.0
+
+    def _fill(self):
+        """Queue the frames that arrived since the last call."""
+        due = int((time.monotonic() - self._start) / self.interval) + 1
+        while self._arrived < due:
+            stamp = (self._start + self._arrived * self.interval) * 1000.0
+            self._arrived += 1
+            if len(self._queue) >= self.buffer_size:
+                self.frames_dropped += 1
+                continue
+            success, frame = self.source.read()
+            if success:
+                self._queue.append((stamp, frame))
+
+    def read(self):
+        """
+        Returns:
+            tuple: (success, frame) like ``cv2.VideoCapture.read``
+        """
+        self._fill()
+        if not self._queue:
+            wait = self._start + self._arrived * self.interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._fill()
+            if not self._queue:
+                return False, None
+        self._timestamp, frame = self._queue.popleft()
+        return True, frame
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def release(self):
+        self._queue.clear()
+        self.source.release()
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_BUFFERSIZE:
+            self.buffer_size = max(1, int(value))
+            return True
+        if prop == cv2.CAP_PROP_FPS:
+            # Keep the frame count consistent across the rate change
+            now = time.monotonic()
+            self.interval = 1.0 / value
+            self._start = now - self._arrived * self.interval
+            return True
+        return self.source.set(prop, value)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_BUFFERSIZE:
+            return float(self.buffer_size)
+        if prop == cv2.CAP_PROP_FPS:
+            return 1.0 / self.interval
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self._timestamp
+        return self.source.get(prop)
+
+
+# =============================================================================
+# NEWEST-FRAME READER
+# =============================================================================
+
+class LatestFrameCapture:
+    """
+    Reads a frame source on a thread and only ever returns its newest frame.
+
+    The reader empties the driver queue as fast as the camera fills it, so
+    ``read`` never returns a frame that was already superseded. ``read``
+    blocks until a frame newer than the previous one is available. Setting
+    and getting properties is serialized with the reader, so the tracking
+    pipeline can still change the capture resolution.
+    """
+
+    def __init__(self, source, window=120):
+        """
+        Args:
+            source: ``cv2.VideoCapture``-like frame source (owned from now on)
+            window (int): Frames the timing statistics are averaged over
+        """
+        self.source = source
+        self._lock = threading.Lock()  # Serializes access to the source
+        self._ready = threading.Condition()
+        self._stop_event = threading.Event()
+        self._frame = None
+        self._arrival = 0.0  # perf_counter when the reader got the frame
+        self._timestamp = 0.0  # Source's CAP_PROP_POS_MSEC for the frame
+        self._delivered_timestamp = 0.0
+        self._age = None  # frame_age when the reader got the frame
+        self._sequence = 0
+        self._delivered = 0
+        self._failed = False
+
+        # Counters and timing windows
+        self.frames_read = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0  # Read from the source but superseded before delivery
+        self.read_failures = 0
+        self._intervals = deque(maxlen=window)
+        self._read_times = deque(maxlen=window)
+        self._waits = deque(maxlen=window)
+        self._latencies = deque(maxlen=window)
+        self._thread = None  # Started by the first read, so nothing is decoded before
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            with self._lock:
+                start = time.perf_counter()
+                success, frame = self.source.read()
+                now = time.perf_counter()
+                timestamp = self.source.get(cv2.CAP_PROP_POS_MSEC) if success else 0.0
+                age = frame_age(self.source) if success else None
+            with self._ready:
+                if success:
+                    if self._frame is not None:
+                        self._intervals.append(now - self._arrival)
+                    if self._sequence != self._delivered:
+                        self.frames_dropped += 1
+                    self._read_times.append(now - start)
+                    self._frame, self._arrival = frame, now
+                    self._timestamp, self._age = timestamp, age
+                    self._sequence += 1
+                    self.frames_read += 1
+                else:
+                    self.read_failures += 1
+                self._failed = not success
+                self._ready.notify_all()
+            if not success:
+                # Avoid spinning on a camera that stopped delivering frames
+                time.sleep(0.005)
+
+    def read(self, timeout=1.0):
+        """
+        Wait for a frame newer than the previous one.
+
+        Args:
+            timeout (float): Seconds to wait at most
+
+        Returns:
+            tuple: (success, frame) like ``cv2.VideoCapture.read``; no success
+            if the source failed or nothing arrived in time
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="LatestFrameCapture",
+                                            daemon=True)
+            self._thread.start()
+        with self._ready:
+            self._ready.wait_for(
+                lambda: self._sequence != self._delivered or self._failed
+                or self._stop_event.is_set(), timeout)
+            if self._sequence == self._delivered:
+                return False, None
+            self._delivered = self._sequence
+            self._delivered_timestamp = self._timestamp
+            frame, arrival, age = self._frame, self._arrival, self._age
+            self.frames_delivered += 1
+        wait = time.perf_counter() - arrival
+        self._waits.append(wait)
+        if age is not None:
+            self._latencies.append(age + wait)
+        return True, frame
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def release(self):
+        self._stop_event.set()
+        with self._ready:
+            self._ready.notify_all()
+        if self._thread is not None:
+            self._thread.join(1.0)
+        with self._lock:
+            self.source.release()
+
+    def set(self, prop, value):
+        with self._lock:
+            return self.source.set(prop, value)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            # The timestamp of the frame last returned, not of the newest one read
+            return self._delivered_timestamp
+        with self._lock:
+            return self.source.get(prop)
+
+    def stats(self):
+        """
+        Snapshot of the reader's counters and timings.
+
+        Returns:
+            dict: Frame counts, measured ``fps``, ``read_ms`` (time the source
+            blocked per frame), ``wait_ms`` (time a frame waited to be picked
+            up) and ``latency_ms`` (capture to hand-out, None without driver
+            timestamps), averaged over the recent window
+        """
+        intervals = list(self._intervals)
+        return {
+            "read": self.frames_read,
+            "delivered": self.frames_delivered,
+            "dropped": self.frames_dropped,
+            "read_failures": self.read_failures,
+            "fps": round(1.0 / float(np.mean(intervals)), 1) if intervals else None,
+            "read_ms": _mean_ms(list(self._read_times)),
+            "wait_ms": _mean_ms(list(self._waits)),
+            "latency_ms": _mean_ms(list(self._latencies)),
+        }
+
+
+# =============================================================================
+# OPENING AND PROBING
+# =============================================================================
+
+def open_capture(config, spec=None, loop=True, realtime=True):
+    """
+    Open and negotiate a frame source for live play.
+
+    Cameras use the capture API named by ``config.CAMERA_BACKEND`` and get
+    the configured format; a mismatch is reported. With
+    ``config.CAMERA_LATEST_FRAME`` the source is wrapped in a
+    ``LatestFrameCapture`` if it runs on a clock (cameras, virtual cameras,
+    real-time video files).
+
+    Args:
+        config: Configuration class
+        spec (int or str): Source to open, or None for ``config.CAMERA_SOURCE``;
+            ``"virtual:<source>"`` wraps any file source in a ``VirtualCamera``
+        loop (bool): Loop file-based sources
+        realtime (bool): Pace video files to their recorded frame rate
+
+    Returns:
+        object: A ``cv2.VideoCapture``-like frame source (check ``isOpened``)
+    """
+    spec = config.CAMERA_SOURCE if spec is None else spec
+    virtual = isinstance(spec, str) and spec.startswith(VIRTUAL_PREFIX)
+    if virtual:
+        source = VirtualCamera(open_frame_source(spec[len(VIRTUAL_PREFIX):], loop=True),
+                               fps=config.CAMERA_FPS)
+    else:
+        source = open_frame_source(spec, loop=loop, realtime=realtime,
+                                   backend=BACKENDS[config.CAMERA_BACKEND])
+    if not source.isOpened():
+        return source
+
+    actual = configure_capture(source, config)
+    if is_camera(spec) or virtual:
+        backend = source.getBackendName() if hasattr(source, "getBackendName") else "virtual"
+        print(f"Camera {spec} ({backend}): {actual['width']}x{actual['height']} "
+              f"@ {actual['fps']:g} fps {actual['fourcc'] or '-'}, "
+              f"buffer {actual['buffer_size'] or '-'}")
+        requested = (config.CAMERA_WIDTH, config.CAMERA_HEIGHT, config.CAMERA_FPS)
+        delivered = (actual["width"], actual["height"], actual["fps"])
+        if not virtual and all(delivered) and delivered != requested:
+            print(f"Warning: Camera delivers {delivered[0]}x{delivered[1]} @ {delivered[2]:g} fps "
+                  f"instead of the requested {requested[0]}x{requested[1]} @ {requested[2]} fps")
+        if config.CAMERA_FOURCC and actual["fourcc"] not in ("", config.CAMERA_FOURCC):
+            print(f"Warning: Camera uses {actual['fourcc']} instead of {config.CAMERA_FOURCC}")
+
+    if config.CAMERA_LATEST_FRAME and (is_camera(spec) or virtual or realtime):
+        source = LatestFrameCapture(source)
+    return source
+
+
+def camera_indices(limit=MAX_PROBE_INDEX):
+    """
+    Camera indices worth probing: the ``/dev/video*`` devices where they exist.
+
+    Args:
+        limit (int): Indices ``0 .. limit - 1`` are probed elsewhere
+
+    Returns:
+        list: Camera indices
+    """
+    devices = [path[len("/dev/video"):] for path in glob.glob("/dev/video*")]
+    indices = sorted(int(number) for number in devices if number.isdigit())
+    return indices or list(range(limit))
+
+
+def probe_cameras(indices=None, backends=None, config=None):
+    """
+    Try every camera with every capture API.
+
+    Args:
+        indices (list): Camera indices, or None for ``camera_indices()``
+        backends (list): Names from ``BACKENDS``, or None for the camera APIs
+            this OpenCV build has
+        config: Configuration to negotiate with before reading the format,
+            or None to report each camera's default format
+
+    Returns:
+        list: One dict per index and backend that opened, with ``index``,
+        ``backend``, ``frame`` (a frame could be read) and the ``capture_format``
+    """
+    if backends is None:
+        available = set(cv2.videoio_registry.getCameraBackends())
+        backends = [name for name, api in BACKENDS.items()
+                    if name != "auto" and api in available]
+    try:
+        # Failed opens are expected here; keep OpenCV from warning about each one
+        cv2.utils.logging.setLogLevel(cv2.utils.logging.LOG_LEVEL_ERROR)
+    except AttributeError:
+        pass
+
+    found = []
+    for index in camera_indices() if indices is None else indices:
+        for name in backends:
+            capture = cv2.VideoCapture(index, BACKENDS[name])
+            if not capture.isOpened():
+                continue
+            try:
+                info = configure_capture(capture, config) if config else capture_format(capture)
+                success, _ = capture.read()
+                found.append(dict(index=index, backend=name, frame=success, **info))
+            finally:
+                capture.release()
+    return found
+
+
+def measure_capture(source, frames=150, work=0.0):
+    """
+    Read frames like the tracking pipeline does and time them.
+
+    Args:
+        source: Opened frame source
+        frames (int): Frames to read
+        work (float): Seconds of simulated processing after every read
+
+    Returns:
+        dict: ``frames``, delivered ``fps``, ``read_ms`` (mean time blocked in
+        ``read``), ``latency_ms`` and ``latency_p95_ms`` (capture to hand-out,
+        None without driver timestamps), plus ``capture`` stats of a
+        ``LatestFrameCapture``
+    """
+    reads = []
+    latencies = []
+    start = time.perf_counter()
+    delivered = 0
+    for _ in range(frames):
+        before = time.perf_counter()
+        success, _ = source.read()
+        reads.append(time.perf_counter() - before)
+        if not success:
+            continue
+        delivered += 1
+        age = frame_age(source)
+        if age is not None:
+            latencies.append(age)
+        if work:
+            time.sleep(work)
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": delivered,
+        "fps": round(delivered / elapsed, 1) if elapsed > 0 else None,
+        "read_ms": _mean_ms(reads),
+        "latency_ms": _mean_ms(latencies),
+        "latency_p95_ms": (round(float(np.percentile(latencies, 95)) * 1000, 2)
+                           if latencies else None),
+        "capture": source.stats() if hasattr(source, "stats") else None,
+    }
+
+
+def parse_args(argv=None):
+    """
+    Parse the capture tool command line.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="List cameras and measure capture frame rate and latency.")
+    parser.add_argument("--list", action="store_true",
+                        help="probe camera indices and capture backends, then exit")
+    parser.add_argument("--camera", metavar="SOURCE",
+                        help="camera index, file or virtual:<file> (CAMERA_SOURCE)")
+    parser.add_argument("--frames", type=int, default=150, help="frames to measure")
+    parser.add_argument("--work", type=float, default=0.0, metavar="MS",
+                        help="simulated processing time per frame, in milliseconds")
+    parser.add_argument("--compare", action="store_true",
+                        help="measure plain buffered reads as well as the newest-frame reader")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    overrides = [("CAMERA_SOURCE", args.camera)] if args.camera is not None else []
+    configure(parser, args, overrides)
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.list:
+        cameras = probe_cameras(config=Config)
+        if not cameras:
+            print("No cameras found")
+        for camera in cameras:
+            print(f"camera {camera['index']:<3}{camera['backend']:<14}"
+                  f"{camera['width']}x{camera['height']} @ {camera['fps']:g} fps "
+                  f"{camera['fourcc'] or '-':<5} buffer {camera['buffer_size'] or '-'}"
+                  f"{'' if camera['frame'] else '  (no frames)'}")
+        raise SystemExit(0)
+
+    modes = [False, True] if args.compare else [Config.CAMERA_LATEST_FRAME]
+    for latest in modes:
+        Config.CAMERA_LATEST_FRAME = latest
+        source = open_capture(Config)
+        if not source.isOpened():
+            print(f"Error: Could not open {Config.CAMERA_SOURCE}")
+            raise SystemExit(1)
+        try:
+            result = measure_capture(source, args.frames, args.work / 1000.0)
+        finally:
+            source.release()
+        print(f"{'newest frame' if latest else 'buffered'}: {result}")
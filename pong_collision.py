@@ -0,0 +1,288 @@
+"""
+Continuous (swept) collision detection.
+
+The original game moved the ball a full step and then asked
+``ball.colliderect(paddle)``. At the default speeds (at most 25 px per tick
+against a 30 px ball and a 15 px paddle) that never misses a paddle, but
+once a step exceeds the ball and paddle widths together (raised
+``BALL_SPEED_MULTIPLIER``, lower tick rates) the ball jumps straight over
+it. The wall test could also keep flipping the vertical speed while the
+ball was still past the edge. The helpers here compute the exact time of
+impact within a step instead.
+
+Boxes are ``(x, y, w, h)`` tuples with ``x, y`` at the top-left corner, the
+same layout as ``pygame.Rect``. Times are fractions of the step (0..1).
+
+Run ``python pong_collision.py`` (accepts ``--set``) for a cost and
+missed-contact comparison against the discrete overlap test.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import argparse
+import math
+import random
+import time
+
+from pong_config import Config, add_config_arguments, configure
+
+
+_INF = math.inf
+
+
+def overlaps(box, target):
+    """
+    Discrete overlap test with ``pygame.Rect.colliderect`` semantics.
+
+    Args:
+        box (tuple): First box as (x, y, w, h)
+        target (tuple): Second box as (x, y, w, h)
+
+    Returns:
+        bool: True if the boxes overlap (touching edges do not count)
+    """
+    x, y, w, h = box
+    tx, ty, tw, th = target
+    return x < tx + tw and tx < x + w and y < ty + th and ty < y + h
+
+
+def sweep_aabb(box, delta, target):
+    """
+    Sweep a moving box against a static one.
+
+    The target is expanded by the moving box's size (Minkowski sum) and the
+    moving box's corner is ray-cast against it using the slab method.
+
+    Args:
+        box (tuple): Moving box as (x, y, w, h) at the start of the step
+        delta (tuple): Displacement (dx, dy) over the whole step
+        target (tuple): Static box as (x, y, w, h)
+
+    Returns:
+        tuple: (time, normal_x, normal_y) of the first contact, or None if the
+        boxes don't meet during the step. Boxes that already overlap report a
+        hit at time 0 with the normal of the shallowest axis.
+    """
+    x, y, w, h = box
+    dx, dy = delta
+    left = target[0] - w
+    right = target[0] + target[2]
+    top = target[1] - h
+    bottom = target[1] + target[3]
+
+    if dx == 0:
+        if not left < x < right:
+            return None
+        x_entry, x_exit = -_INF, _INF
+    else:
+        t1 = (left - x) / dx
+        t2 = (right - x) / dx
+        x_entry, x_exit = (t1, t2) if t1 < t2 else (t2, t1)
+
+    if dy == 0:
+        if not top < y < bottom:
+            return None
+        y_entry, y_exit = -_INF, _INF
+    else:
+        t1 = (top - y) / dy
+        t2 = (bottom - y) / dy
+        y_entry, y_exit = (t1, t2) if t1 < t2 else (t2, t1)
+
+    entry = max(x_entry, y_entry)
+    exit_ = min(x_exit, y_exit)
+    if entry >= exit_ or exit_ <= 0 or entry > 1:
+        return None
+
+    if x_entry >= y_entry:
+        normal = (-1.0 if dx > 0 else 1.0, 0.0)
+    else:
+        normal = (0.0, -1.0 if dy > 0 else 1.0)
+
+    if entry < 0:
+        # Already overlapping: only a contact if still moving into the target
+        center_x = x + w / 2 - (target[0] + target[2] / 2)
+        center_y = y + h / 2 - (target[1] + target[3] / 2)
+        if center_x * dx + center_y * dy >= 0:
+            return None
+        return 0.0, normal[0], normal[1]
+    return entry, normal[0], normal[1]
+
+
+def sweep_bounds(position, delta, low, high):
+    """
+    Time at which a coordinate moving by ``delta`` reaches a bound it moves toward.
+
+    A coordinate already past the bound and still moving outward reports a hit
+    at time 0, so a reflection always points it back into the field.
+
+    Args:
+        position (float): Coordinate at the start of the step
+        delta (float): Displacement over the whole step
+        low (float): Lower bound
+        high (float): Upper bound
+
+    Returns:
+        float: Time of contact in 0..1, or None if no bound is reached
+    """
+    if delta < 0:
+        t = (low - position) / delta
+    elif delta > 0:
+        t = (high - position) / delta
+    else:
+        return None
+    if t > 1:
+        return None
+    return max(t, 0.0)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def _approaches(config):
+    """
+    Ball steps toward the right paddle at every speed the game can reach.
+
+    Horizontal speeds run over the initial and collision speed ranges scaled
+    by ``BALL_SPEED_MULTIPLIER``; each is tried at every whole-pixel phase
+    in front of the paddle and with no, upward and downward vertical speed
+    aimed at the paddle's middle and corners.
+
+    Args:
+        config: Object exposing the ``Config`` ball and paddle attributes
+
+    Returns:
+        tuple: (speeds, approaches) with the reachable horizontal speeds in
+        pixels per tick and a list of (speed, start_box, delta, paddle)
+    """
+    size = config.BALL_SIZE
+    paddle = (1000.0, 300.0, config.PADDLE_WIDTH, config.PADDLE_HEIGHT)
+    low = min(config.BALL_INITIAL_SPEED_MIN, config.BALL_COLLISION_SPEED_MIN)
+    high = max(config.BALL_INITIAL_SPEED_MAX, config.BALL_COLLISION_SPEED_MAX)
+    vertical = config.BALL_INITIAL_SPEED_MAX * config.BALL_SPEED_MULTIPLIER
+    speeds = [speed * config.BALL_SPEED_MULTIPLIER for speed in range(low, high + 1)]
+    approaches = []
+    for speed in speeds:
+        for phase in range(max(1, int(speed))):
+            # The ball's front edge ends the step `phase` pixels past the paddle's face
+            end_x = paddle[0] - size + phase + 1
+            for end_y in (paddle[1] - size + 1, paddle[1] + (paddle[3] - size) / 2,
+                          paddle[1] + paddle[3] - 1):
+                for speed_y in (0.0, vertical, -vertical):
+                    start = (end_x - speed, end_y - speed_y, size, size)
+                    approaches.append((speed, start, (speed, speed_y), paddle))
+    return speeds, approaches
+
+
+def _touches(box, delta, target, samples=256):
+    """Reference contact test: sample the step densely with discrete overlaps."""
+    x, y, w, h = box
+    dx, dy = delta
+    return any(overlaps((x + dx * i / samples, y + dy * i / samples, w, h), target)
+               for i in range(samples + 1))
+
+
+def _tick_cost(config, swept, ticks, seed=0):
+    """Microseconds per ``PongSimulation.tick`` with one collision method."""
+    from pong_simulation import PongSimulation  # pong_simulation imports this module
+
+    simulation = PongSimulation(config.DEFAULT_WIDTH, config.DEFAULT_HEIGHT, config,
+                                random.Random(seed))
+    simulation.swept = swept
+    state = simulation.state
+    start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.tick(state.ball_y)
+        if simulation.winner is not None:
+            simulation.reset_game()
+    return (time.perf_counter() - start) / ticks * 1e6
+
+
+def benchmark(config=Config, iterations=200000, ticks=20000):
+    """
+    Compare the discrete and swept collision methods.
+
+    Reports the cost of one paddle test and of one whole simulation tick with
+    each method, and how often each misses a contact at the ball speeds the
+    game can actually reach with ``config``.
+
+    Args:
+        config: Object exposing the ``Config`` game, ball and paddle attributes
+        iterations (int): Number of paddle tests to time for each method
+        ticks (int): Number of simulation ticks to time for each method
+
+    Returns:
+        dict: Nanoseconds per test, microseconds per tick and missed contacts
+        for each method
+    """
+    ball = (600.0, 300.0, 30, 30)
+    paddle = (620.0, 250.0, 15, 140)
+    delta = (25.0, 4.0)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        overlaps(ball, paddle)
+    discrete_ns = (time.perf_counter() - start) / iterations * 1e9
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        sweep_aabb(ball, delta, paddle)
+    swept_ns = (time.perf_counter() - start) / iterations * 1e9
+
+    # A discrete test only sees the end of the step; the reference samples the
+    # whole step, so a miss is a contact the method lets the ball pass through
+    speeds, approaches = _approaches(config)
+    contacts = missed_discrete = missed_swept = 0
+    for speed, start_box, step, target in approaches:
+        if not _touches(start_box, step, target):
+            continue
+        contacts += 1
+        end_box = (start_box[0] + step[0], start_box[1] + step[1]) + start_box[2:]
+        if not overlaps(end_box, target):
+            missed_discrete += 1
+        if sweep_aabb(start_box, step, target) is None:
+            missed_swept += 1
+
+    results = {
+        "discrete_ns": discrete_ns,
+        "swept_ns": swept_ns,
+        "discrete_tick_us": _tick_cost(config, False, ticks),
+        "swept_tick_us": _tick_cost(config, True, ticks),
+        "contacts": contacts,
+        "tunneled_discrete": missed_discrete,
+        "tunneled_swept": missed_swept,
+    }
+    print(f"Ball speeds {speeds[0]:g}-{speeds[-1]:g} px/tick, {contacts} paddle contacts")
+    print(f"Discrete overlap: {discrete_ns:7.1f} ns/test, "
+          f"{results['discrete_tick_us']:6.2f} us/tick, missed {missed_discrete}")
+    print(f"Swept AABB:       {swept_ns:7.1f} ns/test, "
+          f"{results['swept_tick_us']:6.2f} us/tick, missed {missed_swept}")
+    return results
+
+
+def parse_args(argv=None):
+    """
+    Parse the benchmark command line and apply the layered settings to ``Config``.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Compare discrete and swept collisions.")
+    parser.add_argument("--iterations", type=int, default=200000,
+                        help="paddle tests timed per method")
+    parser.add_argument("--ticks", type=int, default=20000,
+                        help="simulation ticks timed per method")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    configure(parser, args)
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    benchmark(Config, args.iterations, args.ticks)
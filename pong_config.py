@@ -0,0 +1,490 @@
+"""
+Game configuration constants.
+
+Kept in a module of its own so that headless tools (simulation, batch runs,
+benchmarks) can read the tunables without importing ``pong_game``.
+
+The class attributes are the defaults. At startup they can be overridden in
+layers, each one winning over the previous:
+
+1. a TOML or JSON file (``--config``, ``$PONG_CONFIG``, or ``pong.toml`` /
+   ``pong.json`` in the working directory); tables only group keys
+2. environment variables named ``PONG_<SETTING>``, e.g. ``PONG_FPS=30``
+3. command line flags (``--set FPS=30`` and the programs' own shortcuts)
+
+The result is validated before anything starts, so a typo in a setting name
+or an out-of-range value stops the program with a clear message.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import json
+import os
+
+
+class Config:
+    """Game configuration constants."""
+    # Display settings
+    FULLSCREEN = True
+    DEFAULT_WIDTH = 1280
+    DEFAULT_HEIGHT = 720
+    
+    # Game parameters
+    FPS = 60
+    WINNING_SCORE = 5
+    OPPONENT_SPEED = 21
+    OPPONENT_AI = "intercept"  # "intercept" (predicts the ball), "chase" (original) or "policy"
+    OPPONENT_DIFFICULTY = "medium"  # "easy", "medium", or "hard" (intercept only)
+    OPPONENT_POLICY_PATH = "opponent_policy.npz"  # Trained policy (pong_rl.py), "policy" only
+    TWO_PLAYER = False  # Second hand drives the right paddle instead of the computer
+    MATCH_SEED = None  # Seed of every match's random stream; None picks a new one per match
+    PLAYER_ASSIGNMENT = "side"  # "side" (screen half) or "handedness" (left/right hand)
+    SMOOTHING_FACTOR = 0.2  # Dampens jitter in hand tracking
+    
+    # Ball settings
+    BALL_INITIAL_SPEED_MIN = 12
+    BALL_INITIAL_SPEED_MAX = 19
+    BALL_COLLISION_SPEED_MIN = 12
+    BALL_COLLISION_SPEED_MAX = 25
+    BALL_MIN_VERTICAL_SPEED = 8
+    BALL_SPEED_MULTIPLIER = 1.0  # Scales every ball displacement per physics tick
+    SWEPT_COLLISIONS = True  # Exact time-of-impact collisions (no tunneling)
+    
+    # Paddle settings
+    PADDLE_WIDTH = 15
+    PADDLE_HEIGHT = 140
+    PADDLE_MARGIN = 50
+    
+    # Visual settings
+    BALL_SIZE = 30
+    TRAIL_COUNT = 5
+    TRAIL_START_COLOR = 240
+    CAMERA_PREVIEW_WIDTH = 160
+    CAMERA_PREVIEW_HEIGHT = 120
+    CAMERA_PREVIEW_MARGIN = 10
+    
+    # Camera settings
+    CAMERA_SOURCE = 0  # Camera index, video file, or directory of images
+    CAMERA_WIDTH = 640  # Requested capture resolution
+    CAMERA_HEIGHT = 480
+    CAMERA_FPS = 30  # Requested capture rate
+    CAMERA_BACKEND = "auto"  # Capture API: "auto", "v4l2", "dshow", "msmf", "avfoundation", ...
+    CAMERA_FOURCC = "MJPG"  # Requested pixel format, or None for the camera's default
+    CAMERA_BUFFER_SIZE = 1  # Frames the driver may queue (0 keeps the driver's default)
+    CAMERA_LATEST_FRAME = True  # Read on a thread and always hand out the newest frame
+    RECORD_SESSION = None  # Base path to record frames + landmarks, e.g. "session1"
+    
+    # Hand tracking settings
+    TRACKER_BACKEND = "mediapipe"  # "mediapipe", "mediapipe_tasks" or "color"
+    TRACKER_MODEL_PATH = "hand_landmarker.task"  # Model file for "mediapipe_tasks"
+    MIN_DETECTION_CONFIDENCE = 0.7
+    MIN_TRACKING_CONFIDENCE = 0.5
+    MAX_NUM_HANDS = 1
+    TRACKING_ROI = True  # Only process a crop around the last known hand
+    TRACKING_ROI_PADDING = 0.5  # Crop padding, relative to the hand's size
+    TRACKING_ROI_MIN_SIZE = 160  # Smallest crop side in camera pixels
+    TRACKING_INFERENCE_SCALE = 1.0  # Downscale factor for images sent to inference
+    COLOR_TRACKER_LOWER = (0, 135, 85)  # YCrCb skin range of the "color" backend
+    COLOR_TRACKER_UPPER = (255, 180, 135)
+    COLOR_TRACKER_WIDTH = 160  # Image width the "color" backend segments
+    COLOR_TRACKER_MIN_AREA = 0.01  # Smallest hand blob, as a fraction of the image
+    
+    # Gesture settings (pinch clicks in menus; open palm pauses, fist resumes a match)
+    GESTURES_ENABLED = True
+    GESTURE_HOLD_TIME = 0.25  # Seconds a menu gesture must be held before it triggers
+    # The control pose (index finger up, other fingers loose) can read as an open palm and
+    # a curled finger as a fist, so pausing a match by gesture is opt-in with a long hold
+    GESTURE_PAUSE = False
+    GESTURE_PAUSE_HOLD_TIME = 1.5  # Seconds a pause or resume gesture must be held
+    GESTURE_PINCH_THRESHOLD = 0.3  # Thumb-index distance, relative to palm size
+    GESTURE_BUDGET_MS = 0.5  # Classification time allowed per frame
+    
+    # Input filter settings (see pong_filters.py)
+    INPUT_FILTER = "one_euro"  # "one_euro", "kalman", or "ema" (SMOOTHING_FACTOR)
+    INPUT_DISPLAY_LATENCY = 1 / 60  # Seconds from rendering a frame to it being shown
+    INPUT_MAX_PREDICTION = 0.1  # Longest extrapolation past the last measurement
+    ONE_EURO_MIN_CUTOFF = 1.0  # Hz; lower = smoother at rest
+    ONE_EURO_BETA = 4.0  # Higher = less lag during fast movements
+    ONE_EURO_D_CUTOFF = 1.0  # Hz; smoothing of the speed estimate
+    KALMAN_PROCESS_NOISE = 5.0  # Higher = follows sudden changes faster
+    KALMAN_MEASUREMENT_NOISE = 1e-4  # Variance of the tracked finger position
+    
+    # Profiler settings (F3 toggles the profiler and its HUD in game)
+    PROFILER_ENABLED = False
+    PROFILER_WINDOW = 300  # Samples kept per stage for the rolling percentiles
+    PROFILER_EXPORT_PATH = None  # e.g. "profile.csv" or "profile.json"
+    PROFILER_EXPORT_INTERVAL = 5.0  # Seconds between exports
+    TELEMETRY_DIR = None  # Folder for per-game telemetry (pong_telemetry.py), e.g. "telemetry"
+    REPLAY_DIR = None  # Folder for per-match replays (pong_replay.py), e.g. "replays"
+    
+    # Quality governor settings (trades visual quality for a steady FPS under load)
+    QUALITY_GOVERNOR = True
+    QUALITY_WINDOW = 30  # Frames averaged before lowering the quality
+    QUALITY_RESTORE_WINDOW = 180  # Frames with headroom before raising it again
+    QUALITY_OVERLOAD = 0.9  # Busy fraction of the frame budget that lowers quality
+    QUALITY_HEADROOM = 0.6  # Busy fraction below which quality is restored
+    
+    # Network play settings (see pong_net.py)
+    NET_ROLE = None  # None for local play, "host" (left paddle) or "client" (right paddle)
+    NET_HOST = "127.0.0.1"  # Address of the host, used by the client
+    NET_PORT = 50007
+    NET_SEND_INTERVAL = 1  # Ticks between state snapshots sent by the host
+    NET_INPUT_REDUNDANCY = 8  # Recent inputs repeated in every client packet
+    NET_MAX_ROLLBACK = 30  # Most ticks the client replays after a snapshot
+    NET_CORRECTION_DECAY = 0.8  # Fraction of a prediction correction left after a tick
+    NET_SNAP_DISTANCE = 200  # Corrections larger than this (pixels) snap instead of blend
+    NET_TIMEOUT = 5.0  # Seconds without packets before the peer counts as gone
+    
+    # Calibration settings
+    CALIBRATION_COUNTDOWN = 5  # Longest time per stage in seconds
+    CALIBRATION_BUFFER_SIZE = 90  # Most recent samples kept per stage
+    CALIBRATION_PERCENTILE = 90  # Percentile taken as the extreme (mirrored when lowered)
+    CALIBRATION_MIN_SAMPLES = 20  # Samples needed before a stage may end early
+    CALIBRATION_TOLERANCE = 0.005  # Largest estimate change still considered stable
+    CALIBRATION_STABLE_SAMPLES = 15  # Stable samples in a row that end a stage early
+    CALIBRATION_MIN_TIME = 1.5  # Shortest time per stage in seconds
+    CALIBRATION_MIN_RANGE = 0.02  # Smaller calibrated ranges are rejected
+    CALIBRATION_PROFILE_PATH = "calibration_profiles.json"  # None disables profiles
+    PLAYER_NAME = "default"  # Profile the calibration is saved under
+    PLAYER2_NAME = "player2"  # Profile of the right player in two-player games
+    
+    # Colors (RGB)
+    BLACK = (0, 0, 0)
+    WHITE = (255, 255, 255)
+    GRAY = (200, 200, 200)
+    GREEN = (0, 255, 0)
+    RED = (255, 0, 0)
+    BLUE = (0, 0, 255)
+
+
+# =============================================================================
+# LAYERED OVERRIDES
+# =============================================================================
+
+CONFIG_FILES = ("pong.toml", "pong.json")
+ENV_PREFIX = "PONG_"
+
+# Settings that may also be None (given as "none" or "" in text)
+_NULLABLE = {"CALIBRATION_PROFILE_PATH", "CAMERA_FOURCC"}
+
+# Settings that are None or an integer
+_OPTIONAL_INTS = {"MATCH_SEED"}
+
+# Inclusive (low, high) bounds; None leaves a side open
+_RANGES = {
+    "DEFAULT_WIDTH": (1, None), "DEFAULT_HEIGHT": (1, None), "FPS": (1, None),
+    "WINNING_SCORE": (1, None), "OPPONENT_SPEED": (0, None),
+    "SMOOTHING_FACTOR": (0.0, 1.0), "BALL_SPEED_MULTIPLIER": (0.0, None),
+    "PADDLE_WIDTH": (1, None), "PADDLE_HEIGHT": (1, None), "BALL_SIZE": (1, None),
+    "TRAIL_COUNT": (0, None), "CAMERA_WIDTH": (1, None), "CAMERA_HEIGHT": (1, None),
+    "CAMERA_FPS": (1, None), "CAMERA_BUFFER_SIZE": (0, None),
+    "MIN_DETECTION_CONFIDENCE": (0.0, 1.0),
+    "MIN_TRACKING_CONFIDENCE": (0.0, 1.0), "MAX_NUM_HANDS": (1, 2),
+    "TRACKING_INFERENCE_SCALE": (0.05, 1.0), "GESTURE_HOLD_TIME": (0.0, None),
+    "GESTURE_PAUSE_HOLD_TIME": (0.0, None),
+    "INPUT_DISPLAY_LATENCY": (0.0, 1.0), "INPUT_MAX_PREDICTION": (0.0, 1.0),
+    "PROFILER_WINDOW": (1, None), "QUALITY_WINDOW": (1, None),
+    "QUALITY_RESTORE_WINDOW": (1, None), "QUALITY_OVERLOAD": (0.0, None),
+    "QUALITY_HEADROOM": (0.0, None), "NET_PORT": (0, 65535), "NET_SEND_INTERVAL": (1, None),
+    "NET_INPUT_REDUNDANCY": (1, None), "NET_CORRECTION_DECAY": (0.0, 1.0),
+    "CALIBRATION_BUFFER_SIZE": (1, None), "CALIBRATION_PERCENTILE": (50, 100),
+    "CALIBRATION_MIN_TIME": (0.0, None), "CALIBRATION_MIN_RANGE": (0.0, None),
+}
+
+# Settings whose lower bound is exclusive (they end up as divisors)
+_EXCLUSIVE_LOW = {"CALIBRATION_MIN_RANGE"}
+
+
+def settings(config=Config):
+    """
+    Current values of all settings.
+
+    Args:
+        config: Configuration class to read
+
+    Returns:
+        dict: Setting name -> value
+    """
+    return {name: getattr(config, name) for name in dir(config) if name.isupper()}
+
+
+DEFAULTS = settings()
+
+
+def read_config_file(path):
+    """
+    Read settings from a TOML or JSON file.
+
+    Setting names are case-insensitive; TOML tables and JSON objects only
+    group settings and are flattened.
+
+    Args:
+        path (str): ``.toml`` or ``.json`` file
+
+    Returns:
+        dict: Setting name (upper case) -> value
+    """
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError(f"Reading {path} needs Python 3.11+ or the tomli package")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a table of settings")
+
+    values = {}
+    pending = [data]
+    while pending:
+        for key, value in pending.pop().items():
+            if isinstance(value, dict):
+                pending.append(value)
+            else:
+                values[key.upper()] = value
+    return values
+
+
+def _parse_bool(name, text):
+    lowered = text.lower()
+    if lowered in ("1", "true", "yes", "on"):
+        return True
+    if lowered in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"{name}: expected true or false, got {text!r}")
+
+
+def coerce_setting(name, value):
+    """
+    Convert an override to the type of the setting's default.
+
+    Args:
+        name (str): Setting name
+        value: Value from a file (typed) or from the environment / command line (str)
+
+    Returns:
+        object: The converted value
+    """
+    if name not in DEFAULTS:
+        raise ValueError(f"Unknown setting {name!r}")
+    default = DEFAULTS[name]
+    nullable = default is None or name in _NULLABLE
+
+    if isinstance(value, str):
+        text = value.strip()
+        if nullable:
+            if text.lower() in ("", "none", "null"):
+                return None
+            if name in _OPTIONAL_INTS:
+                try:
+                    return int(text)
+                except ValueError:
+                    raise ValueError(f"{name}: expected int or none, got {text!r}")
+            return text
+        if name == "CAMERA_SOURCE":
+            return int(text) if text.isdigit() else text
+        try:
+            if isinstance(default, bool):
+                return _parse_bool(name, text)
+            if isinstance(default, tuple):
+                return coerce_setting(name, [part for part in text.split(",")])
+            if isinstance(default, int):
+                return int(text)
+            if isinstance(default, float):
+                return float(text)
+        except ValueError as e:
+            if str(e).startswith(name):
+                raise
+            raise ValueError(f"{name}: expected {type(default).__name__}, got {text!r}")
+        return text
+
+    if value is None and nullable:
+        return None
+    if name in _OPTIONAL_INTS and isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(default, tuple) and isinstance(value, (list, tuple)):
+        if len(value) != len(default):
+            raise ValueError(f"{name}: expected {len(default)} values, got {len(value)}")
+        return tuple(type(item)(part) if isinstance(part, str) else part
+                     for item, part in zip(default, value))
+    if name == "CAMERA_SOURCE" and isinstance(value, (int, str)) and not isinstance(value, bool):
+        return value
+    if isinstance(default, float) and isinstance(value, (int, float)) \
+            and not isinstance(value, bool):
+        return float(value)
+    if default is None and isinstance(value, str):
+        return value
+    if type(value) is type(default):
+        return value
+    raise ValueError(f"{name}: expected {type(default).__name__}, got {value!r}")
+
+
+def validate_config(config=Config):
+    """
+    Check that the settings are consistent and in range.
+
+    Args:
+        config: Configuration class to check
+
+    Returns:
+        list: Problems found (empty if the configuration is valid)
+    """
+    from pong_ai import DIFFICULTIES
+    from pong_capture import BACKENDS
+    from pong_filters import FILTERS
+    from pong_trackers import TRACKERS
+
+    choices = {
+        "OPPONENT_AI": ("intercept", "chase", "policy"),
+        "OPPONENT_DIFFICULTY": tuple(DIFFICULTIES),
+        "PLAYER_ASSIGNMENT": ("side", "handedness"),
+        "TRACKER_BACKEND": TRACKERS,
+        "INPUT_FILTER": FILTERS,
+        "NET_ROLE": (None, "host", "client"),
+        "CAMERA_BACKEND": tuple(BACKENDS),
+    }
+    problems = []
+    for name, allowed in choices.items():
+        value = getattr(config, name)
+        if value not in allowed:
+            problems.append(f"{name} is {value!r}; expected one of "
+                            f"{', '.join(repr(choice) for choice in allowed)}")
+    for name, (low, high) in _RANGES.items():
+        value = getattr(config, name)
+        exclusive = name in _EXCLUSIVE_LOW
+        too_low = low is not None and (value <= low if exclusive else value < low)
+        if too_low or (high is not None and value > high):
+            problems.append(f"{name} is {value!r}; expected a value in "
+                            f"{'(' if exclusive else '['}{'-inf' if low is None else low}, "
+                            f"{'inf' if high is None else high}]")
+    for low, high in (("BALL_INITIAL_SPEED_MIN", "BALL_INITIAL_SPEED_MAX"),
+                      ("BALL_COLLISION_SPEED_MIN", "BALL_COLLISION_SPEED_MAX"),
+                      ("QUALITY_HEADROOM", "QUALITY_OVERLOAD")):
+        if getattr(config, low) > getattr(config, high):
+            problems.append(f"{low} must not be larger than {high}")
+    if config.CAMERA_FOURCC is not None and len(config.CAMERA_FOURCC) != 4:
+        problems.append(f"CAMERA_FOURCC is {config.CAMERA_FOURCC!r}; expected four characters "
+                        f"such as 'MJPG' or 'YUYV', or none")
+    if config.OPPONENT_AI == "policy" and not os.path.isfile(config.OPPONENT_POLICY_PATH):
+        problems.append(f"OPPONENT_POLICY_PATH {config.OPPONENT_POLICY_PATH!r} does not exist; "
+                        f"train one with 'python pong_rl.py train'")
+    return problems
+
+
+def apply_layers(path=None, env=None, overrides=(), config=Config):
+    """
+    Apply the file, environment and command line layers on top of the defaults.
+
+    A value that cannot be converted keeps the setting's previous value and
+    the remaining values are still applied, so that one ``ValueError`` can
+    report every bad value together with the range problems of the result.
+
+    Args:
+        path (str): Settings file, or None to use ``$PONG_CONFIG`` or a
+            default file in the working directory when one exists
+        env (dict): Environment variables, or None for ``os.environ``
+        overrides (iterable): (name, value) pairs from the command line,
+            applied last in order
+        config: Configuration class to update
+
+    Returns:
+        dict: Setting name -> layer it came from ("file", "env" or "cli")
+    """
+    env = os.environ if env is None else env
+    sources = {}
+    path = path or env.get(ENV_PREFIX + "CONFIG")
+    if path is None:
+        path = next((name for name in CONFIG_FILES if os.path.exists(name)), None)
+
+    layers = []
+    if path is not None:
+        try:
+            layers.append(("file", read_config_file(path).items()))
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Could not read settings from {path}: {e}")
+    env_values = []
+    for key, value in env.items():
+        if key.startswith(ENV_PREFIX) and key != ENV_PREFIX + "CONFIG":
+            name = key[len(ENV_PREFIX):]
+            if name in DEFAULTS:
+                env_values.append((name, value))
+            else:
+                print(f"Warning: Ignoring {key}: no setting named {name}")
+    layers.append(("env", env_values))
+    layers.append(("cli", overrides))
+
+    problems = []
+    for layer, values in layers:
+        for name, value in values:
+            name = name.upper()
+            try:
+                setattr(config, name, coerce_setting(name, value))
+            except ValueError as e:
+                problems.append(f"{e} ({layer})")
+                continue
+            sources[name] = layer
+    if problems:
+        raise ValueError("invalid settings:\n  " + "\n  ".join(problems + validate_config(config)))
+    return sources
+
+
+def add_config_arguments(parser):
+    """
+    Add the shared ``--config``, ``--set`` and ``--print-config`` options.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser to extend
+    """
+    group = parser.add_argument_group("settings")
+    group.add_argument("--config", metavar="FILE",
+                       help="TOML or JSON settings file (default: $PONG_CONFIG, "
+                            "pong.toml or pong.json)")
+    group.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                       help="override a Config setting, e.g. --set FPS=30 (repeatable)")
+    group.add_argument("--print-config", action="store_true",
+                       help="print the effective settings and where they came from")
+
+
+def configure(parser, args, overrides=(), env=None, config=Config):
+    """
+    Build the effective configuration from parsed arguments and validate it.
+
+    Invalid settings end the program through ``parser.error``.
+
+    Args:
+        parser (argparse.ArgumentParser): Parser used to report errors
+        args (argparse.Namespace): Arguments with the ``add_config_arguments`` options
+        overrides (iterable): (name, value) pairs from program-specific flags,
+            applied after ``--set``
+        env (dict): Environment variables, or None for ``os.environ``
+        config: Configuration class to update
+
+    Returns:
+        dict: Setting name -> layer it came from
+    """
+    pairs = []
+    for item in args.set:
+        name, separator, value = item.partition("=")
+        if not separator:
+            parser.error(f"--set expects NAME=VALUE, got {item!r}")
+        pairs.append((name.strip(), value))
+    try:
+        sources = apply_layers(args.config, env, pairs + list(overrides), config)
+    except ValueError as e:
+        parser.error(str(e))
+    problems = validate_config(config)
+    if problems:
+        parser.error("invalid settings:\n  " + "\n  ".join(problems))
+
+    if args.print_config:
+        for name, value in sorted(settings(config).items()):
+            print(f"{name:<28}{value!r:<32}{sources.get(name, 'default')}")
+    return sources
@@ -0,0 +1,485 @@
+"""
+Latency-compensating input filters for the hand-controlled paddle.
+
+Tracking results reach the game one camera frame plus one inference after
+the hand actually moved, and smoothing adds more lag on top. The filters in
+this module are fed timestamped measurements (the capture time of each
+frame) and are asked for the position at *display* time, so filters that
+estimate velocity can extrapolate across the pipeline latency:
+
+- ``ExponentialFilter``: the original fixed exponential smoothing, no prediction
+- ``OneEuroFilter``: speed-adaptive low-pass (Casiez et al., CHI 2012)
+- ``KalmanFilter``: constant-velocity Kalman filter
+
+All filters work on the normalized control value (0 = bottom, 1 = top).
+
+Run ``python pong_filters.py --synthetic 1800`` (or ``--session <name>``) for
+a motion-to-photon latency report comparing the filters.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import argparse
+import math
+
+import numpy as np
+
+from pong_config import Config
+from pong_sources import RecordedSession, synthetic_session
+
+
+class ExponentialFilter:
+    """
+    Exponential moving average, equivalent to ``SMOOTHING_FACTOR`` per tick.
+
+    Args:
+        factor (float): Fraction of the remaining distance covered per tick
+        rate (float): Tick rate the factor refers to (``Config.FPS``)
+    """
+
+    def __init__(self, factor, rate):
+        self.factor = factor
+        self.rate = rate
+        self.reset()
+
+    def reset(self):
+        """Forget all state (e.g. after the hand was lost)."""
+        self._target = None
+        self._value = None
+        self._time = None
+
+    def update(self, value, timestamp):
+        """
+        Add a measurement.
+
+        Args:
+            value (float): Measured control value
+            timestamp (float): Capture time of the measurement in seconds
+        """
+        if self._value is None:
+            self._value = value
+            self._time = timestamp
+        self._target = value
+
+    def predict(self, timestamp):
+        """
+        Filtered value at the given time.
+
+        Args:
+            timestamp (float): Time to evaluate the filter at
+
+        Returns:
+            float: Filtered value, or None before the first measurement
+        """
+        if self._value is None:
+            return None
+        elapsed = timestamp - self._time
+        if elapsed > 0:
+            keep = (1.0 - self.factor) ** (elapsed * self.rate)
+            self._value = self._target + (self._value - self._target) * keep
+            self._time = timestamp
+        return self._value
+
+
+def _smoothing_alpha(cutoff, dt):
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One-Euro filter with velocity extrapolation to display time.
+
+    Slow movements are smoothed heavily (cutoff ``min_cutoff``) to remove
+    jitter; the cutoff rises with speed (``beta``) so fast movements are
+    followed with little lag.
+
+    Args:
+        min_cutoff (float): Cutoff frequency at rest in Hz
+        beta (float): Cutoff increase per unit of speed
+        d_cutoff (float): Cutoff frequency for the speed estimate in Hz
+        max_prediction (float): Longest extrapolation in seconds
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=4.0, d_cutoff=1.0, max_prediction=0.1):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_prediction = max_prediction
+        self.reset()
+
+    def reset(self):
+        """Forget all state (e.g. after the hand was lost)."""
+        self._value = None
+        self._speed = 0.0
+        self._time = None
+
+    def update(self, value, timestamp):
+        """
+        Add a measurement.
+
+        Args:
+            value (float): Measured control value
+            timestamp (float): Capture time of the measurement in seconds
+        """
+        if self._value is None:
+            self._value = value
+            self._speed = 0.0
+            self._time = timestamp
+            return
+        dt = timestamp - self._time
+        if dt <= 0:
+            return
+        speed = (value - self._value) / dt
+        self._speed += _smoothing_alpha(self.d_cutoff, dt) * (speed - self._speed)
+        cutoff = self.min_cutoff + self.beta * abs(self._speed)
+        self._value += _smoothing_alpha(cutoff, dt) * (value - self._value)
+        self._time = timestamp
+
+    def predict(self, timestamp):
+        """
+        Filtered value extrapolated to the given time.
+
+        Args:
+            timestamp (float): Time to predict for (usually display time)
+
+        Returns:
+            float: Predicted value, or None before the first measurement
+        """
+        if self._value is None:
+            return None
+        lead = min(max(timestamp - self._time, 0.0), self.max_prediction)
+        return self._value + self._speed * lead
+
+
+class KalmanFilter:
+    """
+    Constant-velocity Kalman filter over (position, velocity).
+
+    Args:
+        process_noise (float): Acceleration noise spectral density
+        measurement_noise (float): Variance of a single measurement
+        max_prediction (float): Longest extrapolation in seconds
+    """
+
+    def __init__(self, process_noise=5.0, measurement_noise=1e-4, max_prediction=0.1):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.max_prediction = max_prediction
+        self.reset()
+
+    def reset(self):
+        """Forget all state (e.g. after the hand was lost)."""
+        self._x = None  # Position
+        self._v = 0.0  # Velocity
+        # Covariance [[p00, p01], [p01, p11]]
+        self._p00 = self._p01 = self._p11 = 0.0
+        self._time = None
+
+    def update(self, value, timestamp):
+        """
+        Add a measurement.
+
+        Args:
+            value (float): Measured control value
+            timestamp (float): Capture time of the measurement in seconds
+        """
+        if self._x is None:
+            self._x = value
+            self._v = 0.0
+            self._p00 = self.measurement_noise
+            self._p01 = 0.0
+            self._p11 = 1.0
+            self._time = timestamp
+            return
+        dt = timestamp - self._time
+        if dt <= 0:
+            return
+
+        # Predict: x += v * dt, P = F P F^T + Q (white-noise acceleration)
+        q = self.process_noise
+        self._x += self._v * dt
+        p00 = self._p00 + dt * (2 * self._p01 + dt * self._p11) + q * dt ** 3 / 3
+        p01 = self._p01 + dt * self._p11 + q * dt ** 2 / 2
+        p11 = self._p11 + q * dt
+
+        # Correct with the position measurement
+        s = p00 + self.measurement_noise
+        k0 = p00 / s
+        k1 = p01 / s
+        residual = value - self._x
+        self._x += k0 * residual
+        self._v += k1 * residual
+        self._p00 = (1 - k0) * p00
+        self._p01 = (1 - k0) * p01
+        self._p11 = p11 - k1 * p01
+        self._time = timestamp
+
+    def predict(self, timestamp):
+        """
+        Position extrapolated to the given time.
+
+        Args:
+            timestamp (float): Time to predict for (usually display time)
+
+        Returns:
+            float: Predicted value, or None before the first measurement
+        """
+        if self._x is None:
+            return None
+        lead = min(max(timestamp - self._time, 0.0), self.max_prediction)
+        return self._x + self._v * lead
+
+
+FILTERS = ("ema", "one_euro", "kalman")
+
+
+def create_filter(name, config):
+    """
+    Build the input filter selected by name.
+
+    Args:
+        name (str): One of ``FILTERS``
+        config: Object exposing the ``Config`` input filter attributes
+
+    Returns:
+        object: Filter with ``reset``, ``update(value, timestamp)`` and ``predict(timestamp)``
+    """
+    if name == "ema":
+        return ExponentialFilter(config.SMOOTHING_FACTOR, config.FPS)
+    if name == "one_euro":
+        return OneEuroFilter(config.ONE_EURO_MIN_CUTOFF, config.ONE_EURO_BETA,
+                             config.ONE_EURO_D_CUTOFF, config.INPUT_MAX_PREDICTION)
+    if name == "kalman":
+        return KalmanFilter(config.KALMAN_PROCESS_NOISE, config.KALMAN_MEASUREMENT_NOISE,
+                            config.INPUT_MAX_PREDICTION)
+    raise ValueError(f"Unknown input filter {name!r}; expected one of {', '.join(FILTERS)}")
+
+
+class PaddleTargets:
+    """
+    Paddle heights from calibrated finger measures, through one filter per player.
+
+    The game and match replays both use this, so a replay feeds exactly the
+    same numbers into the simulation.
+
+    Args:
+        calibrations (list): (min_diff, max_diff) per player
+        height (int): Playfield height in pixels
+        config: Object exposing the ``Config`` input filter attributes
+    """
+
+    def __init__(self, calibrations, height, config):
+        self.calibrations = calibrations
+        self.height = height
+        self.filters = [create_filter(config.INPUT_FILTER, config) for _ in calibrations]
+        self.targets = [None, None]
+
+    def update(self, diffs, timestamp):
+        """
+        Feed the finger measures of one tracking result.
+
+        Args:
+            diffs (list): ``finger_diff`` per player, None where the hand is missing
+            timestamp (float): Capture time of the result
+        """
+        for input_filter, diff, (min_diff, max_diff) in zip(self.filters, diffs,
+                                                            self.calibrations):
+            if diff is None:
+                input_filter.reset()
+            else:
+                input_filter.update((diff - min_diff) / (max_diff - min_diff), timestamp)
+
+    def predict(self, display_time):
+        """
+        Paddle center y of every player at a point in time.
+
+        Args:
+            display_time (float): Time the next frame reaches the screen
+
+        Returns:
+            list: Target y per paddle (left first), None without input
+        """
+        for side, input_filter in enumerate(self.filters):
+            percentage = input_filter.predict(display_time)
+            if percentage is not None:
+                percentage = max(0.0, min(1.0, percentage))
+                self.targets[side] = self.height - (percentage * self.height)
+            else:
+                self.targets[side] = None
+        return self.targets
+
+
+# =============================================================================
+# LATENCY REPORT
+# =============================================================================
+
+def session_signal(session):
+    """
+    Normalized control value per frame of a recorded session.
+
+    Uses the same finger measure as the game and maps the 5th..95th
+    percentile of the session to 0..1, like a calibration would.
+
+    Args:
+        session (RecordedSession): Session with landmarks and timestamps
+
+    Returns:
+        tuple: (timestamps, values); values are NaN where no hand was seen
+    """
+    wrist_y = session.landmarks[:, 0, 0, 1].astype(np.float64)
+    tip_y = session.landmarks[:, 0, 8, 1].astype(np.float64)
+    diff = wrist_y - tip_y
+    seen = ~np.isnan(diff)
+    low, high = np.percentile(diff[seen], (5, 95))
+    values = (diff - low) / max(high - low, 1e-9)
+    timestamps = session.timestamps.astype(np.float64) - session.timestamps[0]
+    return timestamps, values
+
+
+def replay(input_filter, timestamps, values, fps, pipeline_latency, display_latency):
+    """
+    Run a filter the way the game loop does and record what reaches the screen.
+
+    A measurement captured at ``t`` becomes available at ``t + pipeline_latency``;
+    every render frame the filter predicts the value for the moment the frame
+    is shown, ``display_latency`` after it was rendered.
+
+    Args:
+        input_filter: Filter to evaluate (reset first)
+        timestamps (numpy.ndarray): Capture time per measurement
+        values (numpy.ndarray): Measured value per frame, NaN if no hand
+        fps (float): Render frame rate
+        pipeline_latency (float): Capture to availability delay in seconds
+        display_latency (float): Render to photons delay in seconds
+
+    Returns:
+        tuple: (photon_times, shown_values) for frames that showed a value
+    """
+    input_filter.reset()
+    arrival = timestamps + pipeline_latency
+    frame_times = np.arange(arrival[0], timestamps[-1], 1.0 / fps)
+    shown_times = []
+    shown_values = []
+    next_index = 0
+    for now in frame_times:
+        while next_index < len(arrival) and arrival[next_index] <= now:
+            value = values[next_index]
+            if math.isnan(value):
+                input_filter.reset()
+            else:
+                input_filter.update(float(value), float(timestamps[next_index]))
+            next_index += 1
+        photon_time = now + display_latency
+        predicted = input_filter.predict(photon_time)
+        if predicted is not None:
+            shown_times.append(photon_time)
+            shown_values.append(predicted)
+    return np.asarray(shown_times), np.asarray(shown_values)
+
+
+def measure_latency(timestamps, values, shown_times, shown_values, max_lag=0.3, step=0.001):
+    """
+    Effective motion-to-photon latency and error of a replayed filter.
+
+    The latency is the time shift of the hand signal that best matches what
+    was shown (least squared error), so filter lag and prediction are both
+    accounted for.
+
+    Args:
+        timestamps (numpy.ndarray): Capture time per measurement
+        values (numpy.ndarray): Measured value per frame, NaN if no hand
+        shown_times (numpy.ndarray): Time each output reached the screen
+        shown_values (numpy.ndarray): Output value per frame
+        max_lag (float): Largest latency considered in seconds
+        step (float): Search resolution in seconds
+
+    Returns:
+        dict: latency_ms, rms_error (at display time) and jitter (RMS of the
+        second difference of the output)
+    """
+    seen = ~np.isnan(values)
+    t, v = timestamps[seen], values[seen]
+    lags = np.arange(-max_lag, max_lag + step, step)
+    errors = [np.mean((np.interp(shown_times - lag, t, v) - shown_values) ** 2) for lag in lags]
+    best = lags[int(np.argmin(errors))]
+    truth = np.interp(shown_times, t, v)
+    jitter = np.sqrt(np.mean(np.diff(shown_values, 2) ** 2)) if len(shown_values) > 2 else 0.0
+    return {
+        "latency_ms": best * 1000.0,
+        "rms_error": float(np.sqrt(np.mean((truth - shown_values) ** 2))),
+        "jitter": float(jitter),
+    }
+
+
+def latency_report(session, config=Config, pipeline_latency=0.035, display_latency=None,
+                   noise=0.0, seed=0):
+    """
+    Compare all filters on a recorded session.
+
+    Args:
+        session (RecordedSession): Session to replay
+        config: Object exposing the ``Config`` input filter attributes
+        pipeline_latency (float): Capture to tracking result delay in seconds
+        display_latency (float): Render to photons delay; defaults to
+            ``config.INPUT_DISPLAY_LATENCY``
+        noise (float): Std of Gaussian noise added to the measurements
+        seed (int): Seed for the noise
+
+    Returns:
+        dict: filter name -> measurements from ``measure_latency``
+    """
+    if display_latency is None:
+        display_latency = config.INPUT_DISPLAY_LATENCY
+    timestamps, values = session_signal(session)
+    if noise:
+        values = values + np.random.default_rng(seed).normal(0.0, noise, len(values))
+
+    report = {}
+    for name in FILTERS:
+        shown_times, shown_values = replay(create_filter(name, config), timestamps, values,
+                                           config.FPS, pipeline_latency, display_latency)
+        report[name] = measure_latency(timestamps, values, shown_times, shown_values)
+
+    print(f"Pipeline latency {pipeline_latency * 1000:.0f} ms, display latency "
+          f"{display_latency * 1000:.0f} ms, {len(timestamps)} measurements")
+    print(f"{'filter':<10}{'latency ms':>12}{'rms error':>12}{'jitter':>12}")
+    for name, values in report.items():
+        print(f"{name:<10}{values['latency_ms']:12.1f}{values['rms_error']:12.4f}"
+              f"{values['jitter']:12.5f}")
+    return report
+
+
+def parse_args(argv=None):
+    """
+    Parse the latency report command line.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Compare input filters on a recorded session.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--session", help="recorded session base name (.npz)")
+    source.add_argument("--synthetic", type=int, metavar="FRAMES",
+                        help="generate a synthetic session with this many frames")
+    parser.add_argument("--pipeline-latency", type=float, default=0.035,
+                        help="seconds from capture to tracking result")
+    parser.add_argument("--display-latency", type=float,
+                        help="seconds from render to photons")
+    parser.add_argument("--noise", type=float, default=0.0,
+                        help="std of noise added to the measurements (0..1 units)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.synthetic:
+        recorded = synthetic_session(args.synthetic)
+    else:
+        recorded = RecordedSession(args.session)
+    latency_report(recorded, Config, args.pipeline_latency, args.display_latency, args.noise)
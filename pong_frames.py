@@ -0,0 +1,54 @@
+"""
+Allocation-free camera frame to Pygame surface conversion.
+
+``FrameSurface`` owns a preallocated RGB buffer and a Pygame surface that
+wraps that buffer directly (``pygame.image.frombuffer``). Each update resizes
+the BGR camera frame with OpenCV into a persistent scratch array and converts
+it to RGB straight into the shared buffer, so the surface changes in place
+and nothing is allocated per frame.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import cv2
+import numpy as np
+import pygame
+
+
+class FrameSurface:
+    """Persistent surface showing the latest camera frame at a fixed size."""
+
+    def __init__(self, size):
+        """
+        Args:
+            size (tuple): Target (width, height) of the surface in pixels
+        """
+        self.size = (int(size[0]), int(size[1]))
+        width, height = self.size
+        self._resized = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+        # The surface shares memory with self._rgb; keep both alive together
+        self.surface = pygame.image.frombuffer(self._rgb, self.size, "RGB")
+        self.updates = 0
+
+    def update(self, frame):
+        """
+        Show a new BGR camera frame.
+
+        Args:
+            frame (numpy.ndarray): BGR frame of any size
+
+        Returns:
+            pygame.Surface: The (same, persistent) surface, now showing the frame
+        """
+        height, width = frame.shape[:2]
+        if (width, height) == self.size:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        else:
+            interpolation = cv2.INTER_AREA if width > self.size[0] else cv2.INTER_LINEAR
+            cv2.resize(frame, self.size, dst=self._resized, interpolation=interpolation)
+            cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        self.updates += 1
+        return self.surface
@@ -12,66 +12,34 @@ Repository: https://github.com/ekagansahin/hand-controlled-pong
 License: MIT
 """
 
-import sys
+import argparse
 import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
 import pygame
-import cv2
 import numpy as np
-import mediapipe as mp
 
-
-# =============================================================================
-# CONFIGURATION AND CONSTANTS
-# =============================================================================
-
-class Config:
-    """Game configuration constants."""
-    # Display settings
-    FULLSCREEN = True
-    DEFAULT_WIDTH = 1280
-    DEFAULT_HEIGHT = 720
-    
-    # Game parameters
-    FPS = 60
-    WINNING_SCORE = 5
-    OPPONENT_SPEED = 21
-    SMOOTHING_FACTOR = 0.2  # Dampens jitter in hand tracking
-    
-    # Ball settings
-    BALL_INITIAL_SPEED_MIN = 12
-    BALL_INITIAL_SPEED_MAX = 19
-    BALL_COLLISION_SPEED_MIN = 12
-    BALL_COLLISION_SPEED_MAX = 25
-    BALL_MIN_VERTICAL_SPEED = 8
-    
-    # Paddle settings
-    PADDLE_WIDTH = 15
-    PADDLE_HEIGHT = 140
-    PADDLE_MARGIN = 50
-    
-    # Visual settings
-    BALL_SIZE = 30
-    TRAIL_COUNT = 5
-    TRAIL_START_COLOR = 240
-    CAMERA_PREVIEW_WIDTH = 160
-    CAMERA_PREVIEW_HEIGHT = 120
-    CAMERA_PREVIEW_MARGIN = 10
-    
-    # Hand tracking settings
-    MIN_DETECTION_CONFIDENCE = 0.7
-    MIN_TRACKING_CONFIDENCE = 0.5
-    MAX_NUM_HANDS = 1
-    
-    # Calibration settings
-    CALIBRATION_COUNTDOWN = 5
-    
-    # Colors (RGB)
-    BLACK = (0, 0, 0)
-    WHITE = (255, 255, 255)
-    GRAY = (200, 200, 200)
-    GREEN = (0, 255, 0)
-    RED = (255, 0, 0)
-    BLUE = (0, 0, 255)
+from pong_calibration import estimator_from_config, load_profile, save_profile, validate_range
+from pong_capture import open_capture
+from pong_config import Config, add_config_arguments, configure
+from pong_filters import PaddleTargets
+from pong_frames import FrameSurface
+from pong_gestures import GESTURE_FIST, GESTURE_OPEN_PALM, GESTURE_PINCH, GestureRecognizer
+from pong_governor import governor_from_config
+from pong_net import create_session
+from pong_pipeline import (HandRegion, TrackingPipeline, finger_diffs, hand_points,
+                           hands_needed)
+from pong_profiler import FrameProfiler
+from pong_render import GameRenderer
+from pong_replay import new_seed, recorder_for_match
+from pong_scenes import Scene, SceneManager, wake
+from pong_sources import SessionRecorder
+from pong_telemetry import recorder_for_game
+from pong_simulation import PongSimulation
+from pong_trackers import create_tracker
 
 
 # =============================================================================
@@ -96,21 +64,14 @@ def initialize_pygame():
     return screen
 
 
-def initialize_mediapipe():
-    """Initialize MediaPipe Hands solution."""
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(
-        min_detection_confidence=Config.MIN_DETECTION_CONFIDENCE,
-        min_tracking_confidence=Config.MIN_TRACKING_CONFIDENCE,
-        max_num_hands=Config.MAX_NUM_HANDS
-    )
-    mp_drawing = mp.solutions.drawing_utils
-    return mp_hands, hands, mp_drawing
+def initialize_tracker():
+    """Load the hand-tracking backend selected by ``Config.TRACKER_BACKEND`` (slow)."""
+    return create_tracker(Config.TRACKER_BACKEND, Config, hands_needed(Config))
 
 
 def initialize_camera():
-    """Initialize webcam with error handling."""
-    camera = cv2.VideoCapture(0)
+    """Initialize webcam (or the configured video/image source) with error handling."""
+    camera = open_capture(Config)
     
     if not camera.isOpened():
         print("Error: Could not open webcam.")
@@ -118,83 +79,256 @@ def initialize_camera():
         print("  1. A webcam is connected")
         print("  2. No other application is using the webcam")
         print("  3. You have granted camera permissions")
+        print("Run 'python pong_capture.py --list' to see the cameras OpenCV can open")
         return None
     
-    # Set camera properties for better performance
-    camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    camera.set(cv2.CAP_PROP_FPS, 30)
-    
     return camera
 
 
-def generate_trail_colors():
-    """Generate gradient colors for ball trail."""
-    trail_colors = []
-    for i in range(Config.TRAIL_COUNT):
-        val = Config.TRAIL_START_COLOR - (i * (Config.TRAIL_START_COLOR / Config.TRAIL_COUNT))
-        trail_colors.append((val, val, val))
-    return trail_colors
-
-
-# Initialize global components
-screen = initialize_pygame()
-WIDTH, HEIGHT = screen.get_size()
-
-mp_hands, hands, mp_drawing = initialize_mediapipe()
-camera = initialize_camera()
-
-# Initialize fonts
-try:
-    main_font = pygame.font.Font(None, 74)
-    comment_font = pygame.font.Font(None, 44)
-    ui_font = pygame.font.Font(None, 50)
-    calibration_font = pygame.font.Font(None, 40)
-    game_over_font = pygame.font.Font(None, 100)
-    pause_font = pygame.font.Font(None, 84)
-except Exception as e:
-    print(f"Error loading fonts: {e}")
-    sys.exit(1)
-
-# Generate trail colors
-trail_colors = generate_trail_colors()
-
-# Initialize game objects
-player_paddle = pygame.Rect(
-    Config.PADDLE_MARGIN, 
-    HEIGHT // 2 - Config.PADDLE_HEIGHT // 2, 
-    Config.PADDLE_WIDTH, 
-    Config.PADDLE_HEIGHT
-)
-opponent_paddle = pygame.Rect(
-    WIDTH - Config.PADDLE_MARGIN - Config.PADDLE_WIDTH,
-    HEIGHT // 2 - Config.PADDLE_HEIGHT // 2,
-    Config.PADDLE_WIDTH,
-    Config.PADDLE_HEIGHT
-)
-ball = pygame.Rect(
-    WIDTH // 2 - Config.BALL_SIZE // 2,
-    HEIGHT // 2 - Config.BALL_SIZE // 2,
-    Config.BALL_SIZE,
-    Config.BALL_SIZE
-)
-
-# Initialize trail
-trail_rects = [
-    pygame.Rect(
-        WIDTH // 2 - Config.BALL_SIZE // 2,
-        HEIGHT // 2 - Config.BALL_SIZE // 2,
-        Config.BALL_SIZE,
-        Config.BALL_SIZE
+def initialize_fonts():
+    """Load every font used by the UI."""
+    try:
+        return SimpleNamespace(
+            main=pygame.font.Font(None, 74),
+            comment=pygame.font.Font(None, 44),
+            ui=pygame.font.Font(None, 50),
+            calibration=pygame.font.Font(None, 40),
+            game_over=pygame.font.Font(None, 100),
+            pause=pygame.font.Font(None, 84),
+            hud=pygame.font.SysFont("monospace", 16)
+        )
+    except Exception as e:
+        print(f"Error loading fonts: {e}")
+        sys.exit(1)
+
+
+def initialize_game_objects(screen, main_font):
+    """
+    Create the simulation, renderer and the Rects that mirror the simulation.
+
+    Args:
+        screen (pygame.Surface): Display surface
+        main_font (pygame.font.Font): Font for the scores
+
+    Returns:
+        SimpleNamespace: The game objects
+    """
+    width, height = screen.get_size()
+    ball_size = Config.BALL_SIZE
+    return SimpleNamespace(
+        player_paddle=pygame.Rect(
+            Config.PADDLE_MARGIN,
+            height // 2 - Config.PADDLE_HEIGHT // 2,
+            Config.PADDLE_WIDTH,
+            Config.PADDLE_HEIGHT
+        ),
+        opponent_paddle=pygame.Rect(
+            width - Config.PADDLE_MARGIN - Config.PADDLE_WIDTH,
+            height // 2 - Config.PADDLE_HEIGHT // 2,
+            Config.PADDLE_WIDTH,
+            Config.PADDLE_HEIGHT
+        ),
+        ball=pygame.Rect(width // 2 - ball_size // 2, height // 2 - ball_size // 2,
+                         ball_size, ball_size),
+        trail=np.empty((0, 2)),  # Trail centers to draw, newest first
+        # Lowered by the quality governor under load
+        trail_count=Config.TRAIL_COUNT,
+        show_preview=True,
+        # Game state lives in the headless simulation; the Rects only mirror it
+        simulation=PongSimulation(width, height, Config,
+                                  two_player=Config.TWO_PLAYER or Config.NET_ROLE is not None),
+        # Incremental renderer for the game screen (cached background, dirty rects)
+        renderer=GameRenderer(screen, main_font, Config)
     )
-    for _ in range(Config.TRAIL_COUNT)
-]
 
-# Game state variables
-ball_speed_x = 0
-ball_speed_y = 0
-player_score = 0
-opponent_score = 0
+
+class AppContext:
+    """
+    Lazily constructed game subsystems.
+
+    Importing this module creates nothing. The display, fonts and game
+    objects are built on first access; the camera and the hand-tracking model are
+    loaded concurrently on worker threads by ``start_background_init`` so the
+    start screen can already be shown while they load. Each phase's duration
+    is recorded in ``startup_times``.
+    """
+
+    def __init__(self):
+        self.created_at = time.perf_counter()
+        self.startup_times = {}
+
+        self._screen = None
+        self._fonts = None
+        self._game = None
+        self._executor = None
+        self._camera_future = None
+        self._tracking_future = None
+
+        self.pipeline = None
+        self.recorder = None
+        self.net = None  # NetHost / NetClient during network play
+        self.gestures = None
+        if Config.GESTURES_ENABLED:
+            self.gestures = GestureRecognizer(
+                hold_time=Config.GESTURE_HOLD_TIME,
+                pinch_threshold=Config.GESTURE_PINCH_THRESHOLD,
+                budget=Config.GESTURE_BUDGET_MS / 1000.0
+            )
+        # Trades visual quality for frame rate when frames run late
+        self.governor = governor_from_config(Config) if Config.QUALITY_GOVERNOR else None
+
+        # Per-stage frame timing (F3 toggles it in game)
+        self.profiler = FrameProfiler(
+            enabled=Config.PROFILER_ENABLED,
+            window=Config.PROFILER_WINDOW,
+            export_path=Config.PROFILER_EXPORT_PATH,
+            export_interval=Config.PROFILER_EXPORT_INTERVAL
+        )
+
+    def _timed(self, phase, factory):
+        start = time.perf_counter()
+        value = factory()
+        self.startup_times[phase] = time.perf_counter() - start
+        return value
+
+    def mark(self, phase):
+        """
+        Record the time elapsed since the context was created.
+
+        Args:
+            phase (str): Name of the milestone (recorded only once)
+        """
+        self.startup_times.setdefault(phase, time.perf_counter() - self.created_at)
+
+    # -------------------------------------------------------------------------
+    # Subsystems
+    # -------------------------------------------------------------------------
+
+    @property
+    def screen(self):
+        """pygame.Surface: The display, created on first access."""
+        if self._screen is None:
+            self._screen = self._timed("display", initialize_pygame)
+        return self._screen
+
+    @property
+    def size(self):
+        """tuple: (width, height) of the display."""
+        return self.screen.get_size()
+
+    @property
+    def fonts(self):
+        """SimpleNamespace: UI fonts, loaded on first access."""
+        if self._fonts is None:
+            self.screen  # Fonts need pygame initialized
+            self._fonts = self._timed("fonts", initialize_fonts)
+        return self._fonts
+
+    @property
+    def game(self):
+        """SimpleNamespace: Simulation, renderer and drawing Rects."""
+        if self._game is None:
+            self._game = self._timed(
+                "game_objects", lambda: initialize_game_objects(self.screen, self.fonts.main)
+            )
+        return self._game
+
+    def start_background_init(self):
+        """Open the camera and load the hand-tracking model concurrently on worker threads."""
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        self._camera_future = self._executor.submit(self._timed, "camera", initialize_camera)
+        self._tracking_future = self._executor.submit(
+            self._timed, "tracker", initialize_tracker
+        )
+        # Wake idle screens waiting for the loaders
+        for future in (self._camera_future, self._tracking_future):
+            future.add_done_callback(lambda done: wake())
+
+    @property
+    def background_ready(self):
+        """bool: True once the camera and the hand-tracking model finished loading."""
+        return (self._executor is not None and
+                self._camera_future.done() and self._tracking_future.done())
+
+    @property
+    def camera(self):
+        """Frame source, or None if it could not be opened. Blocks until loaded."""
+        self.start_background_init()
+        return self._camera_future.result()
+
+    @property
+    def tracking(self):
+        """HandTracker: The hand-tracking backend. Blocks until loaded."""
+        self.start_background_init()
+        return self._tracking_future.result()
+
+    def start_pipeline(self):
+        """Start the background tracking pipeline if the camera is available."""
+        camera = self.camera
+        if camera is None or not camera.isOpened():
+            return None
+        if self.pipeline is None:
+            tracker = self.tracking
+            if not tracker.full_landmarks:
+                self.gestures = None  # The backend cannot tell hand shapes apart
+            if Config.RECORD_SESSION:
+                self.recorder = SessionRecorder(Config.RECORD_SESSION,
+                                                max_hands=hands_needed(Config))
+            region = None
+            if Config.TRACKING_ROI and tracker.supports_region:
+                region = HandRegion(Config.TRACKING_ROI_PADDING, Config.TRACKING_ROI_MIN_SIZE,
+                                    hands_needed(Config))
+            self.pipeline = TrackingPipeline(
+                camera, tracker, tracker.mp_hands, tracker.mp_drawing,
+                region=region,
+                inference_scale=Config.TRACKING_INFERENCE_SCALE,
+                profiler=self.profiler,
+                recorder=self.recorder
+            )
+        return self.pipeline.start()
+
+    def start_network(self):
+        """Open the network session selected by ``Config.NET_ROLE`` (None for local play)."""
+        if self.net is None and Config.NET_ROLE is not None:
+            self.net = create_session(self.game.simulation, Config)
+        return self.net
+
+    def report_startup(self):
+        """Print how long each startup phase took."""
+        print("Startup timing:")
+        for phase, seconds in self.startup_times.items():
+            print(f"  {phase:<16}{seconds * 1000:8.1f} ms")
+
+    def shutdown(self):
+        """Release resources (camera, models, display)."""
+        if self.profiler.enabled and Config.PROFILER_EXPORT_PATH:
+            self.profiler.export(Config.PROFILER_EXPORT_PATH)
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            print(f"Tracking pipeline stats: {self.pipeline.stats()}")
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.net is not None:
+            self.net.transport.close()
+        if self._executor is not None:
+            try:
+                camera = self._camera_future.result()
+                if camera is not None and camera.isOpened():
+                    camera.release()
+                self._tracking_future.result().close()
+            except Exception as e:
+                print(f"Warning: Error while releasing resources: {e}")
+            self._executor.shutdown(wait=False)
+        pygame.quit()
+
+
+# Subsystems are created on demand; importing this module has no side effects
+app = AppContext()
+
+# Frames between profiler HUD refreshes
+HUD_REFRESH_FRAMES = 15
 
 
 # =============================================================================
@@ -203,374 +337,817 @@ opponent_score = 0
 
 def reset_game_state():
     """Reset scores, speeds, and object positions for a new game."""
-    global player_score, opponent_score, ball_speed_x, ball_speed_y
-    player_score = 0
-    opponent_score = 0
-    player_paddle.y = HEIGHT // 2 - Config.PADDLE_HEIGHT // 2
-    opponent_paddle.y = HEIGHT // 2 - Config.PADDLE_HEIGHT // 2
-    ball.center = (WIDTH // 2, HEIGHT // 2)
-    initial_speed = random.randint(Config.BALL_INITIAL_SPEED_MIN, Config.BALL_INITIAL_SPEED_MAX)
-    ball_speed_x = initial_speed * random.choice([1, -1])
-    ball_speed_y = initial_speed * random.choice([1, -1])
-
-def draw_elements(frame_surface=None):
-    """Render all visual elements (paddles, ball, scores, optional camera feed)."""
-    screen.fill(Config.BLACK)
-    pygame.draw.rect(screen, Config.WHITE, player_paddle)
-    pygame.draw.rect(screen, Config.WHITE, opponent_paddle)
-    pygame.draw.ellipse(screen, Config.WHITE, ball)
-
-    # Ball trail
-    for i in range(Config.TRAIL_COUNT):
-        pygame.draw.ellipse(screen, trail_colors[i], trail_rects[i])
-
-    # Center dividing line
-    pygame.draw.aaline(screen, Config.WHITE, (WIDTH // 2, 0), (WIDTH // 2, HEIGHT))
-
-    # Scores
-    player_text = main_font.render(str(player_score), True, Config.WHITE)
-    screen.blit(player_text, (WIDTH // 4, 20))
-    opponent_text = main_font.render(str(opponent_score), True, Config.WHITE)
-    screen.blit(opponent_text, (WIDTH * 3 // 4, 20))
-
-    # Mini camera preview (bottom-right)
+    app.game.simulation.reset_game()
+    sync_rects(app.game.simulation.state)
+
+def sync_rects(state):
+    """
+    Copy a simulation state into the Pygame Rects used for drawing.
+
+    Args:
+        state (PongState): State to mirror (usually an interpolated view)
+    """
+    game = app.game
+    game.player_paddle.centery = round(state.player_y)
+    game.opponent_paddle.centery = round(state.opponent_y)
+    game.ball.center = (round(state.ball_x), round(state.ball_y))
+    game.trail = state.trail.newest(game.trail_count)
+
+def draw_elements(frame_surface=None, frame_updated=False):
+    """
+    Render all visual elements (paddles, ball, scores, optional camera feed).
+
+    Only regions that changed since the last frame are redrawn; call
+    ``app.game.renderer.present()`` afterwards to push them to the display.
+
+    Args:
+        frame_surface (pygame.Surface): Camera preview surface, or None
+        frame_updated (bool): True if the preview shows a new camera frame
+    """
+    game = app.game
     if frame_surface:
-        preview_width = Config.CAMERA_PREVIEW_WIDTH
-        preview_height = Config.CAMERA_PREVIEW_HEIGHT
-        margin = Config.CAMERA_PREVIEW_MARGIN
-        frame_surface_scaled = pygame.transform.scale(frame_surface, (preview_width, preview_height))
-        screen.blit(frame_surface_scaled, (WIDTH - preview_width - margin, HEIGHT - preview_height - margin))
+        preview_size = (Config.CAMERA_PREVIEW_WIDTH, Config.CAMERA_PREVIEW_HEIGHT)
+        if frame_surface.get_size() != preview_size:
+            frame_surface = pygame.transform.scale(frame_surface, preview_size)
+    else:
+        frame_surface = None
+
+    game.renderer.draw(
+        (game.player_paddle, game.opponent_paddle),
+        game.ball,
+        game.trail,
+        (game.simulation.state.player_score, game.simulation.state.opponent_score),
+        frame_surface,
+        frame_updated
+    )
+
+def apply_quality(settings):
+    """
+    Apply a quality level chosen by the governor.
+
+    Args:
+        settings (dict): Entry of ``pong_governor.QUALITY_LEVELS``
+    """
+    game = app.game
+    game.trail_count = round(Config.TRAIL_COUNT * settings["trail"])
+    game.show_preview = settings["preview"]
+    if app.pipeline is not None:
+        app.pipeline.inference_stride = settings["inference_stride"]
+        app.pipeline.request_capture_scale(settings["capture_scale"])
+    # Erase whatever is no longer drawn (preview, trail)
+    game.renderer.invalidate()
 
 def reset_ball():
     """Center the ball after a point and flip its direction."""
-    global ball_speed_x, ball_speed_y
-    ball.center = (WIDTH // 2, HEIGHT // 2)
-    ball_speed_x *= -1
-    ball_speed_y *= random.choice([1, -1])
+    app.game.simulation.reset_ball()
+    sync_rects(app.game.simulation.state)
 
 def safe_exit():
     """Release resources (camera, models) and terminate cleanly."""
     print("Exiting game...")
-    if camera is not None and camera.isOpened():
-        camera.release()
-    if hands is not None:
-        hands.close()
-    pygame.quit()
+    app.shutdown()
     sys.exit()
 
-def calibrate_finger():
+def player_diffs(result, players):
     """
-    Two-stage calibration to measure the player's finger motion range.
-    
+    Finger measure of each player's hand in a tracking result.
+
+    Args:
+        result (TrackingResult): Tracking result with all detected hands
+        players (int): 1, or 2 for a two-player game
+
     Returns:
-        tuple: (min_diff, max_diff) representing the calibrated range
+        list: ``finger_diff`` per player (left paddle first), None where no hand was found
     """
-    if camera is None or not camera.isOpened():
-        print("Warning: Camera not available. Using default calibration values.")
-        return 0.0, 0.2
-    
-    min_diff = 1.0
-    max_diff = 0.0
-    
-    for stage in range(2):  # 0: raise finger; 1: lower finger
-        message = (
-            "Raise your index finger as HIGH as possible"
-            if stage == 0 else
-            "Now, lower it as LOW as possible"
-        )
-        countdown = Config.CALIBRATION_COUNTDOWN
-        start_time = pygame.time.get_ticks()
-
-        while True:
-            elapsed_time = (pygame.time.get_ticks() - start_time) // 1000
-            time_left = countdown - elapsed_time
-            if time_left < 0:
-                break
-
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    safe_exit()
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_q:
-                    safe_exit()
-
-            # Grab a frame
-            success, frame = camera.read()
-            if not success:
-                continue
+    return finger_diffs(hand_points(result.hand_landmarks), result.handedness, players,
+                        Config.PLAYER_ASSIGNMENT)
 
-            frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = hands.process(rgb_frame)
-
-            if results.multi_hand_landmarks:
-                hand_landmarks = results.multi_hand_landmarks[0]
-                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
-                wrist_y = hand_landmarks.landmark[mp_hands.HandLandmark.WRIST].y
-                finger_y = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP].y
-                diff_y = wrist_y - finger_y
-
-                if stage == 0:
-                    if diff_y > max_diff:
-                        max_diff = diff_y
-                else:
-                    if diff_y < min_diff:
-                        min_diff = diff_y
-
-            # Draw calibration UI
-            screen.fill(Config.BLACK)
-            frame_surface = pygame.surfarray.make_surface(
-                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB).swapaxes(0, 1)
-            )
-            frame_surface = pygame.transform.scale(frame_surface, (WIDTH, HEIGHT))
-            screen.blit(frame_surface, (0, 0))
+def poll_menu_gestures():
+    """
+    Track the fingertip cursor on menu screens and turn pinches into clicks.
 
-            msg_text = calibration_font.render(message, True, Config.WHITE, Config.BLACK)
-            screen.blit(msg_text, (50, 50))
+    A pinch posts a left ``MOUSEBUTTONDOWN`` at the cursor, so menus handle
+    it like a mouse click on their next event poll.
 
-            countdown_text = main_font.render(str(time_left), True, Config.WHITE)
-            screen.blit(countdown_text, (WIDTH // 2 - 20, 100))
+    Returns:
+        tuple: Cursor position in screen pixels, or None without a tracked hand
+    """
+    recognizer = app.gestures
+    if recognizer is None or app.pipeline is None:
+        return None
+    fired = recognizer.update(app.pipeline.latest())
+    if recognizer.cursor is None:
+        return None
+    width, height = app.size
+    cursor = (int(recognizer.cursor[0] * width), int(recognizer.cursor[1] * height))
+    if GESTURE_PINCH in fired:
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=cursor, button=1))
+    return cursor
 
-            pygame.display.flip()
+def is_quit(event):
+    """
+    Check for the window close button or the Q key.
 
-    print(f"Calibration complete. Min Diff: {min_diff:.4f}, Max Diff: {max_diff:.4f}")
-    if max_diff <= min_diff:
-        print("Warning: Calibration failed. Using default values.")
-        return 0.0, 0.2
-    return min_diff, max_diff
+    Args:
+        event (pygame.event.Event): Event to check
 
-def start_screen():
-    """Show the start screen, wait for the user to click START or quit."""
-    clock = pygame.time.Clock()
-    start_button = pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2, 200, 60)
-    
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                safe_exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_q:
-                safe_exit()
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if start_button.collidepoint(event.pos):
-                    return
+    Returns:
+        bool: True if the event asks to quit
+    """
+    return (event.type == pygame.QUIT or
+            (event.type == pygame.KEYDOWN and event.key == pygame.K_q))
 
-        # UI
+
+# =============================================================================
+# SCENES
+# =============================================================================
+
+class MenuScene(Scene):
+    """
+    Idle screen redrawn only after input, finished background work or a cursor move.
+
+    Args:
+        flow (GameFlow): Decides the scene that follows
+    """
+
+    def __init__(self, flow):
+        super().__init__()
+        self.flow = flow
+        self.cursor = None
+
+    @property
+    def wake_interval(self):
+        """float: Poll the gesture cursor at the camera rate once tracking runs."""
+        if app.gestures is None or app.pipeline is None:
+            return None
+        return 1.0 / Config.CAMERA_FPS
+
+    def update(self, dt):
+        cursor = poll_menu_gestures()
+        if cursor != self.cursor:
+            self.cursor = cursor
+            self.invalidate()
+
+    def draw(self):
+        screen = app.screen
         screen.fill(Config.BLACK)
-        title_text = main_font.render("Hand Tracking PONG", True, Config.WHITE)
-        screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, HEIGHT // 4))
+        self.draw_menu(screen, *app.size)
+        if self.cursor is not None:
+            pygame.draw.circle(screen, Config.GREEN, self.cursor, 12, 3)
+        pygame.display.flip()
+
+    def draw_menu(self, screen, width, height):
+        """
+        Draw the menu's own content on the cleared screen.
 
-        instruction_text = comment_font.render(
+        Args:
+            screen (pygame.Surface): Display surface
+            width (int): Screen width
+            height (int): Screen height
+        """
+
+
+class StartScene(MenuScene):
+    """
+    Start screen: START begins a match, C toggles recalibration, Q quits.
+
+    Args:
+        flow (GameFlow): Decides the scene that follows
+        has_profile (bool): A saved calibration exists; C toggles recalibration
+    """
+
+    def __init__(self, flow, has_profile=False):
+        super().__init__(flow)
+        self.has_profile = has_profile
+        self.recalibrate = False
+        width, height = app.size
+        self.start_button = pygame.Rect(width // 2 - 100, height // 2, 200, 60)
+
+    def handle_event(self, event):
+        if is_quit(event):
+            self.manager.quit()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_c and self.has_profile:
+            self.recalibrate = not self.recalibrate
+            self.invalidate()
+        elif event.type == pygame.MOUSEBUTTONDOWN and self.start_button.collidepoint(event.pos):
+            self.manager.switch(self.flow.after_start(self.recalibrate))
+
+    def draw_menu(self, screen, width, height):
+        fonts = app.fonts
+        title_text = fonts.main.render("Hand Tracking PONG", True, Config.WHITE)
+        screen.blit(title_text, (width // 2 - title_text.get_width() // 2, height // 4))
+
+        instruction_text = fonts.comment.render(
             "Please rest your elbow on the table. Keep your arm straight.",
             True,
             Config.WHITE
         )
-        screen.blit(instruction_text, (WIDTH // 2 - instruction_text.get_width() // 2, HEIGHT // 3))
+        screen.blit(instruction_text, (width // 2 - instruction_text.get_width() // 2, height // 3))
 
-        pygame.draw.rect(screen, Config.GREEN, start_button)
-        start_text = ui_font.render("START", True, Config.BLACK)
-        screen.blit(start_text, (start_button.x + 55, start_button.y + 15))
+        pygame.draw.rect(screen, Config.GREEN, self.start_button)
+        start_text = fonts.ui.render("START", True, Config.BLACK)
+        screen.blit(start_text, (self.start_button.x + 55, self.start_button.y + 15))
 
-        pygame.display.flip()
-        clock.tick(15)
+        if self.has_profile:
+            profile_message = (
+                "Calibration will run again (C to use the saved one)"
+                if self.recalibrate else
+                "Using saved calibration (C to recalibrate)"
+            )
+            profile_text = fonts.calibration.render(profile_message, True, Config.WHITE)
+            screen.blit(profile_text, (width // 2 - profile_text.get_width() // 2, height * 2 // 3))
+
+        # Camera and model keep loading in the background meanwhile; their
+        # completion wakes the scene to drop this line
+        if not app.background_ready:
+            status_text = fonts.calibration.render(
+                "Loading camera and hand tracking...", True, Config.GRAY
+            )
+            screen.blit(status_text, (width // 2 - status_text.get_width() // 2, height * 3 // 4))
+
+    def draw(self):
+        super().draw()
+        app.mark("first_frame")
 
-def game_over_screen(winner):
+
+class LoadingScene(Scene):
     """
-    Show winner and let the user choose 'Play Again' or 'Quit'.
-    
+    Loading screen shown until the camera and the hand-tracking model are ready.
+
+    Sleeps until the background loaders wake it.
+
     Args:
-        winner (str): The winner of the game ("Player" or "Computer")
-        
-    Returns:
-        bool: True if user wants to play again, False to quit
+        flow (GameFlow): Decides the scene that follows
     """
-    clock = pygame.time.Clock()
-    play_again_button = pygame.Rect(WIDTH // 2 - 250, HEIGHT * 3 // 4 - 30, 200, 60)
-    quit_button = pygame.Rect(WIDTH // 2 + 50, HEIGHT * 3 // 4 - 30, 200, 60)
-    
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_q:
-                return False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if play_again_button.collidepoint(event.pos):
-                    return True
-                if quit_button.collidepoint(event.pos):
-                    return False
-
-        # UI
-        screen.fill(Config.BLACK)
-        game_over_text = game_over_font.render("GAME OVER", True, Config.RED)
-        screen.blit(game_over_text, (WIDTH // 2 - game_over_text.get_width() // 2, HEIGHT // 4))
 
-        winner_text_str = "USER WINS!" if winner == "Player" else "COMPUTER WINS!"
-        winner_text = main_font.render(winner_text_str, True, Config.WHITE)
-        screen.blit(winner_text, (WIDTH // 2 - winner_text.get_width() // 2, HEIGHT // 2 - 50))
+    def __init__(self, flow):
+        super().__init__()
+        self.flow = flow
 
-        pygame.draw.rect(screen, Config.GREEN, play_again_button)
-        play_again_text = ui_font.render("Play Again", True, Config.BLACK)
-        screen.blit(play_again_text, (play_again_button.x + 20, play_again_button.y + 15))
+    def enter(self):
+        self.update(0.0)
 
-        pygame.draw.rect(screen, Config.BLUE, quit_button)
-        quit_text = ui_font.render("Quit", True, Config.WHITE)
-        screen.blit(quit_text, (quit_button.x + 70, quit_button.y + 15))
+    def handle_event(self, event):
+        if is_quit(event):
+            self.manager.quit()
 
+    def update(self, dt):
+        if app.background_ready:
+            self.manager.switch(self.flow.after_loading())
+
+    def draw(self):
+        screen = app.screen
+        width, height = app.size
+        screen.fill(Config.BLACK)
+        loading_text = app.fonts.comment.render(
+            "Starting camera and hand tracking...", True, Config.WHITE
+        )
+        screen.blit(loading_text, (width // 2 - loading_text.get_width() // 2, height // 2))
         pygame.display.flip()
-        clock.tick(15)
+
+
+class CalibrationScene(Scene):
+    """
+    Two-stage calibration to measure each player's finger motion range.
+
+    In two-player games both players calibrate at the same time. Each stage
+    ends early once every player's robust estimate has moved away from the
+    starting pose and converged. Only ranges that pass ``validate_range``
+    are used and saved to the players' profiles.
+
+    Args:
+        flow (GameFlow): Receives the (min_diff, max_diff) per player
+        players (int): Number of players to calibrate (1 or 2)
+    """
+
+    MESSAGES = ("Raise your index finger as HIGH as possible",
+                "Now, lower it as LOW as possible")
+
+    def __init__(self, flow, players=1):
+        super().__init__()
+        self.flow = flow
+        self.players = players
+        self.fps = Config.FPS
+        self.default = [(0.0, 0.2)] * players
+        self.estimates = []
+        self.last_sequence = 0
+        self.camera_view = None
+        self.time_left = 0
+
+    def enter(self):
+        pipeline = app.pipeline
+        if pipeline is None or not pipeline.running:
+            print("Warning: Camera not available. Using default calibration values.")
+            self.manager.switch(self.flow.after_calibration(self.default))
+            return
+        self.camera_view = FrameSurface(app.size)
+        self._start_stage(0)
+
+    def _start_stage(self, stage):
+        """Begin stage 0 (raise finger) or 1 (lower finger)."""
+        self.stage = stage
+        self.message = self.MESSAGES[stage]
+        if self.players > 1:
+            self.message = self.message.replace("your index finger", "your index fingers")
+        self.estimators = [estimator_from_config(stage == 0, Config)
+                           for _ in range(self.players)]
+        self.start_time = pygame.time.get_ticks()
+
+    def handle_event(self, event):
+        if is_quit(event):
+            self.manager.quit()
+
+    def update(self, dt):
+        elapsed_time = (pygame.time.get_ticks() - self.start_time) // 1000
+        self.time_left = Config.CALIBRATION_COUNTDOWN - elapsed_time
+        if self.time_left < 0 or all(estimator.converged for estimator in self.estimators):
+            self.estimates.append([estimator.estimate for estimator in self.estimators])
+            if self.stage == 0:
+                self._start_stage(1)
+            else:
+                self.manager.switch(self.flow.after_calibration(self._results()))
+            return
+
+        # Newest tracking result from the background pipeline
+        result = app.pipeline.latest()
+        if result is None or result.sequence == self.last_sequence:
+            return
+        self.last_sequence = result.sequence
+        with app.profiler.scope("preview"):
+            self.camera_view.update(result.frame)
+        for estimator, diff in zip(self.estimators, player_diffs(result, self.players)):
+            if diff is not None:
+                estimator.add(diff, result.timestamp)
+
+    def draw(self):
+        if self.last_sequence == 0:
+            return  # No camera frame yet
+        screen = app.screen
+        width = app.size[0]
+        fonts = app.fonts
+        profiler = app.profiler
+        # Draw calibration UI (the camera view covers the whole screen)
+        with profiler.scope("draw"):
+            screen.blit(self.camera_view.surface, (0, 0))
+
+            msg_text = fonts.calibration.render(self.message, True, Config.WHITE, Config.BLACK)
+            screen.blit(msg_text, (50, 50))
+
+            countdown_text = fonts.main.render(str(max(self.time_left, 0)), True, Config.WHITE)
+            screen.blit(countdown_text, (width // 2 - 20, 100))
+
+        with profiler.scope("present"):
+            pygame.display.flip()
+        profiler.end_frame()
+
+    def _results(self):
+        """Validated range per player; successful ones are saved to the profiles."""
+        calibrations = []
+        names = (Config.PLAYER_NAME, Config.PLAYER2_NAME)
+        for player, (max_diff, min_diff) in enumerate(zip(*self.estimates)):
+            label = f"Player {player + 1}: " if self.players > 1 else ""
+            if not validate_range(min_diff, max_diff, Config.CALIBRATION_MIN_RANGE):
+                print(f"Warning: {label}Calibration failed. Using default values.")
+                calibrations.append(self.default[player])
+                continue
+            print(f"{label}Calibration complete. Min Diff: {min_diff:.4f}, "
+                  f"Max Diff: {max_diff:.4f}")
+            if Config.CALIBRATION_PROFILE_PATH:
+                save_profile(Config.CALIBRATION_PROFILE_PATH, names[player], min_diff, max_diff)
+            calibrations.append((min_diff, max_diff))
+        return calibrations
+
+
+class GameOverScene(MenuScene):
+    """
+    Show the winner and let the user choose 'Play Again' or 'Quit'.
+
+    Args:
+        flow (GameFlow): Decides the scene that follows
+        winner (str): The winner of the game ("Player" or "Computer")
+    """
+
+    def __init__(self, flow, winner):
+        super().__init__(flow)
+        self.winner = winner
+        width, height = app.size
+        self.play_again_button = pygame.Rect(width // 2 - 250, height * 3 // 4 - 30, 200, 60)
+        self.quit_button = pygame.Rect(width // 2 + 50, height * 3 // 4 - 30, 200, 60)
+
+    def handle_event(self, event):
+        if is_quit(event):
+            self.manager.switch(self.flow.after_game_over(False))
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if self.play_again_button.collidepoint(event.pos):
+                self.manager.switch(self.flow.after_game_over(True))
+            elif self.quit_button.collidepoint(event.pos):
+                self.manager.switch(self.flow.after_game_over(False))
+
+    def draw_menu(self, screen, width, height):
+        fonts = app.fonts
+        game_over_text = fonts.game_over.render("GAME OVER", True, Config.RED)
+        screen.blit(game_over_text, (width // 2 - game_over_text.get_width() // 2, height // 4))
+
+        if Config.NET_ROLE is not None:
+            local_side = "Player" if Config.NET_ROLE == "host" else "Computer"
+            winner_text_str = "YOU WIN!" if self.winner == local_side else "OPPONENT WINS!"
+        elif Config.TWO_PLAYER:
+            winner_text_str = "PLAYER 1 WINS!" if self.winner == "Player" else "PLAYER 2 WINS!"
+        else:
+            winner_text_str = "USER WINS!" if self.winner == "Player" else "COMPUTER WINS!"
+        winner_text = fonts.main.render(winner_text_str, True, Config.WHITE)
+        screen.blit(winner_text, (width // 2 - winner_text.get_width() // 2, height // 2 - 50))
+
+        pygame.draw.rect(screen, Config.GREEN, self.play_again_button)
+        play_again_text = fonts.ui.render("Play Again", True, Config.BLACK)
+        screen.blit(play_again_text, (self.play_again_button.x + 20,
+                                      self.play_again_button.y + 15))
+
+        pygame.draw.rect(screen, Config.BLUE, self.quit_button)
+        quit_text = fonts.ui.render("Quit", True, Config.WHITE)
+        screen.blit(quit_text, (self.quit_button.x + 70, self.quit_button.y + 15))
 
 
 # =============================================================================
 # MAIN GAME LOOP
 # =============================================================================
 
-def game_loop(min_diff, max_diff):
+class GameScene(Scene):
     """
-    Run the main game loop.
-    
+    One match, updated and drawn at ``Config.FPS``.
+
     Args:
-        min_diff (float): Minimum calibrated finger position difference
-        max_diff (float): Maximum calibrated finger position difference
-        
-    Returns:
-        str: Winner of the game ("Player", "Computer", or "Quit")
-    """
-    global player_score, opponent_score, ball_speed_x, ball_speed_y
-    clock = pygame.time.Clock()
-    paused = False
-
-    while True:
-        # Event handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return "Quit"
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_q:
-                    return "Quit"
-                if event.key == pygame.K_p:
-                    paused = not paused  # Toggle pause
+        flow (GameFlow): Receives the winner ("Player", "Computer", or "Quit")
+        calibrations (list): (min_diff, max_diff) per player; a second entry
+            makes the right paddle follow the second player's hand
+    """
 
-        frame_surface = None
-        
-        if not paused:
-            # Hand tracking & player control
-            if camera is not None and camera.isOpened():
-                success, frame = camera.read()
-                if success:
-                    frame = cv2.flip(frame, 1)
-                    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    results = hands.process(rgb_frame)
-                    
-                    if results.multi_hand_landmarks:
-                        hand_landmarks = results.multi_hand_landmarks[0]
-                        mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                        
-                        wrist_y = hand_landmarks.landmark[mp_hands.HandLandmark.WRIST].y
-                        finger_y = hand_landmarks.landmark[mp_hands.HandLandmark.INDEX_FINGER_TIP].y
-                        current_diff = wrist_y - finger_y
-                        motion_range = max_diff - min_diff
-                        
-                        if motion_range > 0:
-                            percentage = max(0.0, min(1.0, (current_diff - min_diff) / motion_range))
-                            target_y = HEIGHT - (percentage * HEIGHT)
-                            player_paddle.centery += (target_y - player_paddle.centery) * Config.SMOOTHING_FACTOR
-                    
-                    frame_surface = pygame.surfarray.make_surface(
-                        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB).swapaxes(0, 1)
-                    )
-
-            # Simple opponent AI
-            if opponent_paddle.centery < ball.centery:
-                opponent_paddle.y += Config.OPPONENT_SPEED
-            if opponent_paddle.centery > ball.centery:
-                opponent_paddle.y -= Config.OPPONENT_SPEED
-
-            # Ball physics: update trail first
-            for i in range(Config.TRAIL_COUNT - 1, 0, -1):
-                trail_rects[i].center = trail_rects[i - 1].center
-            trail_rects[0].center = ball.center
-
-            # Move ball
-            ball.x += ball_speed_x
-            ball.y += ball_speed_y
-
-            # Collisions: walls
-            if ball.top <= 0 or ball.bottom >= HEIGHT:
-                ball_speed_y *= -1
-
-            # Collisions: paddles
-            if ball.colliderect(player_paddle) or ball.colliderect(opponent_paddle):
-                ball_speed_x *= -1
-                new_speed_x = random.randint(Config.BALL_COLLISION_SPEED_MIN, Config.BALL_COLLISION_SPEED_MAX)
-                sign_x = 1 if ball_speed_x > 0 else -1
-                ball_speed_x = new_speed_x * sign_x
-                ball_speed_y += random.uniform(-3, 3)
-                
-                if abs(ball_speed_y) < Config.BALL_MIN_VERTICAL_SPEED:
-                    sign_y = 1 if ball_speed_y >= 0 else -1
-                    ball_speed_y = Config.BALL_MIN_VERTICAL_SPEED * sign_y
-
-            # Scoring & win condition
-            if ball.left <= 0:
-                opponent_score += 1
-                if opponent_score >= Config.WINNING_SCORE:
-                    return "Computer"
-                reset_ball()
-            if ball.right >= WIDTH:
-                player_score += 1
-                if player_score >= Config.WINNING_SCORE:
-                    return "Player"
-                reset_ball()
-
-            # Paddle bounds
-            player_paddle.top = max(0, player_paddle.top)
-            player_paddle.bottom = min(HEIGHT, player_paddle.bottom)
-            opponent_paddle.top = max(0, opponent_paddle.top)
-            opponent_paddle.bottom = min(HEIGHT, opponent_paddle.bottom)
+    def __init__(self, flow, calibrations):
+        super().__init__()
+        self.flow = flow
+        self.calibrations = calibrations
+        self.fps = Config.FPS
+        self.winner = "Quit"
+
+    def enter(self):
+        game = app.game
+        self.players = len(self.calibrations)
+        self.paused = False
+        self.was_paused = False
+        self.frame_surface = None
+        self.frame_updated = False
+        self.last_sequence = 0
+        self.preview = FrameSurface((Config.CAMERA_PREVIEW_WIDTH, Config.CAMERA_PREVIEW_HEIGHT))
+        self.result = None
+        self.hud_surface = None
+        self.frame_count = 0
+        self.frame_end = time.perf_counter()
+        self.tracking_lost = False
+        # Pause gestures are opt-in and need a longer hold than menu gestures
+        self.gestures = app.gestures if Config.GESTURE_PAUSE else None
+        if self.gestures is not None:
+            self.gestures.debouncer.hold_time = Config.GESTURE_PAUSE_HOLD_TIME
+        # Timestamped filters predicting the hands' positions at display time;
+        # they replace the simulation's own per-tick smoothing
+        self.paddles = PaddleTargets(self.calibrations, app.size[1], Config)
+        self.targets = self.paddles.targets
+        game.simulation.input_smoothing = 1.0
+        # Network play: the session steps the (host) or a predicted (client) simulation
+        self.session = app.net
+        if self.session is not None:
+            self.session.reset()
+        self.telemetry = None
+        if Config.TELEMETRY_DIR:
+            self.telemetry = recorder_for_game(Config.TELEMETRY_DIR, Config)
+
+        # Local matches run on their own seeded random stream and can be replayed
+        self.seed = None
+        self.replay = None
+        if self.session is None:
+            self.seed = Config.MATCH_SEED if Config.MATCH_SEED is not None else new_seed()
+            game.simulation.rng = random.Random(self.seed)
+            reset_game_state()
+            if Config.REPLAY_DIR:
+                self.replay = recorder_for_match(Config.REPLAY_DIR, self.seed,
+                                                 self.calibrations, app.size, Config)
+        if app.governor is not None:
+            apply_quality(app.governor.settings)
+
+        # Other screens drew over everything; start with a full redraw
+        game.renderer.invalidate()
+
+    def exit(self):
+        if self.gestures is not None:
+            self.gestures.debouncer.hold_time = Config.GESTURE_HOLD_TIME
+        # Flushing the last chunks must not delay the game over screen
+        if self.telemetry is not None:
+            self.manager.run_task(self.telemetry.close, winner=self.winner, seed=self.seed)
+        if self.replay is not None:
+            self.manager.run_task(self.replay.close, winner=self.winner)
+
+    def finish(self, winner):
+        """
+        End the match.
+
+        Args:
+            winner (str): "Player", "Computer", or "Quit"
+        """
+        self.winner = winner
+        self.manager.switch(self.flow.after_game(winner))
+
+    def handle_event(self, event):
+        if is_quit(event):
+            self.finish("Quit")
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_p:
+                self.paused = not self.paused  # Toggle pause
+            if event.key == pygame.K_F3:
+                app.profiler.toggle()
+                self.hud_surface = None
+
+    def update(self, dt):
+        simulation = app.game.simulation
+        profiler = app.profiler
+        telemetry = self.telemetry
+        pipeline = app.pipeline
+
+        # Hand tracking (never blocks on the camera); polled while paused too
+        # so an open palm / fist can pause and resume the game
+        with profiler.scope("tracking"):
+            result = self.result = pipeline.latest() if pipeline is not None else None
+        if self.gestures is not None:
+            with profiler.scope("gestures"):
+                fired = self.gestures.update(result)
+            if GESTURE_OPEN_PALM in fired:
+                self.paused = True
+            elif GESTURE_FIST in fired:
+                self.paused = False
+
+        self.frame_updated = False
+        if self.paused:
+            return
+
+        # Player control
+        input_index = -1
+        if result is not None and result.sequence != self.last_sequence:
+            self.last_sequence = result.sequence
+            if telemetry is not None and self.tracking_lost != (not result.hand_landmarks):
+                self.tracking_lost = not self.tracking_lost
+                telemetry.event("tracking_lost" if self.tracking_lost else "tracking_found")
+            self.paddles.update(player_diffs(result, self.players), result.timestamp)
+            if self.replay is not None:
+                input_index = self.replay.input(result)
+
+            # Only rebuild the preview when a new camera frame arrived
+            if app.game.show_preview:
+                with profiler.scope("preview"):
+                    self.frame_surface = self.preview.update(result.frame)
+                self.frame_updated = True
+            else:
+                self.frame_surface = None
+
+        # Predict where the hands are when this frame reaches the screen
+        display_time = time.perf_counter() + Config.INPUT_DISPLAY_LATENCY
+        targets = self.paddles.predict(display_time)
+
+        # Physics runs in fixed ticks, independent of the render frame rate
+        session = self.session
+        with profiler.scope("physics"):
+            if session is not None:
+                events = session.step(dt, targets[0])
+            else:
+                events = simulation.step(dt, targets[0], targets[1])
+        if self.replay is not None:
+            self.replay.frame(dt, display_time, input_index, simulation.state)
+        if telemetry is not None:
+            telemetry.simulation_events(events, simulation)
+        if session is None:
+            if simulation.winner is not None:
+                self.finish(simulation.winner)
+        elif session.finished:
+            self.finish(session.winner)
+        elif session.timed_out:
+            if simulation.winner is not None:
+                # The final snapshot never arrived, but the match had already been decided
+                self.finish(simulation.winner)
+            else:
+                print("Connection to the other player was lost.")
+                self.finish("Quit")
+
+    def draw(self):
+        game = app.game
+        renderer = game.renderer
+        profiler = app.profiler
+        fonts = app.fonts
+        width, height = app.size
+        session = self.session
+        sync_rects(game.simulation.interpolate() if session is None else session.interpolate())
 
         # --- Render (runs even when paused) ---
-        draw_elements(frame_surface)
-
-        if paused:
-            pause_text = pause_font.render("PAUSED", True, Config.WHITE)
-            text_rect = pause_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-            screen.blit(pause_text, text_rect)
-
-        pygame.display.flip()
-        clock.tick(Config.FPS)
+        with profiler.scope("draw"):
+            draw_elements(self.frame_surface, self.frame_updated)
+
+            if self.paused:
+                pause_text = fonts.pause.render("PAUSED", True, Config.WHITE)
+                text_rect = pause_text.get_rect(center=(width // 2, height // 2))
+                renderer.draw_overlay(pause_text, text_rect)
+
+            if profiler.enabled:
+                if self.hud_surface is None or self.frame_count % HUD_REFRESH_FRAMES == 0:
+                    self.hud_surface = profiler.render_hud(fonts.hud, Config.GREEN, Config.BLACK)
+                if self.hud_surface is not None:
+                    renderer.draw_overlay(self.hud_surface,
+                                          self.hud_surface.get_rect(topleft=(10, 10)))
+
+        with profiler.scope("present"):
+            renderer.present()
+        profiler.end_frame()
+        self.frame_count += 1
+        self.frame_end = time.perf_counter()
+
+    def end_frame(self, frame_time, work_time):
+        governor = app.governor
+        telemetry = self.telemetry
+        # Paused frames do no game work and say nothing about the load
+        if governor is not None and not self.paused and governor.update(frame_time, work_time):
+            apply_quality(governor.settings)
+            print(f"Quality level {governor.level}: {governor.settings}")
+            if telemetry is not None:
+                telemetry.event("quality", value=governor.level)
+
+        if telemetry is not None:
+            if self.paused != self.was_paused:
+                telemetry.event("pause" if self.paused else "resume")
+                self.was_paused = self.paused
+            result = self.result
+            telemetry.frame(
+                frame_time, work_time, app.game.simulation.state, self.targets[0],
+                self.frame_end - result.timestamp if result is not None else None,
+                len(result.hand_landmarks) if result is not None else 0,
+                governor.level if governor is not None else 0
+            )
 
 
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
 
-def main():
-    """Main entry point for the game."""
-    if camera is None or not camera.isOpened():
-        print("\nError: Cannot start game without a working camera.")
-        print("Please check your webcam and try again.")
-        input("Press Enter to exit...")
-        safe_exit()
-    
-    # Main game loop (enables "Play Again" functionality)
-    while True:
+class GameFlow:
+    """
+    Chooses the scene that follows each screen and keeps state between matches.
+
+    Args:
+        players (int): 1, or 2 for a local two-player game
+        calibrations (list): Saved (min_diff, max_diff) per player, or None
+    """
+
+    def __init__(self, players, calibrations=None):
+        self.players = players
+        self.calibrations = calibrations
+        self.recalibrate = False
+
+    def start(self):
+        """
+        Reset the match and show the start screen.
+
+        Returns:
+            Scene: The start screen
+        """
         reset_game_state()
-        start_screen()
+        return StartScene(self, self.calibrations is not None)
+
+    def after_start(self, recalibrate):
+        """Wait for the camera and model if they are still loading."""
+        self.recalibrate = recalibrate
+        if app.pipeline is None and not app.background_ready:
+            return LoadingScene(self)
+        return self.after_loading()
+
+    def after_loading(self):
+        """Start tracking once, then calibrate (every game unless profiles are enabled)."""
+        if app.pipeline is None:
+            camera = app.camera
+            if camera is None or not camera.isOpened():
+                print("\nError: Cannot start game without a working camera.")
+                print("Please check your webcam and try again.")
+                input("Press Enter to exit...")
+                safe_exit()
+
+            # Capture and hand tracking run in the background from here on
+            app.start_pipeline()
+            app.start_network()
+            app.mark("ready")
+            app.report_startup()
 
-        # Calibrate hand tracking
-        min_val, max_val = calibrate_finger()
-        
-        # Run game
-        winner = game_loop(min_val, max_val)
+        if self.calibrations is None or self.recalibrate:
+            return CalibrationScene(self, self.players)
+        for min_val, max_val in self.calibrations:
+            print(f"Using saved calibration. Min Diff: {min_val:.4f}, "
+                  f"Max Diff: {max_val:.4f}")
+        return GameScene(self, self.calibrations)
 
-        if winner == "Quit":
-            break
+    def after_calibration(self, calibrations):
+        """Play with the new calibration (and keep it when profiles are enabled)."""
+        if Config.CALIBRATION_PROFILE_PATH:
+            self.calibrations = calibrations
+        return GameScene(self, calibrations)
 
-        # Show game over screen and check if user wants to play again
-        play_again = game_over_screen(winner)
-        if not play_again:
-            break
+    def after_game(self, winner):
+        """Game over screen, or nothing when the player quit."""
+        return None if winner == "Quit" else GameOverScene(self, winner)
+
+    def after_game_over(self, play_again):
+        """Start screen again, or nothing to quit."""
+        return self.start() if play_again else None
+
+
+def parse_args(argv=None):
+    """
+    Parse the command line and apply the layered settings to ``Config``.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Hand-controlled Pong.")
+    parser.add_argument("--camera", metavar="SOURCE",
+                        help="camera index, video file or image directory (CAMERA_SOURCE)")
+    parser.add_argument("--windowed", action="store_true",
+                        help="run in a window instead of fullscreen")
+    parser.add_argument("--benchmark", type=int, nargs="?", const=600, metavar="FRAMES",
+                        help="measure tracking, physics and rendering on the camera for "
+                             "FRAMES frames (default 600), then exit")
+    parser.add_argument("--headless", action="store_true",
+                        help="run tracking and physics without a window or rendering "
+                             "(until Ctrl+C, or for the --benchmark frames)")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    overrides = []
+    if args.camera is not None:
+        overrides.append(("CAMERA_SOURCE", args.camera))
+    if args.windowed:
+        overrides.append(("FULLSCREEN", "false"))
+    configure(parser, args, overrides)
+    return args
+
+
+def run_headless(args):
+    """
+    Run the camera through the benchmark pipeline instead of the game.
+
+    Args:
+        args (argparse.Namespace): Parsed command line with ``--benchmark`` / ``--headless``
+    """
+    import pong_benchmark
+
+    argv = ["--camera", str(Config.CAMERA_SOURCE),
+            "--players", "2" if Config.TWO_PLAYER else "1"]
+    if args.benchmark is not None:
+        argv += ["--frames", str(args.benchmark)]
+    if args.headless:
+        argv.append("--no-render")
+    pong_benchmark.run_benchmark(pong_benchmark.parse_args(argv, configured=True))
+
+
+def main(argv=None):
+    """
+    Main entry point for the game.
+
+    Args:
+        argv (list): Command line arguments, or None for ``sys.argv``
+    """
+    global app
+    args = parse_args(argv)
+    if args.benchmark is not None or args.headless:
+        run_headless(args)
+        return
+    # Settings may have changed since import; rebuild the context from them
+    app = AppContext()
+
+    # Camera and hand tracking load on worker threads while the start screen shows
+    app.start_background_init()
+
+    # Saved calibrations (for every player) skip the calibration screen
+    players = 2 if Config.TWO_PLAYER else 1
+    calibrations = None
+    if Config.CALIBRATION_PROFILE_PATH:
+        names = (Config.PLAYER_NAME, Config.PLAYER2_NAME)[:players]
+        calibrations = [load_profile(Config.CALIBRATION_PROFILE_PATH, name) for name in names]
+        if not all(calibration is not None and
+                   validate_range(*calibration, Config.CALIBRATION_MIN_RANGE)
+                   for calibration in calibrations):
+            calibrations = None
+    
+    # One loop runs every screen ("Play Again" returns to the start screen)
+    manager = SceneManager()
+    try:
+        manager.run(GameFlow(players, calibrations).start())
+    finally:
+        # Let background work (telemetry files) finish
+        manager.close()
 
     safe_exit()
 
@@ -0,0 +1,196 @@
+"""
+Hand gesture recognition from the full set of 21 landmarks.
+
+Recognized gestures:
+
+- ``GESTURE_OPEN_PALM``: all four fingers extended (pauses the game when
+  ``Config.GESTURE_PAUSE`` is on)
+- ``GESTURE_FIST``: all four fingers curled (resumes the game)
+- ``GESTURE_PINCH``: thumb and index fingertips touching (clicks in menus)
+
+Features for every detected hand are computed in one pass over a
+``(hands, 21, 3)`` array: distances are normalized by the palm size, so the
+classification does not depend on how far the hand is from the camera.
+A gesture is only reported after it has been held for a moment, and only
+once per hold, so single misclassified frames do not toggle anything.
+
+Classification runs on the game thread but watches its own cost: if a frame
+exceeds the time budget, following results are classified less often until
+the cost fits again.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import time
+
+import numpy as np
+
+
+GESTURE_OPEN_PALM = "open_palm"
+GESTURE_FIST = "fist"
+GESTURE_PINCH = "pinch"
+
+# MediaPipe hand landmark indices
+_WRIST = 0
+_THUMB_TIP = 4
+_INDEX_TIP = 8
+_MIDDLE_MCP = 9
+_FINGER_TIPS = [8, 12, 16, 20]
+_FINGER_PIPS = [6, 10, 14, 18]
+
+# A finger is extended when its tip is this much farther from the wrist than its PIP joint
+_EXTENDED_RATIO = 1.15
+_MAX_STRIDE = 8
+
+
+def landmark_array(hand_landmarks):
+    """
+    Stack the landmarks of all hands into one array.
+
+    Args:
+        hand_landmarks (list): MediaPipe landmark lists
+
+    Returns:
+        numpy.ndarray: ``(hands, 21, 3)`` float32 array of x, y, z
+    """
+    return np.array(
+        [[(point.x, point.y, point.z) for point in landmarks.landmark]
+         for landmarks in hand_landmarks],
+        dtype=np.float32
+    ).reshape(-1, 21, 3)
+
+
+def classify(points, pinch_threshold=0.3):
+    """
+    Classify the gesture of every hand.
+
+    Args:
+        points (numpy.ndarray): ``(hands, 21, 3)`` landmarks
+        pinch_threshold (float): Largest thumb-index distance, relative to
+            the palm size, that counts as a pinch
+
+    Returns:
+        list: Gesture name per hand, None where no gesture is shown
+    """
+    if len(points) == 0:
+        return []
+    xy = points[:, :, :2]
+    wrist = xy[:, _WRIST:_WRIST + 1]
+    palm = np.linalg.norm(xy[:, _MIDDLE_MCP] - xy[:, _WRIST], axis=1)
+    palm = np.maximum(palm, 1e-6)
+
+    tip_reach = np.linalg.norm(xy[:, _FINGER_TIPS] - wrist, axis=2)
+    pip_reach = np.linalg.norm(xy[:, _FINGER_PIPS] - wrist, axis=2)
+    extended = (tip_reach > pip_reach * _EXTENDED_RATIO).sum(axis=1)
+    pinch = np.linalg.norm(xy[:, _THUMB_TIP] - xy[:, _INDEX_TIP], axis=1) / palm
+
+    gestures = []
+    for count, pinch_distance in zip(extended, pinch):
+        if pinch_distance < pinch_threshold:
+            gestures.append(GESTURE_PINCH)
+        elif count == 4:
+            gestures.append(GESTURE_OPEN_PALM)
+        elif count == 0:
+            gestures.append(GESTURE_FIST)
+        else:
+            gestures.append(None)
+    return gestures
+
+
+class GestureDebouncer:
+    """
+    Turns a noisy per-frame gesture stream into one event per held gesture.
+
+    Args:
+        hold_time (float): Seconds a gesture must be held before it fires
+    """
+
+    def __init__(self, hold_time=0.25):
+        self.hold_time = hold_time
+        self._gesture = None
+        self._since = None
+        self._fired = False
+
+    def update(self, gesture, timestamp):
+        """
+        Feed the gesture seen at a point in time.
+
+        Args:
+            gesture (str): Gesture seen, or None
+            timestamp (float): Time of the observation in seconds
+
+        Returns:
+            str: The gesture when it has just been held long enough, else None
+        """
+        if gesture != self._gesture:
+            self._gesture = gesture
+            self._since = timestamp
+            self._fired = False
+            return None
+        if gesture is None or self._fired or timestamp - self._since < self.hold_time:
+            return None
+        self._fired = True
+        return gesture
+
+
+class GestureRecognizer:
+    """
+    Gesture events and a fingertip cursor from tracking results.
+
+    Args:
+        hold_time (float): Seconds a gesture must be held before it fires
+        pinch_threshold (float): Pinch distance relative to the palm size
+        budget (float): Seconds of classification allowed per frame
+    """
+
+    def __init__(self, hold_time=0.25, pinch_threshold=0.3, budget=0.0005):
+        self.pinch_threshold = pinch_threshold
+        self.budget = budget
+        self.debouncer = GestureDebouncer(hold_time)
+        self.stride = 1  # Classify every n-th new result
+        self.cursor = None  # Index fingertip (x, y), normalized, or None
+        self.last_cost = 0.0
+        self._last_sequence = 0
+        self._skipped = 0
+
+    def update(self, result):
+        """
+        Process a tracking result (repeated results are ignored).
+
+        Args:
+            result (TrackingResult): Newest tracking result, or None
+
+        Returns:
+            list: Gestures that fired with this result
+        """
+        if result is None or result.sequence == self._last_sequence:
+            return []
+        self._last_sequence = result.sequence
+        if not result.hand_landmarks:
+            self.cursor = None
+            self.debouncer.update(None, result.timestamp)
+            return []
+
+        tip = result.hand_landmarks[0].landmark[_INDEX_TIP]
+        self.cursor = (tip.x, tip.y)
+
+        self._skipped += 1
+        if self._skipped < self.stride:
+            return []
+        self._skipped = 0
+
+        start = time.perf_counter()
+        gestures = classify(landmark_array(result.hand_landmarks), self.pinch_threshold)
+        # Any hand may gesture; the first recognized one counts
+        gesture = next((gesture for gesture in gestures if gesture is not None), None)
+        fired = self.debouncer.update(gesture, result.timestamp)
+        self.last_cost = time.perf_counter() - start
+
+        # Keep the cost within budget by classifying fewer results
+        if self.last_cost > self.budget:
+            self.stride = min(self.stride * 2, _MAX_STRIDE)
+        elif self.last_cost < self.budget / 4 and self.stride > 1:
+            self.stride -= 1
+        return [fired] if fired is not None else []
@@ -0,0 +1,151 @@
+"""
+Adaptive quality governor that keeps the game at its target frame rate.
+
+The governor watches how long each frame takes and steps through a ladder of
+quality levels: when frames take too long it gives up some quality, and when
+there is clear headroom again it restores it. Every level keeps the savings
+of the levels before it; the cheapest visual cuts come first and the ones the
+player notices most come last:
+
+1. draw a shorter ball trail
+2. track the hand on every other camera frame
+3. capture camera frames at half resolution
+4. hide the camera preview
+5. hide the ball trail
+
+A level is only dropped after a whole window of slow frames, and restored
+after a longer window of fast ones. When a restored level turns out to be too
+slow again, the governor waits twice as long before the next attempt, so it
+does not flip back and forth on a machine that sits right at the limit.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+
+# Quality levels, best first.
+#   trail:            fraction of Config.TRAIL_COUNT drawn
+#   inference_stride: track the hand on every n-th camera frame
+#   capture_scale:    camera resolution relative to the configured one
+#   preview:          draw the camera preview
+QUALITY_LEVELS = (
+    {"trail": 1.0, "inference_stride": 1, "capture_scale": 1.0, "preview": True},
+    {"trail": 0.6, "inference_stride": 1, "capture_scale": 1.0, "preview": True},
+    {"trail": 0.6, "inference_stride": 2, "capture_scale": 1.0, "preview": True},
+    {"trail": 0.6, "inference_stride": 2, "capture_scale": 0.5, "preview": True},
+    {"trail": 0.6, "inference_stride": 2, "capture_scale": 0.5, "preview": False},
+    {"trail": 0.0, "inference_stride": 2, "capture_scale": 0.5, "preview": False},
+)
+
+# A restore that is undone within this many windows counts as failed
+_FAILED_RESTORE_WINDOWS = 3
+_MAX_BACKOFF = 8
+
+
+class QualityGovernor:
+    """
+    Chooses a quality level from measured frame times.
+
+    Args:
+        target_fps (float): Frame rate to hold
+        window (int): Frames averaged before lowering the quality
+        restore_window (int): Frames of headroom needed before raising it
+        overload (float): Busy time per frame, as a fraction of the frame
+            budget, above which the quality is lowered
+        headroom (float): Busy fraction below which the quality is raised
+        levels (tuple): Quality settings, best first
+    """
+
+    def __init__(self, target_fps, window=30, restore_window=180, overload=0.9,
+                 headroom=0.6, levels=QUALITY_LEVELS):
+        self.budget = 1.0 / target_fps
+        self.window = window
+        self.restore_window = restore_window
+        self.overload = overload
+        self.headroom = headroom
+        self.levels = levels
+        self.level = 0
+        self.changes = 0
+        self._backoff = 1  # Restore delay multiplier, raised by failed restores
+        self._calm_windows = 0  # Consecutive windows with headroom
+        self._windows_since_restore = None
+        self._reset_window()
+
+    def _reset_window(self):
+        self._frames = 0
+        self._frame_time = 0.0
+        self._work_time = 0.0
+
+    @property
+    def settings(self):
+        """dict: Settings of the current quality level."""
+        return self.levels[self.level]
+
+    def update(self, frame_time, work_time):
+        """
+        Account for one frame and change the level if needed.
+
+        Args:
+            frame_time (float): Seconds since the previous frame started
+            work_time (float): Seconds the frame was busy (without waiting for
+                the frame limiter)
+
+        Returns:
+            bool: True if the quality level changed
+        """
+        self._frames += 1
+        self._frame_time += frame_time
+        self._work_time += work_time
+        if self._frames < self.window:
+            return False
+
+        busy = self._work_time / self._frames / self.budget
+        late = self._frame_time / self._frames > self.budget * 1.05
+        self._reset_window()
+        if self._windows_since_restore is not None:
+            self._windows_since_restore += 1
+
+        if busy > self.overload or late:
+            self._calm_windows = 0
+            return self._change(+1)
+        self._calm_windows = self._calm_windows + 1 if busy < self.headroom else 0
+        if self._calm_windows * self.window >= self.restore_window * self._backoff:
+            self._calm_windows = 0
+            return self._change(-1)
+        return False
+
+    def _change(self, step):
+        level = min(max(self.level + step, 0), len(self.levels) - 1)
+        if level == self.level:
+            return False
+        if step > 0:
+            # Did the last restore bring the overload right back?
+            restored = self._windows_since_restore
+            if restored is not None and restored <= _FAILED_RESTORE_WINDOWS:
+                self._backoff = min(self._backoff * 2, _MAX_BACKOFF)
+            self._windows_since_restore = None
+        else:
+            self._windows_since_restore = 0
+        self.level = level
+        self.changes += 1
+        return True
+
+
+def governor_from_config(config):
+    """
+    Build a ``QualityGovernor`` from the ``QUALITY_*`` settings.
+
+    Args:
+        config: Object exposing ``FPS`` and the ``Config`` quality attributes
+
+    Returns:
+        QualityGovernor: The governor
+    """
+    return QualityGovernor(
+        config.FPS,
+        window=config.QUALITY_WINDOW,
+        restore_window=config.QUALITY_RESTORE_WINDOW,
+        overload=config.QUALITY_OVERLOAD,
+        headroom=config.QUALITY_HEADROOM
+    )
@@ -0,0 +1,745 @@
+"""
+Networked two-machine play over UDP.
+
+Each machine runs its own hand tracking. The host owns the authoritative
+``PongSimulation`` and drives the left paddle; the client drives the right
+paddle and sends its paddle target every tick. The host streams compact state
+snapshots back.
+
+The client does not wait for the host: it predicts locally by running the
+same simulation with its own input applied immediately. When a snapshot
+arrives it rolls back to that state and replays every input the host has not
+acknowledged yet, so its own paddle never lags while the ball converges to
+the host's. Visible corrections of the ball are blended out over a few ticks.
+
+Packets (little endian) start with magic, type and the match number. Both
+sides count matches the same way (``reset`` starts the next one), so
+packets still in flight from an earlier match are dropped:
+
+- input (client -> host), 11 + 2n bytes: header, newest tick, count, then
+  the last ``count`` paddle targets as uint16 (0..65534 of the field height,
+  65535 = no hand). Repeating recent inputs hides packet loss.
+- state (host -> client), 38 bytes: header, sequence, acknowledged input
+  tick, ball x/y, ball speed x/y, paddle ys (float32, normalized to the
+  field size), both scores and the winner.
+- done (client -> host), 3 bytes: header. Acknowledges the snapshot that
+  carried the winner; the host repeats that snapshot until then.
+
+``LoopbackLink`` is an in-process stand-in for the network with adjustable
+latency, jitter and loss. ``python pong_net.py --rtt 100 --loss 0.05`` plays
+a bot match through it and reports the prediction error.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import argparse
+from collections import deque
+import heapq
+import math
+import random
+import socket
+import struct
+import time
+
+from pong_config import Config
+from pong_simulation import PongSimulation
+
+
+MAGIC = 0x50
+PACKET_INPUT = 1
+PACKET_STATE = 2
+PACKET_DONE = 3
+
+_INPUT_HEADER = struct.Struct("<BBBIB")
+_STATE = struct.Struct("<BBBIIffffffBBB")
+_DONE = struct.Struct("<BBB")
+
+NO_INPUT = 0xFFFF
+_INPUT_SCALE = 0xFFFE
+
+_WINNER_CODES = {None: 0, "Player": 1, "Computer": 2}
+_WINNERS = {code: winner for winner, code in _WINNER_CODES.items()}
+
+
+# =============================================================================
+# PACKETS
+# =============================================================================
+
+def encode_input(match, tick, targets, height):
+    """
+    Pack the newest paddle targets of the client.
+
+    Args:
+        match (int): Match number (0..255)
+        tick (int): Client tick of the last target
+        targets (list): Paddle center y per tick (oldest first), None for no hand
+        height (float): Field height the targets refer to
+
+    Returns:
+        bytes: The packet
+    """
+    values = [
+        NO_INPUT if target is None else
+        int(round(min(max(target / height, 0.0), 1.0) * _INPUT_SCALE))
+        for target in targets
+    ]
+    return _INPUT_HEADER.pack(MAGIC, PACKET_INPUT, match, tick, len(values)) + \
+        struct.pack(f"<{len(values)}H", *values)
+
+
+def decode_input(data, height):
+    """
+    Unpack an input packet.
+
+    Args:
+        data (bytes): The packet
+        height (float): Field height to scale the targets to
+
+    Returns:
+        tuple: (match, tick, targets) or None if the packet is malformed
+    """
+    if len(data) < _INPUT_HEADER.size:
+        return None
+    magic, kind, match, tick, count = _INPUT_HEADER.unpack_from(data)
+    if magic != MAGIC or kind != PACKET_INPUT or len(data) != _INPUT_HEADER.size + 2 * count:
+        return None
+    values = struct.unpack_from(f"<{count}H", data, _INPUT_HEADER.size)
+    return match, tick, [None if value == NO_INPUT else value / _INPUT_SCALE * height
+                  for value in values]
+
+
+def encode_state(match, sequence, ack, state, winner, width, height):
+    """
+    Pack an authoritative snapshot.
+
+    Args:
+        match (int): Match number (0..255)
+        sequence (int): Snapshot number, increasing
+        ack (int): Newest client input tick applied to this state
+        state (PongState): State to send
+        winner (str): Winner of the match, or None
+        width (float): Field width of the state
+        height (float): Field height of the state
+
+    Returns:
+        bytes: The packet
+    """
+    return _STATE.pack(
+        MAGIC, PACKET_STATE, match, sequence, ack,
+        state.ball_x / width, state.ball_y / height,
+        state.ball_speed_x / width, state.ball_speed_y / height,
+        state.player_y / height, state.opponent_y / height,
+        min(state.player_score, 255), min(state.opponent_score, 255),
+        _WINNER_CODES[winner]
+    )
+
+
+def decode_state(data):
+    """
+    Unpack a snapshot packet.
+
+    Args:
+        data (bytes): The packet
+
+    Returns:
+        tuple: (match, sequence, ack, fields, winner) with normalized float
+        fields (ball_x, ball_y, speed_x, speed_y, player_y, opponent_y,
+        player_score, opponent_score), or None if the packet is malformed
+    """
+    if len(data) != _STATE.size:
+        return None
+    values = _STATE.unpack(data)
+    if values[0] != MAGIC or values[1] != PACKET_STATE or values[13] not in _WINNERS:
+        return None
+    return values[2], values[3], values[4], values[5:13], _WINNERS[values[13]]
+
+
+def encode_done(match):
+    """
+    Pack the client's acknowledgement of the final snapshot.
+
+    Args:
+        match (int): Match number (0..255)
+
+    Returns:
+        bytes: The packet
+    """
+    return _DONE.pack(MAGIC, PACKET_DONE, match)
+
+
+def packet_match(data):
+    """
+    Match number of a packet.
+
+    Args:
+        data (bytes): The packet
+
+    Returns:
+        int: Match number, or None for foreign or truncated data
+    """
+    if len(data) < 3 or data[0] != MAGIC:
+        return None
+    return data[2]
+
+
+def packet_kind(data):
+    """
+    Type byte of a packet.
+
+    Args:
+        data (bytes): The packet
+
+    Returns:
+        int: ``PACKET_INPUT``, ``PACKET_STATE``, ``PACKET_DONE``, or None for
+        foreign data
+    """
+    if len(data) < 2 or data[0] != MAGIC:
+        return None
+    return data[1]
+
+
+# =============================================================================
+# TRANSPORTS
+# =============================================================================
+
+class UdpTransport:
+    """Non-blocking UDP socket with the transport interface."""
+
+    def __init__(self, local_address, remote_address=None):
+        """
+        Args:
+            local_address (tuple): (host, port) to bind; port 0 picks one
+            remote_address (tuple): Peer to send to; a host leaves this None
+                and answers whoever sent the latest packet
+        """
+        self.remote_address = remote_address
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(local_address)
+        self._socket.setblocking(False)
+
+    @property
+    def local_address(self):
+        """tuple: Address the socket is bound to."""
+        return self._socket.getsockname()
+
+    def send(self, data):
+        """
+        Send a datagram to the peer (dropped while the peer is unknown).
+
+        Args:
+            data (bytes): Packet to send
+        """
+        if self.remote_address is None:
+            return
+        try:
+            self._socket.sendto(data, self.remote_address)
+            self.bytes_sent += len(data)
+        except OSError:
+            pass  # UDP: treat send errors like packet loss
+
+    def receive(self):
+        """
+        Drain every datagram waiting on the socket.
+
+        Returns:
+            list: Received packets, oldest first
+        """
+        packets = []
+        while True:
+            try:
+                data, address = self._socket.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return packets
+            except OSError:
+                return packets  # e.g. ICMP port unreachable on Windows
+            self.remote_address = address
+            self.bytes_received += len(data)
+            packets.append(data)
+
+    def close(self):
+        self._socket.close()
+
+
+class LoopbackTransport:
+    """One end of a ``LoopbackLink``."""
+
+    def __init__(self, link):
+        self.link = link
+        self.peer = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._queue = []  # Heap of (delivery_time, order, data)
+
+    def send(self, data):
+        """
+        Queue a datagram for the peer, subject to the link's loss and delay.
+
+        Args:
+            data (bytes): Packet to send
+        """
+        link = self.link
+        self.bytes_sent += len(data)
+        if link.rng.random() < link.loss:
+            link.dropped += 1
+            return
+        delay = max(0.0, link.latency + link.rng.uniform(-link.jitter, link.jitter))
+        link.order += 1
+        heapq.heappush(self.peer._queue, (link.clock() + delay, link.order, bytes(data)))
+
+    def receive(self):
+        """
+        Packets whose delivery time has passed.
+
+        Returns:
+            list: Received packets in delivery order
+        """
+        now = self.link.clock()
+        packets = []
+        while self._queue and self._queue[0][0] <= now:
+            data = heapq.heappop(self._queue)[2]
+            self.bytes_received += len(data)
+            packets.append(data)
+        return packets
+
+    def close(self):
+        self._queue = []
+
+
+class LoopbackLink:
+    """
+    In-process network with injectable one-way latency, jitter and loss.
+
+    Args:
+        latency (float): One-way delay in seconds (RTT is twice this)
+        jitter (float): Uniform +- variation of the delay in seconds
+        loss (float): Probability of dropping each packet
+        seed (int): Seed for loss and jitter
+        clock (callable): Time source; pass a virtual clock to run faster
+            than real time
+    """
+
+    def __init__(self, latency=0.05, jitter=0.0, loss=0.0, seed=0, clock=time.perf_counter):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.clock = clock
+        self.order = 0
+        self.dropped = 0
+        self.host = LoopbackTransport(self)
+        self.client = LoopbackTransport(self)
+        self.host.peer = self.client
+        self.client.peer = self.host
+
+
+# =============================================================================
+# SESSIONS
+# =============================================================================
+
+class NetHost:
+    """
+    Authoritative side: runs the simulation, applies the remote paddle input
+    and streams snapshots.
+
+    Args:
+        simulation (PongSimulation): Two-player simulation (no computer opponent)
+        transport: ``UdpTransport`` or ``LoopbackTransport``
+        config: Object exposing the ``NET_*`` settings
+        clock (callable): Time source for timeouts
+    """
+
+    def __init__(self, simulation, transport, config, clock=time.perf_counter):
+        self.simulation = simulation
+        self.transport = transport
+        self.config = config
+        self.clock = clock
+        # Paddles sit on their targets, so skipped inputs change nothing
+        simulation.input_smoothing = 1.0
+        self.sequence = 0  # Keeps counting across matches; the client drops older snapshots
+        self.match = 0
+        self.reset()
+
+    def reset(self):
+        """Start the next match, ignoring packets the client sent during the previous one."""
+        self.match = (self.match + 1) % 256
+        self.remote_input = None
+        self.last_input_tick = 0
+        self._last_heard = None
+        self._ticks_since_send = 0
+        self._ended_at = None  # Time the winner was decided
+        self._acknowledged = False  # The client has seen the final snapshot
+
+    @property
+    def winner(self):
+        """str: Winner of the match, or None."""
+        return self.simulation.winner
+
+    @property
+    def finished(self):
+        """
+        bool: True once the match is decided and the client has acknowledged
+        the result (or has had ``NET_TIMEOUT`` seconds to do so).
+        """
+        if self._ended_at is None:
+            return False
+        return self._acknowledged or self.clock() - self._ended_at >= self.config.NET_TIMEOUT
+
+    @property
+    def connected(self):
+        """bool: True while the client has been heard from recently."""
+        return self._last_heard is not None and \
+            self.clock() - self._last_heard < self.config.NET_TIMEOUT
+
+    @property
+    def timed_out(self):
+        """bool: True if the client was connected but went silent."""
+        return self._last_heard is not None and not self.connected
+
+    def _receive(self):
+        height = self.simulation.height
+        for data in self.transport.receive():
+            kind = packet_kind(data)
+            if packet_match(data) != self.match:
+                continue
+            if kind == PACKET_DONE:
+                self._acknowledged = True
+                continue
+            if kind != PACKET_INPUT:
+                continue
+            decoded = decode_input(data, height)
+            if decoded is None:
+                continue
+            _, tick, targets = decoded
+            self._last_heard = self.clock()
+            # Late or duplicated packets carry nothing newer
+            if tick > self.last_input_tick and targets:
+                self.last_input_tick = tick
+                self.remote_input = targets[-1]
+
+    def step(self, dt, local_input):
+        """
+        Advance the match and send a snapshot when one is due. The match
+        does not start until the client has been heard from; once it is
+        decided the final snapshot is sent on every call until ``finished``.
+
+        Args:
+            dt (float): Elapsed wall-clock time in seconds
+            local_input (float): Host paddle target y, or None
+
+        Returns:
+            list: Simulation events
+        """
+        self._receive()
+        if not self.connected:
+            return []
+        simulation = self.simulation
+        before = simulation.state.tick_count
+        events = simulation.step(dt, local_input, self.remote_input)
+        self._ticks_since_send += simulation.state.tick_count - before
+        if simulation.winner is not None and self._ended_at is None:
+            self._ended_at = self.clock()
+        if self._ticks_since_send >= self.config.NET_SEND_INTERVAL or simulation.winner:
+            self._ticks_since_send = 0
+            self.sequence += 1
+            self.transport.send(encode_state(
+                self.match, self.sequence, self.last_input_tick, simulation.state,
+                simulation.winner, simulation.width, simulation.height
+            ))
+        return events
+
+    def interpolate(self):
+        """PongState: Render state of the simulation."""
+        return self.simulation.interpolate()
+
+
+class NetClient:
+    """
+    Predicting side: applies its own input immediately and reconciles with
+    host snapshots by rollback and replay.
+
+    Args:
+        simulation (PongSimulation): Local two-player simulation used for prediction
+        transport: ``UdpTransport`` or ``LoopbackTransport``
+        config: Object exposing the ``NET_*`` settings
+        clock (callable): Time source for timeouts and round-trip times
+    """
+
+    def __init__(self, simulation, transport, config, clock=time.perf_counter):
+        self.simulation = simulation
+        self.transport = transport
+        self.config = config
+        self.clock = clock
+        simulation.input_smoothing = 1.0
+        self._last_sequence = 0  # Host sequences keep counting across matches
+        self.match = 0
+        self.reset()
+
+    def reset(self):
+        """Start the next match, forgetting the previous one's result and pending inputs."""
+        self.match = (self.match + 1) % 256
+        self.tick = 0
+        self.winner = None
+        self._inputs = {}  # Client tick -> paddle target
+        self._sent_at = {}  # Client tick -> send time, for round-trip times
+        self._last_heard = None
+        self._offset_x = 0.0  # Visual correction still being blended out
+        self._offset_y = 0.0
+
+        # Statistics
+        self.rtt = None
+        self.snapshots = 0
+        self.replayed_ticks = 0
+        self.corrections = []  # Ball position jump per snapshot, in pixels
+
+    @property
+    def finished(self):
+        """bool: True once a snapshot with the winner has arrived."""
+        return self.winner is not None
+
+    @property
+    def connected(self):
+        """bool: True while the host has been heard from recently."""
+        return self._last_heard is not None and \
+            self.clock() - self._last_heard < self.config.NET_TIMEOUT
+
+    @property
+    def timed_out(self):
+        """bool: True if the host was connected but went silent."""
+        return self._last_heard is not None and not self.connected
+
+    def _receive(self):
+        newest = None
+        for data in self.transport.receive():
+            if packet_kind(data) != PACKET_STATE:
+                continue
+            decoded = decode_state(data)
+            if decoded is not None and decoded[0] == self.match and \
+                    decoded[1] > self._last_sequence:
+                self._last_sequence = decoded[1]
+                newest = decoded
+        if newest is not None:
+            self._last_heard = self.clock()
+            self._reconcile(*newest[2:])
+            if self.winner is not None:
+                # Every repeat of the final snapshot is answered, in case one is lost
+                self.transport.send(encode_done(self.match))
+
+    def _reconcile(self, ack, fields, winner):
+        """Roll back to a snapshot and replay the inputs the host has not seen yet."""
+        simulation = self.simulation
+        state = simulation.state
+        width, height = simulation.width, simulation.height
+        predicted_x, predicted_y = state.ball_x, state.ball_y
+
+        (state.ball_x, state.ball_y, speed_x, speed_y,
+         player_y, opponent_y, player_score, opponent_score) = fields
+        state.ball_x *= width
+        state.ball_y *= height
+        state.ball_speed_x = speed_x * width
+        state.ball_speed_y = speed_y * height
+        state.player_y = player_y * height
+        state.opponent_y = opponent_y * height
+        state.player_score = int(player_score)
+        state.opponent_score = int(opponent_score)
+        simulation.winner = self.winner = winner
+
+        if ack in self._sent_at:
+            self.rtt = self.clock() - self._sent_at[ack]
+        for tick in [tick for tick in self._inputs if tick <= ack]:
+            del self._inputs[tick]
+            self._sent_at.pop(tick, None)
+
+        # Replay unacknowledged inputs (bounded, oldest dropped)
+        pending = sorted(self._inputs)[-self.config.NET_MAX_ROLLBACK:]
+        simulation.previous = state.copy()
+        if winner is None:
+            for tick in pending:
+                simulation.previous = state.copy()
+                simulation.tick(None, self._inputs[tick])
+        self.replayed_ticks += len(pending)
+        self.snapshots += 1
+
+        # Blend the visible jump out instead of snapping
+        jump_x = predicted_x - state.ball_x
+        jump_y = predicted_y - state.ball_y
+        self.corrections.append(math.hypot(jump_x, jump_y))
+        if math.hypot(jump_x, jump_y) < self.config.NET_SNAP_DISTANCE:
+            self._offset_x += jump_x
+            self._offset_y += jump_y
+        else:
+            self._offset_x = self._offset_y = 0.0
+
+    def step(self, dt, local_input):
+        """
+        Predict the match forward with the local input and send it to the host.
+
+        Args:
+            dt (float): Elapsed wall-clock time in seconds
+            local_input (float): Client (right) paddle target y, or None
+
+        Returns:
+            list: Predicted simulation events
+        """
+        self._receive()
+        simulation = self.simulation
+        before = simulation.state.tick_count
+        events = simulation.step(dt, None, local_input)
+        ticks = simulation.state.tick_count - before
+        if ticks <= 0:
+            return events
+
+        now = self.clock()
+        for _ in range(ticks):
+            self.tick += 1
+            self._inputs[self.tick] = local_input
+            self._sent_at[self.tick] = now
+        decay = self.config.NET_CORRECTION_DECAY ** ticks
+        self._offset_x *= decay
+        self._offset_y *= decay
+
+        recent = range(max(1, self.tick - self.config.NET_INPUT_REDUNDANCY + 1), self.tick + 1)
+        self.transport.send(encode_input(
+            self.match, self.tick, [self._inputs.get(tick) for tick in recent],
+            simulation.height
+        ))
+        return events
+
+    def interpolate(self):
+        """PongState: Render state with the remaining correction blended in."""
+        view = self.simulation.interpolate()
+        view.ball_x += self._offset_x
+        view.ball_y += self._offset_y
+        return view
+
+
+def create_session(simulation, config):
+    """
+    Open the networked session selected by ``config.NET_ROLE``.
+
+    Args:
+        simulation (PongSimulation): Two-player simulation
+        config: Object exposing the ``NET_*`` settings
+
+    Returns:
+        object: ``NetHost``, ``NetClient``, or None for local play
+    """
+    if config.NET_ROLE == "host":
+        transport = UdpTransport(("0.0.0.0", config.NET_PORT))
+        return NetHost(simulation, transport, config)
+    if config.NET_ROLE == "client":
+        transport = UdpTransport(("0.0.0.0", 0), (config.NET_HOST, config.NET_PORT))
+        return NetClient(simulation, transport, config)
+    if config.NET_ROLE is not None:
+        raise ValueError(f"Unknown NET_ROLE {config.NET_ROLE!r}; expected 'host' or 'client'")
+    return None
+
+
+# =============================================================================
+# LOOPBACK TEST
+# =============================================================================
+
+def simulate(rtt=0.1, jitter=0.01, loss=0.02, seconds=60.0, seed=0, config=Config):
+    """
+    Play a bot-vs-bot match through a ``LoopbackLink`` on a virtual clock.
+
+    Both bots track the ball perfectly. The client predicts one one-way
+    latency (plus the tick its input waits for the host) ahead of the host,
+    since its inputs reach the host that much later; each client frame is
+    compared with the host frame that many ticks later.
+
+    Args:
+        rtt (float): Round-trip time in seconds
+        jitter (float): One-way delay variation in seconds
+        loss (float): Packet loss probability
+        seconds (float): Simulated match time
+        seed (int): Seed for the network and the simulations
+        config: Object exposing the game and ``NET_*`` settings
+
+    Returns:
+        dict: Prediction error, correction and bandwidth statistics
+    """
+    now = [0.0]
+
+    def clock():
+        return now[0]
+
+    link = LoopbackLink(rtt / 2, jitter, loss, seed, clock)
+    width, height = config.DEFAULT_WIDTH, config.DEFAULT_HEIGHT
+    host = NetHost(PongSimulation(width, height, config, random.Random(seed), two_player=True),
+                   link.host, config, clock)
+    client = NetClient(PongSimulation(width, height, config, random.Random(seed + 1),
+                                      two_player=True),
+                       link.client, config, clock)
+
+    frame_time = 1.0 / config.FPS
+    lead_frames = int(round(rtt / 2 / frame_time)) + 1
+    client_views = deque(maxlen=lead_frames + 1)
+    errors = []
+    paddle_lag = []
+    start = time.perf_counter()
+    frames = int(seconds * config.FPS)
+    for _ in range(frames):
+        now[0] += frame_time
+        host.step(frame_time, host.simulation.state.ball_y)
+        client_input = client.simulation.state.ball_y
+        client.step(frame_time, client_input)
+        if host.winner is not None:
+            break
+        host_view = host.interpolate()
+        client_view = client.interpolate()
+        client_views.append(client_view)
+        half_paddle = config.PADDLE_HEIGHT / 2
+        reachable = min(max(client_input, half_paddle), height - half_paddle)
+        paddle_lag.append(abs(client.simulation.state.opponent_y - reachable))
+        if len(client_views) > lead_frames:
+            predicted = client_views[0]
+            errors.append(math.hypot(predicted.ball_x - host_view.ball_x,
+                                     predicted.ball_y - host_view.ball_y))
+    elapsed = time.perf_counter() - start
+
+    errors.sort()
+    mean = sum(errors) / len(errors) if errors else 0.0
+    bandwidth = (link.host.bytes_sent + link.client.bytes_sent) / max(now[0], 1e-9)
+    result = {
+        "rtt_ms": rtt * 1000.0,
+        "measured_rtt_ms": (client.rtt or 0.0) * 1000.0,
+        "loss": loss,
+        "ball_error_mean_px": mean,
+        "ball_error_p95_px": errors[int(0.95 * (len(errors) - 1))] if errors else 0.0,
+        "own_paddle_lag_px": max(paddle_lag) if paddle_lag else 0.0,
+        "mean_replay_ticks": client.replayed_ticks / max(client.snapshots, 1),
+        "bytes_per_second": bandwidth,
+        "dropped_packets": link.dropped,
+        "cpu_ms_per_frame": elapsed / max(len(errors), 1) * 1000.0,
+    }
+    for name, value in result.items():
+        print(f"{name:<22}{value:10.2f}")
+    return result
+
+
+def parse_args(argv=None):
+    """
+    Parse the loopback test command line.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Play a bot match over a simulated network.")
+    parser.add_argument("--rtt", type=float, default=100.0, help="round-trip time in ms")
+    parser.add_argument("--jitter", type=float, default=10.0, help="one-way jitter in ms")
+    parser.add_argument("--loss", type=float, default=0.02, help="packet loss probability")
+    parser.add_argument("--seconds", type=float, default=60.0, help="simulated match time")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    simulate(args.rtt / 1000.0, args.jitter / 1000.0, args.loss, args.seconds, args.seed)
@@ -0,0 +1,588 @@
+"""
+Background capture and hand-tracking pipeline.
+
+Camera reads and hand-tracking inference run on a producer thread that publishes
+the newest result into a latest-value slot. The game loop and the calibration
+screen poll that slot without blocking, so rendering and physics run at the
+full frame rate while always consuming the freshest hand estimate.
+
+While a hand is tracked, inference can be limited to a padded crop around it
+(``HandRegion``) and the image sent to the tracker can be downscaled; a lost
+hand falls back to a full-frame search on the same frame. Under load the
+pipeline can also track only every n-th camera frame and capture at a lower
+resolution (see ``pong_governor``).
+
+All hands (up to ``max_num_hands``) come out of a single inference call per
+frame; ``hand_features`` extracts the points the game needs from every hand
+into one array and ``assign_players`` maps hands to paddles for two-player
+games.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from pong_profiler import FrameProfiler
+from pong_trackers import draw_hand
+
+
+# Newest published tracking result.
+#   frame:          mirrored BGR camera frame with landmarks drawn on it
+#   hand_landmarks: list of detected hands (MediaPipe NormalizedLandmarkList)
+#   timestamp:      time.perf_counter() value at which the frame was captured
+#   sequence:       monotonically increasing result number (starts at 1)
+#   handedness:     "Left"/"Right" label per detected hand, None where unknown
+TrackingResult = namedtuple(
+    "TrackingResult", ["frame", "hand_landmarks", "timestamp", "sequence", "handedness"]
+)
+
+# Returned by TrackingPipeline.process_next for a frame that was read while
+# there is no result to return yet (e.g. an asynchronous tracker's first
+# result is still pending); None is reserved for failed reads
+NO_RESULT = object()
+
+# MediaPipe hand landmark indices used by the game
+WRIST = 0
+INDEX_FINGER_TIP = 8
+
+
+def finger_diff(hand_landmarks):
+    """
+    Vertical distance between the wrist and the index fingertip.
+
+    Args:
+        hand_landmarks: MediaPipe landmark list for a single hand
+
+    Returns:
+        float: Normalized wrist_y - fingertip_y (larger when the finger is raised)
+    """
+    points = hand_landmarks.landmark
+    return points[WRIST].y - points[INDEX_FINGER_TIP].y
+
+
+def hands_needed(config):
+    """
+    Number of hands to track for the configured game mode.
+
+    Args:
+        config: Object exposing ``MAX_NUM_HANDS`` and ``TWO_PLAYER``
+
+    Returns:
+        int: ``MAX_NUM_HANDS``, raised to 2 for two-player games
+    """
+    return max(config.MAX_NUM_HANDS, 2 if config.TWO_PLAYER else 1)
+
+
+def hand_points(hand_landmarks):
+    """
+    The two landmarks the game uses from every detected hand.
+
+    Args:
+        hand_landmarks (list): Landmark lists of the detected hands
+
+    Returns:
+        numpy.ndarray: ``(hands, 2, 2)`` float64 (x, y) of the wrist and the
+        index fingertip
+    """
+    return np.array(
+        [((lm.landmark[WRIST].x, lm.landmark[WRIST].y),
+          (lm.landmark[INDEX_FINGER_TIP].x, lm.landmark[INDEX_FINGER_TIP].y))
+         for lm in hand_landmarks],
+        dtype=np.float64
+    ).reshape(-1, 2, 2)
+
+
+def point_features(points):
+    """
+    Finger measure and horizontal position from ``hand_points`` output.
+
+    Args:
+        points (numpy.ndarray): ``(hands, 2, 2)`` wrist and fingertip points
+
+    Returns:
+        tuple: (diffs, xs) arrays with ``finger_diff`` and wrist x per hand
+    """
+    return points[:, 0, 1] - points[:, 1, 1], points[:, 0, 0]
+
+
+def hand_features(hand_landmarks):
+    """
+    Finger measure and horizontal position of every detected hand at once.
+
+    Only the two landmarks the game uses are read from each hand; the math
+    runs on a single ``(hands, 2, 2)`` array.
+
+    Args:
+        hand_landmarks (list): Landmark lists of the detected hands
+
+    Returns:
+        tuple: (diffs, xs) arrays with ``finger_diff`` and wrist x per hand
+    """
+    return point_features(hand_points(hand_landmarks))
+
+
+def assign_players(xs, handedness=None, mode="side"):
+    """
+    Decide which detected hand controls which paddle.
+
+    With ``mode="side"`` the hand on the left half of the (mirrored) frame
+    drives the left paddle and the other one the right paddle; with two hands
+    on the same half, the leftmost one is the left player. ``mode="handedness"``
+    gives the left paddle to the left hand and falls back to sides when the
+    labels are missing or ambiguous.
+
+    Args:
+        xs (numpy.ndarray): Wrist x per hand (normalized, mirrored frame)
+        handedness (list): "Left"/"Right" label per hand, or None
+        mode (str): "side" or "handedness"
+
+    Returns:
+        tuple: (left_index, right_index), each a hand index or None
+    """
+    count = len(xs)
+    if count == 0:
+        return None, None
+    if mode == "handedness" and handedness and None not in handedness[:count]:
+        labels = list(handedness[:count])
+        if count == 1:
+            return (0, None) if labels[0] == "Left" else (None, 0)
+        if labels[0] != labels[1]:
+            return (0, 1) if labels[0] == "Left" else (1, 0)
+    if count == 1:
+        return (0, None) if xs[0] < 0.5 else (None, 0)
+    order = np.argsort(xs[:2])
+    return int(order[0]), int(order[1])
+
+
+def finger_diffs(points, handedness, players, mode="side"):
+    """
+    Finger measure of each player's hand.
+
+    Args:
+        points (numpy.ndarray): ``hand_points`` of all detected hands
+        handedness (list): "Left"/"Right" label per hand, or None
+        players (int): 1, or 2 for a two-player game
+        mode (str): Player assignment, see ``assign_players``
+
+    Returns:
+        list: ``finger_diff`` per player (left paddle first), None where no hand was found
+    """
+    if len(points) == 0:
+        return [None] * players
+    diffs, xs = point_features(points)
+    if players == 1:
+        return [float(diffs[0])]
+    indices = assign_players(xs, handedness, mode)
+    return [None if index is None else float(diffs[index]) for index in indices]
+
+
+class LatestValue:
+    """Thread-safe single-slot mailbox that only keeps the newest value."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = None
+        self._unread = False
+        self.overwritten = 0  # Values replaced before anyone read them
+
+    def publish(self, value):
+        """
+        Store a new value, replacing the previous one.
+
+        Args:
+            value: The value to publish
+        """
+        with self._lock:
+            if self._unread:
+                self.overwritten += 1
+            self._value = value
+            self._unread = True
+
+    def peek(self):
+        """
+        Return the newest value without blocking.
+
+        Returns:
+            object: The newest value, or None if nothing was published yet
+        """
+        with self._lock:
+            self._unread = False
+            return self._value
+
+
+class HandRegion:
+    """
+    Region of interest that follows the tracked hand.
+
+    While a hand is tracked, only a padded crop around its last bounding box
+    is sent to inference; landmarks found in the crop are mapped back to
+    full-frame normalized coordinates. When the hand is lost the next search
+    covers the whole frame again.
+
+    The crop is square while that square fits in the frame. Hands further
+    apart get a rectangle around all of them instead, so none falls outside
+    the crop and forces a second, full-frame search.
+    """
+
+    def __init__(self, padding=0.5, min_size=160, max_hands=1):
+        """
+        Args:
+            padding (float): Padding added on each side, as a fraction of the
+                hand bounding box's larger side
+            min_size (int): Smallest crop side in pixels
+            max_hands (int): Hands expected in the frame; while fewer are
+                tracked the full frame is searched so new hands can enter
+        """
+        self.padding = padding
+        self.min_size = min_size
+        self.max_hands = max_hands
+        self.window = None  # (x, y, w, h) in pixels, or None for full frame
+
+    def reset(self):
+        """Forget the last hand position; the next crop is the full frame."""
+        self.window = None
+
+    def crop(self, frame):
+        """
+        Cut the current region out of a frame.
+
+        Args:
+            frame (numpy.ndarray): Full camera frame
+
+        Returns:
+            tuple: (image, window) where window is the (x, y, w, h) crop, or
+            None when the full frame is returned
+        """
+        if self.window is None:
+            return frame, None
+        x, y, w, h = self.window
+        return frame[y:y + h, x:x + w], self.window
+
+    def update(self, hand_landmarks, frame_shape, window):
+        """
+        Map landmarks from crop to frame coordinates and move the region.
+
+        Args:
+            hand_landmarks (list): Landmark lists returned for the crop (modified in place)
+            frame_shape (tuple): Shape of the full frame
+            window (tuple): The crop the landmarks were found in, or None
+
+        Returns:
+            list: The same landmark lists in full-frame normalized coordinates
+        """
+        frame_h, frame_w = frame_shape[:2]
+        if window is not None:
+            x, y, w, h = window
+            for landmarks in hand_landmarks:
+                for point in landmarks.landmark:
+                    point.x = (x + point.x * w) / frame_w
+                    point.y = (y + point.y * h) / frame_h
+
+        if len(hand_landmarks) < self.max_hands:
+            self.window = None
+            return hand_landmarks
+
+        boxes = []  # (left, top, right, bottom) per hand, in pixels
+        for landmarks in hand_landmarks:
+            xs = [point.x for point in landmarks.landmark]
+            ys = [point.y for point in landmarks.landmark]
+            boxes.append((min(xs) * frame_w, min(ys) * frame_h,
+                          max(xs) * frame_w, max(ys) * frame_h))
+        left = min(box[0] for box in boxes)
+        top = min(box[1] for box in boxes)
+        right = max(box[2] for box in boxes)
+        bottom = max(box[3] for box in boxes)
+
+        side = max(right - left, bottom - top)
+        side = max(side * (1.0 + 2.0 * self.padding), self.min_size)
+        if side <= min(frame_w, frame_h):
+            width = height = int(side)
+        else:
+            # Hands spread wider than the frame's short side: pad each side by
+            # the largest hand's size rather than the whole span
+            pad = self.padding * max(max(box[2] - box[0], box[3] - box[1]) for box in boxes)
+            width = int(min(max(right - left + 2 * pad, self.min_size), frame_w))
+            height = int(min(max(bottom - top + 2 * pad, self.min_size), frame_h))
+            if width >= frame_w and height >= frame_h:
+                self.window = None  # The crop would be the whole frame
+                return hand_landmarks
+        center_x = (left + right) / 2
+        center_y = (top + bottom) / 2
+        crop_x = int(min(max(center_x - width / 2, 0), frame_w - width))
+        crop_y = int(min(max(center_y - height / 2, 0), frame_h - height))
+        self.window = (crop_x, crop_y, width, height)
+        return hand_landmarks
+
+
+class TrackingPipeline:
+    """
+    Producer thread that captures frames and runs hand tracking on them.
+
+    The pipeline owns the ``hands`` tracker while it is running; callers
+    must not invoke ``hands.process`` themselves in the meantime.
+    """
+
+    def __init__(self, camera, hands, mp_hands, mp_drawing, draw_landmarks=True,
+                 region=None, inference_scale=1.0, profiler=None, recorder=None):
+        """
+        Args:
+            camera (cv2.VideoCapture): Opened camera to read frames from
+            hands: Hand tracker (a ``pong_trackers.HandTracker`` or MediaPipe Hands)
+            mp_hands: The ``mp.solutions.hands`` module, or None
+            mp_drawing: The ``mp.solutions.drawing_utils`` module, or None
+                to draw landmarks with OpenCV
+            draw_landmarks (bool): Draw detected landmarks onto published frames
+            region (HandRegion): Crop inference to the tracked hand, or None
+                to always process the full frame
+            inference_scale (float): Downscale factor (<= 1) applied to the
+                image handed to inference
+            profiler (FrameProfiler): Receives per-stage timings of the
+                producer thread, or None
+            recorder (SessionRecorder): Records raw frames and landmarks, or None
+        """
+        self.camera = camera
+        self.hands = hands
+        self.mp_hands = mp_hands
+        self.mp_drawing = mp_drawing
+        self.draw_landmarks = draw_landmarks
+        self.region = region
+        self.inference_scale = inference_scale
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.recorder = recorder
+        self.inference_stride = 1  # Track every n-th captured frame
+        self.capture_scale = 1.0  # Capture resolution relative to the first frame's
+
+        self._slot = LatestValue()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_consumed = 0
+        self._sequence = 0
+        self._last_result = None  # Returned again for frames that publish nothing new
+        self._full_size = None  # (width, height) of the first captured frame
+        self._requested_scale = None
+        self._resolution_scale = 1.0  # Stands in for a capture size the source refused
+
+        # Counters
+        self.frames_captured = 0
+        self.frames_processed = 0
+        self.read_failures = 0
+        self.frames_skipped = 0  # Captured frames not tracked (inference stride)
+        self.stale_results = 0  # Tracked frames whose tracker had no new result yet
+        self.consumer_skips = 0  # Polls that found no new result
+        self.roi_frames = 0  # Frames processed from a hand crop
+        self.full_frames = 0  # Frames processed at full field of view
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Start the producer thread (no-op if it is already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="TrackingPipeline", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        """
+        Ask the producer thread to finish and wait for it.
+
+        Args:
+            timeout (float): Seconds to wait for the thread to exit
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self):
+        """bool: True while the producer thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    # -------------------------------------------------------------------------
+    # Consumer API
+    # -------------------------------------------------------------------------
+
+    def latest(self):
+        """
+        Return the newest tracking result without blocking.
+
+        Returns:
+            TrackingResult: The newest result, or None if none is available yet
+        """
+        result = self._slot.peek()
+        if result is None or result.sequence == self._last_consumed:
+            self.consumer_skips += 1
+        else:
+            self._last_consumed = result.sequence
+        return result
+
+    @property
+    def frames_dropped(self):
+        """int: Results overwritten by a newer one before being consumed."""
+        return self._slot.overwritten
+
+    def stats(self):
+        """
+        Snapshot of the pipeline counters.
+
+        Returns:
+            dict: Captured, processed, dropped, skipped and failed-read counts
+        """
+        return {
+            "captured": self.frames_captured,
+            "processed": self.frames_processed,
+            "dropped": self.frames_dropped,
+            "consumer_skips": self.consumer_skips,
+            "read_failures": self.read_failures,
+            "skipped": self.frames_skipped,
+            "stale": self.stale_results,
+            "roi_frames": self.roi_frames,
+            "full_frames": self.full_frames,
+            "capture": self.camera.stats() if hasattr(self.camera, "stats") else None,
+        }
+
+    # -------------------------------------------------------------------------
+    # Producer
+    # -------------------------------------------------------------------------
+
+    def request_capture_scale(self, scale):
+        """
+        Change the capture resolution before the producer's next read.
+
+        Sources that cannot change their resolution (files, some cameras)
+        have their frames downscaled before inference instead.
+
+        Args:
+            scale (float): Resolution relative to the first captured frame (<= 1)
+        """
+        self._requested_scale = scale
+
+    def _apply_capture_scale(self, scale):
+        self._requested_scale = None
+        width, height = self._full_size
+        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, int(width * scale))
+        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, int(height * scale))
+        actual = self.camera.get(cv2.CAP_PROP_FRAME_WIDTH)
+        self._resolution_scale = 1.0 if 0 < actual <= width * scale + 1 else scale
+        self.capture_scale = scale
+        if self.region is not None:
+            # The window is in pixels of the old frame size
+            self.region.reset()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            if self.process_next() is None:
+                # Avoid spinning on a camera that stopped delivering frames
+                time.sleep(0.005)
+
+    def process_next(self):
+        """
+        Capture and process one frame on the calling thread, then publish it.
+
+        The producer thread calls this in a loop; benchmarks and replays call
+        it directly to run the pipeline synchronously at full speed.
+
+        Returns:
+            TrackingResult: The published result (the previous one for a frame
+            skipped by ``inference_stride`` or one the tracker had no new result
+            for), ``NO_RESULT`` if there is no previous one yet, or None if no
+            frame was read
+        """
+        profiler = self.profiler
+        if self._requested_scale is not None and self._full_size is not None:
+            self._apply_capture_scale(self._requested_scale)
+        with profiler.scope("capture"):
+            success, raw_frame = self.camera.read()
+        timestamp = time.perf_counter()
+        if not success:
+            self.read_failures += 1
+            return None
+        self.frames_captured += 1
+        if self._full_size is None:
+            self._full_size = (raw_frame.shape[1], raw_frame.shape[0])
+        if (self.frames_captured - 1) % self.inference_stride:
+            # Shedding load: the frame is read (so the camera never lags) but not tracked.
+            # Peeking the slot would mark its result read and hide it from frames_dropped
+            self.frames_skipped += 1
+            return self._last_result if self._last_result is not None else NO_RESULT
+
+        with profiler.scope("flip"):
+            frame = cv2.flip(raw_frame, 1)
+        hand_landmarks, handedness = self._detect(frame)
+        if not getattr(self.hands, "fresh", True):
+            # Asynchronous tracker still working: republishing its old result
+            # under a new sequence would feed the filters a repeated sample
+            self.stale_results += 1
+            return self._last_result if self._last_result is not None else NO_RESULT
+
+        if self.recorder is not None:
+            with profiler.scope("record"):
+                self.recorder.record(raw_frame, hand_landmarks, timestamp)
+
+        if self.draw_landmarks:
+            with profiler.scope("landmarks"):
+                for landmarks in hand_landmarks:
+                    if self.mp_drawing is None:
+                        draw_hand(frame, landmarks)
+                    else:
+                        self.mp_drawing.draw_landmarks(
+                            frame, landmarks, self.mp_hands.HAND_CONNECTIONS
+                        )
+
+        # Asynchronous trackers return results for an earlier image
+        result_time = timestamp - getattr(self.hands, "lag", 0.0)
+        self._sequence += 1
+        self.frames_processed += 1
+        result = TrackingResult(frame, hand_landmarks, result_time, self._sequence, handedness)
+        self._slot.publish(result)
+        self._last_result = result
+        return result
+
+    def _infer(self, image):
+        """Run hand tracking on a BGR image; returns (hand_landmarks, handedness)."""
+        with self.profiler.scope("convert"):
+            scale = self.inference_scale * self._resolution_scale
+            if scale < 1.0:
+                image = cv2.resize(image, None, fx=scale, fy=scale,
+                                   interpolation=cv2.INTER_AREA)
+            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        with self.profiler.scope("inference"):
+            results = self.hands.process(rgb_image)
+        hand_landmarks = results.multi_hand_landmarks or []
+        classifications = getattr(results, "multi_handedness", None) or []
+        handedness = [entry.classification[0].label for entry in classifications]
+        if len(handedness) != len(hand_landmarks):
+            handedness = [None] * len(hand_landmarks)
+        return hand_landmarks, handedness
+
+    def _detect(self, frame):
+        """Find hands in a frame, using the region of interest when one is tracked."""
+        if self.region is None:
+            self.full_frames += 1
+            return self._infer(frame)
+
+        image, window = self.region.crop(frame)
+        hand_landmarks, handedness = self._infer(image)
+        if window is not None:
+            self.roi_frames += 1
+            if len(hand_landmarks) < self.region.max_hands:
+                # Lost a hand inside the crop: search the whole frame right away
+                window = None
+                hand_landmarks, handedness = self._infer(frame)
+                self.full_frames += 1
+        else:
+            self.full_frames += 1
+        return self.region.update(hand_landmarks, frame.shape, window), handedness
@@ -0,0 +1,242 @@
+"""
+Dirty-rectangle renderer for the game screen.
+
+The static background (black field and center line) is drawn once into a
+cached surface and score glyphs are rendered only when a score changes.
+Each frame the renderer erases the previous positions of moving objects
+from the cached background, draws the new frame, and pushes only the
+changed rectangles to the display with ``pygame.display.update(rects)``,
+so frame time scales with the number of moving pixels instead of the
+screen resolution.
+
+The ball and its trail are never rasterized during play: ``SpriteAtlas``
+draws the ball and every trail shade once, into run-length encoded
+color-keyed sprites, and a frame blits the whole trail with one
+``Surface.blits`` call. The trail is erased the same way, with ball-shaped
+sprites in the field color, and consecutive points are presented in chunks,
+so a trail of hundreds of points adds only a few dirty rectangles.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+
+# Consecutive trail points erased and presented as one rectangle
+TRAIL_CHUNK = 8
+
+
+def trail_shades(config):
+    """
+    Brightness of each trail point, brightest (newest) first.
+
+    Args:
+        config: Object exposing ``TRAIL_COUNT`` and ``TRAIL_START_COLOR``
+
+    Returns:
+        numpy.ndarray: ``TRAIL_COUNT`` uint8 values fading to black
+    """
+    count = config.TRAIL_COUNT
+    start = config.TRAIL_START_COLOR
+    shades = start - np.arange(count) * (start / max(count, 1))
+    return np.clip(np.rint(shades), 0, 255).astype(np.uint8)
+
+
+class SpriteAtlas:
+    """
+    The ball and every trail shade, pre-rasterized once.
+
+    Each distinct shade is its own small sprite: color-keyed and run-length
+    encoded, which blits several times faster than a per-pixel-alpha sprite
+    or ``pygame.draw.ellipse``, and much faster than blitting areas of one
+    shared sheet (RLE surfaces cannot be entered midway). ``eraser`` is the
+    ball shape in the field color; it erases a point much faster than
+    copying the area back from the full-screen background.
+    """
+
+    def __init__(self, size, color, background, shades):
+        """
+        Args:
+            size (int): Ball diameter in pixels
+            color (tuple): Ball color
+            background (tuple): Field color, transparent in the sprites
+            shades (numpy.ndarray): Gray level of each trail point, newest first
+        """
+        self.size = size
+        self.ball = self._sprite(size, color, background)
+        self.eraser = self._sprite(size, background, tuple(255 - c for c in background[:3]))
+        cache = {}
+        for shade in np.unique(shades).tolist():
+            cache[shade] = self._sprite(size, (shade, shade, shade), background)
+        self.trail = [cache[shade] for shade in shades.tolist()]  # Newest first
+
+    @staticmethod
+    def _sprite(size, color, key):
+        sprite = pygame.Surface((size, size)).convert()
+        sprite.fill(key)
+        pygame.draw.ellipse(sprite, color, sprite.get_rect())
+        sprite.set_colorkey(key, pygame.RLEACCEL)
+        return sprite
+
+
+class GameRenderer:
+    """Renders the playfield incrementally onto the display surface."""
+
+    def __init__(self, screen, score_font, config):
+        """
+        Args:
+            screen (pygame.Surface): Display surface
+            score_font (pygame.font.Font): Font used for the scores
+            config: Object exposing the ``Config`` color/preview attributes
+        """
+        self.screen = screen
+        self.score_font = score_font
+        self.config = config
+        self.width, self.height = screen.get_size()
+        self.atlas = SpriteAtlas(config.BALL_SIZE, config.WHITE, config.BLACK, trail_shades(config))
+
+        self.background = self._build_background()
+        self._score_glyphs = {}
+        self._score_rects = [None, None]
+        self._scores = [None, None]
+
+        self._moving_rects = []  # Rects of moving objects drawn last frame
+        self._trail_corners = []  # Top-left corners of the trail points drawn last frame
+        self._trail_rects = []  # Their chunked dirty rects
+        # Erasing the trail with sprites overwrites the center line; this strip restores it
+        self._center_line = pygame.Rect(self.width // 2 - 1, 0, 3, self.height)
+        self._dirty = []
+        self._full_redraw = True
+
+    def _build_background(self):
+        background = pygame.Surface((self.width, self.height)).convert()
+        background.fill(self.config.BLACK)
+        pygame.draw.aaline(background, self.config.WHITE,
+                           (self.width // 2, 0), (self.width // 2, self.height))
+        return background
+
+    def _score_glyph(self, value):
+        glyph = self._score_glyphs.get(value)
+        if glyph is None:
+            glyph = self.score_font.render(str(value), True, self.config.WHITE)
+            self._score_glyphs[value] = glyph
+        return glyph
+
+    def invalidate(self):
+        """Force the next frame to redraw and present the whole screen."""
+        self._full_redraw = True
+
+    def _draw_trail(self, trail):
+        """Blit trail points (newest first) oldest first; remembers them for erasing."""
+        atlas = self.atlas
+        corners = np.rint(trail[::-1]).astype(np.intp) - atlas.size // 2
+        self._trail_corners = corners.tolist()
+        sprites = atlas.trail[len(corners) - 1::-1]
+        self.screen.blits(zip(sprites, self._trail_corners), doreturn=False)
+
+        starts = np.arange(0, len(corners), TRAIL_CHUNK)
+        lows = np.minimum.reduceat(corners, starts).tolist()
+        highs = (np.maximum.reduceat(corners, starts) + atlas.size).tolist()
+        self._trail_rects = [pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+                             for (x0, y0), (x1, y1) in zip(lows, highs)]
+        self._dirty.extend(self._trail_rects)
+
+    # -------------------------------------------------------------------------
+    # Drawing
+    # -------------------------------------------------------------------------
+
+    def draw(self, paddles, ball, trail, scores, frame_surface=None, frame_updated=False):
+        """
+        Draw one frame of the playfield into the screen buffer.
+
+        Args:
+            paddles (list): Paddle Rects
+            ball (pygame.Rect): Ball Rect
+            trail (numpy.ndarray): ``(count, 2)`` trail centers, newest first
+                (at most ``TRAIL_COUNT``)
+            scores (tuple): (player_score, opponent_score)
+            frame_surface (pygame.Surface): Camera preview at preview size, or None
+            frame_updated (bool): True if the preview shows a new camera frame
+        """
+        screen = self.screen
+        config = self.config
+        full = self._full_redraw
+
+        # Erase last frame's moving objects
+        if full:
+            screen.blit(self.background, (0, 0))
+        else:
+            background = self.background
+            screen.blits([(background, rect, rect) for rect in self._moving_rects],
+                         doreturn=False)
+            self._dirty.extend(self._moving_rects)
+            if self._trail_corners:
+                screen.blits(zip(repeat(self.atlas.eraser), self._trail_corners),
+                             doreturn=False)
+                screen.blit(background, self._center_line, self._center_line)
+                self._dirty.extend(self._trail_rects)
+        self._trail_corners = []
+
+        # Scores: re-render only when they change, but always re-blit because a
+        # moving object may have been erased on top of them
+        positions = ((self.width // 4, 20), (self.width * 3 // 4, 20))
+        for side in range(2):
+            if scores[side] != self._scores[side]:
+                old_rect = self._score_rects[side]
+                if old_rect is not None and not full:
+                    screen.blit(self.background, old_rect, old_rect)
+                    self._dirty.append(old_rect)
+                glyph = self._score_glyph(scores[side])
+                self._score_rects[side] = glyph.get_rect(topleft=positions[side])
+                self._scores[side] = scores[side]
+                self._dirty.append(self._score_rects[side])
+            screen.blit(self._score_glyph(scores[side]), self._score_rects[side])
+
+        # Moving objects
+        moving = []
+        for paddle in paddles:
+            pygame.draw.rect(screen, config.WHITE, paddle)
+            moving.append(paddle.copy())
+        if len(trail):
+            self._draw_trail(trail)
+        screen.blit(self.atlas.ball, ball)
+        moving.append(ball.copy())
+
+        # Mini camera preview (bottom-right)
+        if frame_surface is not None:
+            margin = config.CAMERA_PREVIEW_MARGIN
+            preview_rect = frame_surface.get_rect(
+                bottomright=(self.width - margin, self.height - margin)
+            )
+            screen.blit(frame_surface, preview_rect)
+            if frame_updated:
+                self._dirty.append(preview_rect)
+
+        self._dirty.extend(moving)
+        self._moving_rects = moving
+
+    def draw_overlay(self, surface, rect):
+        """
+        Blit a transient overlay (e.g. the pause text) for this frame only.
+
+        Args:
+            surface (pygame.Surface): Overlay to draw
+            rect (pygame.Rect): Where to draw it; erased again next frame
+        """
+        self.screen.blit(surface, rect)
+        self._moving_rects.append(rect)
+        self._dirty.append(rect)
+
+    def present(self):
+        """Push the changed regions (or the whole frame) to the display."""
+        if self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+        else:
+            pygame.display.update(self._dirty)
+        self._dirty = []
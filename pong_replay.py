@@ -0,0 +1,339 @@
+"""
+Match replays: the seed and the hand input of a match, re-simulated bit-exactly.
+
+Every match runs on its own ``random.Random(seed)``, so ball serves, collision
+speeds and the opponent's aiming error only depend on the seed. With
+``Config.REPLAY_DIR`` set, the game also records what drove the match:
+
+- per tracking result: capture timestamp, wrist and index fingertip of each
+  hand, and the handedness labels
+- per game frame: frame time, display time, the tracking result consumed in
+  that frame, and a CRC32 of the simulation state after the frame
+
+Replaying feeds the same numbers through the same input filters
+(``PaddleTargets``) into a fresh ``PongSimulation``. No camera, tracker or
+display is involved and nothing waits for the clock, so a match re-simulates
+hundreds of times faster than it was played. The state checksums show the
+first frame where a replay departs from the recording, which makes replays
+usable as regression tests for physics changes.
+
+A replay is a compressed ``.npz`` of well under 100 KB per minute of play.
+
+Run ``python pong_replay.py replays/`` to re-simulate and verify recordings.
+``--current-settings`` replays them with today's settings (including
+``--set`` overrides) instead of the recorded ones.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import struct
+import time
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+
+from pong_config import Config, add_config_arguments, configure, settings
+from pong_filters import PaddleTargets
+from pong_pipeline import finger_diffs, hand_points
+from pong_simulation import PongSimulation
+
+
+REPLAY_VERSION = 1
+MAX_HANDS = 2
+
+_HANDEDNESS = (None, "Left", "Right")  # Stored as the index into this tuple
+
+# One record per game frame (paused frames are not recorded)
+FRAME_DTYPE = np.dtype([
+    ("dt", "<f8"),            # Frame time passed to PongSimulation.step
+    ("display_time", "<f8"),  # Time the input filters predicted the hands for
+    ("input", "<i4"),         # Index of the tracking result consumed, -1 for none
+    ("check", "<u4"),         # state_checksum after the frame
+])
+
+# One record per tracking result
+INPUT_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("hands", "u1"),
+    ("handedness", "i1", (MAX_HANDS,)),
+    ("points", "<f8", (MAX_HANDS, 2, 2)),  # hand_points(): wrist and fingertip (x, y)
+])
+
+_STATE = struct.Struct("<6d3q")
+
+
+def state_checksum(state):
+    """
+    CRC32 of the positions, speeds, scores and tick count of a state.
+
+    Args:
+        state (PongState): State to hash
+
+    Returns:
+        int: The checksum
+    """
+    return zlib.crc32(_STATE.pack(
+        state.ball_x, state.ball_y, state.ball_speed_x, state.ball_speed_y,
+        state.player_y, state.opponent_y,
+        state.player_score, state.opponent_score, state.tick_count
+    ))
+
+
+def new_seed():
+    """
+    Seed for a match when ``Config.MATCH_SEED`` is not set.
+
+    Returns:
+        int: Random 32-bit seed
+    """
+    return random.SystemRandom().randrange(1 << 32)
+
+
+# =============================================================================
+# RECORDING
+# =============================================================================
+
+class ReplayRecorder:
+    """
+    Collects the inputs of one match and writes them on ``close``.
+
+    Args:
+        path (str): Target ``.npz`` file
+        seed (int): Seed of the match's random stream
+        calibrations (list): (min_diff, max_diff) per player
+        size (tuple): (width, height) of the playfield
+        config: Configuration class the match runs with
+    """
+
+    def __init__(self, path, seed, calibrations, size, config):
+        self.path = path
+        self.metadata = {
+            "version": REPLAY_VERSION,
+            "seed": seed,
+            "calibrations": [list(calibration) for calibration in calibrations],
+            "width": size[0],
+            "height": size[1],
+            "settings": settings(config),
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self._frames = []
+        self._inputs = []
+
+    def input(self, result):
+        """
+        Record a tracking result.
+
+        Args:
+            result (TrackingResult): Result the game is about to consume
+
+        Returns:
+            int: Index to pass to ``frame``
+        """
+        hands = min(len(result.hand_landmarks), MAX_HANDS)
+        points = np.full((MAX_HANDS, 2, 2), np.nan)
+        points[:hands] = hand_points(result.hand_landmarks[:hands])
+        labels = list(result.handedness or [])[:hands]
+        handedness = [_HANDEDNESS.index(label) if label in _HANDEDNESS else 0
+                      for label in labels] + [0] * (MAX_HANDS - len(labels))
+        self._inputs.append((result.timestamp, hands, handedness, points))
+        return len(self._inputs) - 1
+
+    def frame(self, dt, display_time, input_index, state):
+        """
+        Record one game frame, after the simulation stepped.
+
+        Args:
+            dt (float): Frame time passed to the simulation
+            display_time (float): Time passed to the input filters
+            input_index (int): Result consumed in this frame (from ``input``), or -1
+            state (PongState): Simulation state after the step
+        """
+        self._frames.append((dt, display_time, input_index, state_checksum(state)))
+
+    def close(self, **metadata):
+        """
+        Write the replay file.
+
+        Args:
+            **metadata: Final values stored with the replay, e.g. ``winner``
+        """
+        self.metadata.update(metadata)
+        frames = np.array(self._frames, dtype=FRAME_DTYPE)
+        self.metadata["duration"] = float(frames["dt"].sum()) if len(frames) else 0.0
+        np.savez_compressed(
+            self.path,
+            metadata=np.array(json.dumps(self.metadata, default=list)),
+            frames=frames,
+            inputs=np.array(self._inputs, dtype=INPUT_DTYPE),
+        )
+        print(f"Replay saved to {self.path} ({len(frames)} frames, seed {self.metadata['seed']})")
+
+
+def recorder_for_match(directory, seed, calibrations, size, config):
+    """
+    Start recording a match into a new, time-stamped replay file.
+
+    Args:
+        directory (str): Folder holding all replays
+        seed (int): Seed of the match's random stream
+        calibrations (list): (min_diff, max_diff) per player
+        size (tuple): (width, height) of the playfield
+        config: Configuration class the match runs with
+
+    Returns:
+        ReplayRecorder: The recorder
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = time.strftime("match-%Y%m%d-%H%M%S")
+    path = os.path.join(directory, name + ".npz")
+    suffix = 1
+    while os.path.exists(path):
+        suffix += 1
+        path = os.path.join(directory, f"{name}-{suffix}.npz")
+    return ReplayRecorder(path, seed, calibrations, size, config)
+
+
+# =============================================================================
+# REPLAYING
+# =============================================================================
+
+def load_replay(path):
+    """
+    Read a replay file.
+
+    Args:
+        path (str): ``.npz`` file written by ``ReplayRecorder``
+
+    Returns:
+        SimpleNamespace: ``metadata`` (dict), ``frames`` and ``inputs`` arrays
+    """
+    with np.load(path) as data:
+        metadata = json.loads(str(data["metadata"]))
+        if metadata.get("version") != REPLAY_VERSION:
+            raise ValueError(f"{path}: unsupported replay version {metadata.get('version')!r}")
+        return SimpleNamespace(path=path, metadata=metadata, frames=data["frames"],
+                               inputs=data["inputs"])
+
+
+def find_replays(paths):
+    """
+    Expand files, directories and glob patterns into replay files.
+
+    Args:
+        paths (list): Replay files, folders or patterns
+
+    Returns:
+        list: Sorted file names
+    """
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            path = os.path.join(path, "*.npz")
+        files.update(match for match in glob.glob(path) if match.endswith(".npz"))
+    return sorted(files)
+
+
+def resimulate(replay, config=None):
+    """
+    Run a recorded match again.
+
+    Args:
+        replay (SimpleNamespace): Replay from ``load_replay``
+        config: Settings to simulate with; the recorded ones if None
+
+    Returns:
+        dict: ``frames``, ``ticks``, ``winner``, ``score``, ``exact`` (every
+        checksum matched), ``first_divergence`` (frame index or None),
+        ``duration`` (seconds of play), ``elapsed`` and ``speedup``
+    """
+    metadata = replay.metadata
+    if config is None:
+        config = SimpleNamespace(**metadata["settings"])
+    width, height = metadata["width"], metadata["height"]
+    calibrations = [tuple(calibration) for calibration in metadata["calibrations"]]
+    players = len(calibrations)
+
+    start = time.perf_counter()
+    simulation = PongSimulation(width, height, config, rng=random.Random(metadata["seed"]))
+    # Inputs are filtered before the simulation, exactly as in the game
+    simulation.input_smoothing = 1.0
+    paddles = PaddleTargets(calibrations, height, config)
+
+    inputs = replay.inputs
+    timestamps = inputs["timestamp"].tolist()
+    diffs = [
+        finger_diffs(points[:hands], [_HANDEDNESS[code] for code in codes[:hands]],
+                     players, config.PLAYER_ASSIGNMENT)
+        for hands, codes, points in zip(inputs["hands"].tolist(), inputs["handedness"],
+                                        inputs["points"])
+    ]
+
+    first_divergence = None
+    for index, (dt, display_time, input_index, check) in enumerate(replay.frames.tolist()):
+        if input_index >= 0:
+            paddles.update(diffs[input_index], timestamps[input_index])
+        targets = paddles.predict(display_time)
+        simulation.step(dt, targets[0], targets[1])
+        if first_divergence is None and state_checksum(simulation.state) != check:
+            first_divergence = index
+    elapsed = time.perf_counter() - start
+
+    state = simulation.state
+    duration = metadata.get("duration", 0.0)
+    return {
+        "frames": len(replay.frames),
+        "ticks": state.tick_count,
+        "winner": simulation.winner,
+        "score": (state.player_score, state.opponent_score),
+        "exact": first_divergence is None,
+        "first_divergence": first_divergence,
+        "duration": duration,
+        "elapsed": elapsed,
+        "speedup": duration / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def parse_args(argv=None):
+    """
+    Parse the replay command line.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Re-simulate and verify recorded Pong matches.")
+    parser.add_argument("paths", nargs="+", help="replay files, folders or glob patterns")
+    parser.add_argument("--current-settings", action="store_true",
+                        help="simulate with the current settings instead of the recorded ones")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    configure(parser, args)
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    diverged = 0
+    for path in find_replays(args.paths):
+        replay = load_replay(path)
+        result = resimulate(replay, Config if args.current_settings else None)
+        recorded = replay.metadata.get("winner")
+        status = ("bit-exact" if result["exact"] else
+                  f"diverges at frame {result['first_divergence']}")
+        diverged += not result["exact"]
+        print(f"{path}: {result['frames']} frames, {result['ticks']} ticks, "
+              f"score {result['score'][0]}:{result['score'][1]} "
+              f"({result['winner'] or 'unfinished'}, recorded {recorded}), {status}, "
+              f"{result['elapsed'] * 1000:.0f} ms ({result['speedup']:.0f}x real time)")
+    if diverged:
+        raise SystemExit(1)
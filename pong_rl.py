@@ -0,0 +1,713 @@
+"""
+Reinforcement-learning environments and a NumPy policy for the opponent paddle.
+
+The agent controls the right (opponent) paddle; the left paddle is a scripted
+player that follows the ball through the usual input smoothing. Both
+environments share the same interface, modelled on Gym:
+
+- ``reset(seed)`` returns ``(observation, info)``
+- ``step(action)`` returns ``(observation, reward, terminated, truncated, info)``
+
+Observations are six floats scaled to roughly [-1, 1]: ball x, ball y, ball
+speed x, ball speed y, the agent's paddle and the player's paddle. Actions are
+``ACTION_STAY``, ``ACTION_UP`` and ``ACTION_DOWN``, moving the paddle by
+``Config.OPPONENT_SPEED``. The reward is +1 when ``opponent_score`` goes up
+and -1 when ``player_score`` goes up.
+
+``PongEnv`` wraps one ``PongSimulation`` and plays by exactly the rules of the
+live game. ``VectorPongEnv`` runs many matches at once on a
+``BatchSimulation`` (the same rules against the chase opponent, with its own
+random streams) and restarts finished matches on its own. ``RolloutRunner``
+spreads policy evaluations over a process pool, which ``train`` uses for a
+simple evolution-strategies search. ``evaluate_live`` scores the result on
+``PongEnv``, so the reported returns come from the live rules.
+
+A trained ``MLPPolicy`` is a single ``.npz`` file. Setting
+``Config.OPPONENT_AI = "policy"`` loads ``Config.OPPONENT_POLICY_PATH`` into a
+``PolicyOpponent``, which costs a few microseconds per physics tick.
+
+Run ``python pong_rl.py train`` to train a policy, ``python pong_rl.py
+evaluate`` to compare it with the chase opponent and ``python pong_rl.py
+benchmark`` to measure rollout throughput and the live per-tick cost.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+
+from pong_ai import ChaseOpponent
+from pong_batch import NO_WINNER, BatchSimulation
+from pong_config import Config, settings
+from pong_simulation import EVENT_OPPONENT_SCORED, EVENT_PLAYER_SCORED, PongSimulation
+
+
+ACTION_STAY = 0
+ACTION_UP = 1
+ACTION_DOWN = 2
+ACTION_COUNT = 3
+OBSERVATION_SIZE = 6
+
+DEFAULT_HIDDEN = 16
+
+
+# =============================================================================
+# Observations
+# =============================================================================
+
+class ObservationScaler:
+    """
+    Maps raw game quantities to the observation vector.
+
+    Args:
+        width (int): Playfield width in pixels
+        height (int): Playfield height in pixels
+        config: Object exposing the ``Config`` ball attributes
+    """
+
+    def __init__(self, width, height, config):
+        speed = float(config.BALL_COLLISION_SPEED_MAX)
+        self.offset = np.array([width / 2, height / 2, 0.0, 0.0, height / 2, height / 2])
+        self.scale = np.array([2 / width, 2 / height, 1 / speed, 1 / speed,
+                               2 / height, 2 / height])
+
+    def __call__(self, raw):
+        """
+        Scale raw values.
+
+        Args:
+            raw (numpy.ndarray): ``(..., 6)`` ball x, ball y, ball speed x,
+                ball speed y, opponent paddle y, player paddle y
+
+        Returns:
+            numpy.ndarray: float32 observations of the same shape
+        """
+        return ((raw - self.offset) * self.scale).astype(np.float32)
+
+    def state(self, state):
+        """
+        Observation of one ``PongState``.
+
+        Args:
+            state (PongState): State to observe
+
+        Returns:
+            numpy.ndarray: ``(6,)`` float32 observation
+        """
+        return self(np.array((state.ball_x, state.ball_y, state.ball_speed_x,
+                              state.ball_speed_y, state.opponent_y, state.player_y)))
+
+    def batch(self, batch):
+        """
+        Observations of every match in a ``BatchSimulation``.
+
+        Args:
+            batch (BatchSimulation): Matches to observe
+
+        Returns:
+            numpy.ndarray: ``(matches, 6)`` float32 observations
+        """
+        return self(np.stack((batch.ball_x, batch.ball_y, batch.ball_speed_x,
+                              batch.ball_speed_y, batch.opponent_y, batch.player_y), axis=1))
+
+
+def action_moves(config):
+    """
+    Paddle movement in pixels for every action.
+
+    Args:
+        config: Object exposing ``OPPONENT_SPEED``
+
+    Returns:
+        numpy.ndarray: Movement indexed by action
+    """
+    speed = float(config.OPPONENT_SPEED)
+    return np.array([0.0, -speed, speed])
+
+
+# =============================================================================
+# Policy
+# =============================================================================
+
+class MLPPolicy:
+    """
+    Greedy policy from a one-hidden-layer tanh network, NumPy only.
+
+    Args:
+        weights (dict): ``w1`` (6, hidden), ``b1`` (hidden,), ``w2`` (hidden, 3)
+            and ``b2`` (3,) arrays
+    """
+
+    _NAMES = ("w1", "b1", "w2", "b2")
+
+    def __init__(self, weights):
+        self.w1, self.b1, self.w2, self.b2 = (
+            np.asarray(weights[name], dtype=np.float32) for name in self._NAMES
+        )
+
+    @property
+    def hidden(self):
+        """int: Hidden layer width."""
+        return self.b1.shape[0]
+
+    @classmethod
+    def random(cls, hidden=DEFAULT_HIDDEN, rng=None):
+        """
+        Policy with small random weights.
+
+        Args:
+            hidden (int): Hidden layer width
+            rng (numpy.random.Generator): Random source
+
+        Returns:
+            MLPPolicy: The policy
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        return cls({
+            "w1": rng.normal(0.0, 1.0 / np.sqrt(OBSERVATION_SIZE), (OBSERVATION_SIZE, hidden)),
+            "b1": np.zeros(hidden),
+            "w2": rng.normal(0.0, 1.0 / np.sqrt(hidden), (hidden, ACTION_COUNT)),
+            "b2": np.zeros(ACTION_COUNT),
+        })
+
+    @classmethod
+    def from_flat(cls, flat, hidden=DEFAULT_HIDDEN):
+        """
+        Policy from a flat parameter vector (see ``flat``).
+
+        Args:
+            flat (numpy.ndarray): Parameters
+            hidden (int): Hidden layer width
+
+        Returns:
+            MLPPolicy: The policy
+        """
+        shapes = ((OBSERVATION_SIZE, hidden), (hidden,), (hidden, ACTION_COUNT),
+                  (ACTION_COUNT,))
+        weights = {}
+        start = 0
+        for name, shape in zip(cls._NAMES, shapes):
+            size = int(np.prod(shape))
+            weights[name] = np.reshape(flat[start:start + size], shape)
+            start += size
+        if start != len(flat):
+            raise ValueError(f"Expected {start} parameters for hidden={hidden}, got {len(flat)}")
+        return cls(weights)
+
+    @property
+    def flat(self):
+        """numpy.ndarray: All parameters as one float64 vector."""
+        return np.concatenate([getattr(self, name).ravel() for name in self._NAMES]
+                              ).astype(np.float64)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a policy saved with ``save``.
+
+        Args:
+            path (str): ``.npz`` file
+
+        Returns:
+            MLPPolicy: The policy
+        """
+        with np.load(path) as data:
+            return cls({name: data[name] for name in cls._NAMES})
+
+    def save(self, path):
+        """
+        Write the weights to an ``.npz`` file.
+
+        Args:
+            path (str): Target file
+        """
+        np.savez(path, **{name: getattr(self, name) for name in self._NAMES})
+
+    def act(self, observation):
+        """
+        Choose actions.
+
+        Args:
+            observation (numpy.ndarray): ``(6,)`` or ``(n, 6)`` observations
+
+        Returns:
+            numpy.ndarray: Action (or ``(n,)`` actions)
+        """
+        hidden = np.tanh(observation @ self.w1 + self.b1)
+        return np.argmax(hidden @ self.w2 + self.b2, axis=-1)
+
+
+class PolicyOpponent:
+    """Drives the opponent paddle of a ``PongSimulation`` with a trained policy."""
+
+    def __init__(self, simulation, policy):
+        """
+        Args:
+            simulation (PongSimulation): Simulation whose opponent paddle is driven
+            policy (MLPPolicy or str): Policy, or the path of a saved one
+        """
+        self.policy = MLPPolicy.load(policy) if isinstance(policy, str) else policy
+        self.moves = action_moves(simulation.config).tolist()
+        # Fold the observation scaling into the first layer, so a tick costs
+        # two small matrix products on the raw state (same actions as
+        # MLPPolicy.act up to float rounding)
+        scaler = ObservationScaler(simulation.width, simulation.height, simulation.config)
+        w1 = self.policy.w1.astype(np.float64)
+        self.w1 = scaler.scale[:, None] * w1
+        self.b1 = self.policy.b1 - (scaler.offset * scaler.scale) @ w1
+        self.w2 = self.policy.w2.astype(np.float64)
+        self.b2 = self.policy.b2.astype(np.float64)
+
+    def reset(self):
+        """Forget any per-rally state (nothing to forget)."""
+
+    def update(self, state):
+        """
+        Move the opponent paddle for one tick.
+
+        Args:
+            state (PongState): State to update in place
+        """
+        raw = np.array((state.ball_x, state.ball_y, state.ball_speed_x, state.ball_speed_y,
+                        state.opponent_y, state.player_y))
+        logits = np.tanh(raw @ self.w1 + self.b1) @ self.w2 + self.b2
+        state.opponent_y += self.moves[logits.argmax()]
+
+
+# =============================================================================
+# Environments
+# =============================================================================
+
+class PongEnv:
+    """
+    One match with the agent on the opponent paddle, by the live game's rules.
+
+    Args:
+        config: Object exposing the ``Config`` game attributes
+        width (int): Playfield width, ``config.DEFAULT_WIDTH`` if None
+        height (int): Playfield height, ``config.DEFAULT_HEIGHT`` if None
+        max_steps (int): Ticks before an episode is truncated, or None
+        player (callable): Called with the ``PongState`` and returning the
+            player's target paddle y (or None); follows the ball if omitted
+    """
+
+    observation_size = OBSERVATION_SIZE
+    action_count = ACTION_COUNT
+
+    def __init__(self, config=Config, width=None, height=None, max_steps=None, player=None):
+        width = width or config.DEFAULT_WIDTH
+        height = height or config.DEFAULT_HEIGHT
+        self.simulation = PongSimulation(width, height, config, two_player=True)
+        self.scaler = ObservationScaler(width, height, config)
+        self.moves = action_moves(config)
+        self.max_steps = max_steps
+        self.player = player or (lambda state: state.ball_y)
+        self.steps = 0
+
+    def reset(self, seed=None):
+        """
+        Start a new match.
+
+        Args:
+            seed (int): Seed for the match's random stream, or None
+
+        Returns:
+            tuple: (observation, info)
+        """
+        if seed is not None:
+            self.simulation.rng = random.Random(seed)
+        self.simulation.reset_game()
+        self.steps = 0
+        return self.scaler.state(self.simulation.state), {}
+
+    def step(self, action):
+        """
+        Move the agent's paddle and advance one tick.
+
+        Args:
+            action (int): ``ACTION_STAY``, ``ACTION_UP`` or ``ACTION_DOWN``
+
+        Returns:
+            tuple: (observation, reward, terminated, truncated, info)
+        """
+        simulation = self.simulation
+        state = simulation.state
+        state.opponent_y += self.moves[action]
+        events = simulation.tick(self.player(state))
+        reward = float(events.count(EVENT_OPPONENT_SCORED) - events.count(EVENT_PLAYER_SCORED))
+        self.steps += 1
+        terminated = simulation.winner is not None
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        info = {"events": events, "player_score": state.player_score,
+                "opponent_score": state.opponent_score}
+        return self.scaler.state(state), reward, terminated, truncated, info
+
+
+class VectorPongEnv:
+    """
+    Many matches stepped together; finished matches restart automatically.
+
+    The observation returned for a match that just ended already belongs to
+    its next game, as in Gym's vector environments.
+
+    Args:
+        count (int): Number of matches
+        config: Object exposing the ``Config`` game attributes
+        width (int): Playfield width, ``config.DEFAULT_WIDTH`` if None
+        height (int): Playfield height, ``config.DEFAULT_HEIGHT`` if None
+        seed (int): Base seed for the per-match random streams
+        max_steps (int): Ticks before a match is truncated, or None
+    """
+
+    observation_size = OBSERVATION_SIZE
+    action_count = ACTION_COUNT
+
+    def __init__(self, count, config=Config, width=None, height=None, seed=0, max_steps=None):
+        self.count = count
+        self.config = config
+        self.width = width or config.DEFAULT_WIDTH
+        self.height = height or config.DEFAULT_HEIGHT
+        self.max_steps = max_steps
+        self.scaler = ObservationScaler(self.width, self.height, config)
+        self.moves = action_moves(config)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """
+        Start new matches everywhere.
+
+        Args:
+            seed (int): New base seed, or None to continue the current streams
+
+        Returns:
+            tuple: (observations, info)
+        """
+        if seed is not None:
+            self.batch = BatchSimulation(self.width, self.height, self.config, self.count, seed,
+                                         opponent="chase")
+        else:
+            self.batch.reset_game(np.ones(self.count, dtype=bool))
+        self.steps = np.zeros(self.count, dtype=np.int64)
+        return self.scaler.batch(self.batch), {}
+
+    def step(self, actions):
+        """
+        Advance every match by one tick.
+
+        Args:
+            actions (numpy.ndarray): Action per match, or None to let the
+                chase opponent play (a baseline)
+
+        Returns:
+            tuple: (observations, rewards, terminated, truncated, info) where
+            info holds the final ``player_score`` and ``opponent_score`` arrays
+        """
+        batch = self.batch
+        player_score = batch.player_score.copy()
+        opponent_score = batch.opponent_score.copy()
+        batch.tick(batch.ball_y, None if actions is None else self.moves[actions])
+        rewards = ((batch.opponent_score - opponent_score)
+                   - (batch.player_score - player_score)).astype(np.float32)
+
+        self.steps += 1
+        terminated = batch.winner != NO_WINNER
+        truncated = ~terminated & (self.steps >= (self.max_steps or np.iinfo(np.int64).max))
+        info = {"player_score": batch.player_score.copy(),
+                "opponent_score": batch.opponent_score.copy()}
+        done = terminated | truncated
+        if done.any():
+            batch.reset_game(done)
+            self.steps[done] = 0
+        return self.scaler.batch(batch), rewards, terminated, truncated, info
+
+
+# =============================================================================
+# Rollouts
+# =============================================================================
+
+def rollout(env, policy, ticks, record=False):
+    """
+    Run a policy in a vector environment.
+
+    Args:
+        env (VectorPongEnv): Environment, reset by this call
+        policy (MLPPolicy): Policy to run, or None for the chase opponent
+        ticks (int): Ticks to simulate
+        record (bool): Also return the observations, actions and rewards
+
+    Returns:
+        dict: ``returns`` per match, ``games`` finished and, when recorded,
+        ``observations`` (ticks, matches, 6), ``actions`` and ``rewards``
+        (ticks, matches)
+    """
+    observation, _ = env.reset()
+    returns = np.zeros(env.count)
+    games = 0
+    if record:
+        observations = np.empty((ticks, env.count, OBSERVATION_SIZE), dtype=np.float32)
+        actions = np.empty((ticks, env.count), dtype=np.int8)
+        rewards = np.empty((ticks, env.count), dtype=np.float32)
+    for tick in range(ticks):
+        action = None if policy is None else policy.act(observation)
+        if record:
+            observations[tick] = observation
+            actions[tick] = ACTION_STAY if action is None else action
+        observation, reward, terminated, truncated, _ = env.step(action)
+        returns += reward
+        games += int(terminated.sum())
+        if record:
+            rewards[tick] = reward
+    result = {"returns": returns, "games": games}
+    if record:
+        result.update(observations=observations, actions=actions, rewards=rewards)
+    return result
+
+
+def evaluate_live(policy, matches=32, ticks=2000, seed=0, config=Config):
+    """
+    Mean return of a policy in ``PongEnv``, by the live game's rules.
+
+    Finished games restart on the same random stream, as in ``rollout``.
+
+    Args:
+        policy (MLPPolicy): Policy to run, or None for the chase opponent
+        matches (int): Matches to play, seeded ``seed``, ``seed + 1``, ...
+        ticks (int): Ticks per match
+        seed (int): Seed of the first match
+        config: Object exposing the ``Config`` game attributes
+
+    Returns:
+        float: Mean return per match
+    """
+    env = PongEnv(config)
+    state = env.simulation.state
+    chase = ChaseOpponent(env.simulation)
+    total = 0.0
+    for match in range(matches):
+        observation, _ = env.reset(seed + match)
+        for _ in range(ticks):
+            if policy is None:
+                chase.update(state)
+                action = ACTION_STAY
+            else:
+                action = policy.act(observation)
+            observation, reward, terminated, _, _ = env.step(action)
+            total += reward
+            if terminated:
+                observation, _ = env.reset()
+    return total / matches
+
+
+def _evaluate_job(job):
+    """Process-pool entry point: mean return of one parameter vector."""
+    values, flat, hidden, matches, ticks, seed = job
+    config = SimpleNamespace(**values)
+    policy = None if flat is None else MLPPolicy.from_flat(flat, hidden)
+    return rollout(VectorPongEnv(matches, config, seed=seed), policy, ticks)["returns"].mean()
+
+
+class RolloutRunner:
+    """
+    Evaluates many policies in parallel worker processes.
+
+    Every policy plays the same matches (same seeds), so differences in the
+    returns come from the policies rather than from luck.
+
+    Args:
+        config: Configuration class whose current settings the workers use
+        workers (int): Worker processes, ``os.cpu_count()`` if None; 1 runs
+            everything in this process
+        matches (int): Matches per evaluation
+        ticks (int): Ticks per evaluation
+        hidden (int): Hidden layer width of the evaluated policies
+    """
+
+    def __init__(self, config=Config, workers=None, matches=32, ticks=2000,
+                 hidden=DEFAULT_HIDDEN):
+        self.values = settings(config)
+        self.workers = workers or os.cpu_count() or 1
+        self.matches = matches
+        self.ticks = ticks
+        self.hidden = hidden
+        self._pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+
+    def evaluate(self, parameters, seed=0):
+        """
+        Mean return per match for every parameter vector.
+
+        Args:
+            parameters (list): Flat parameter vectors (None evaluates the
+                chase opponent)
+            seed (int): Base seed of the matches
+
+        Returns:
+            numpy.ndarray: Mean return per parameter vector
+        """
+        jobs = [(self.values, flat, self.hidden, self.matches, self.ticks, seed)
+                for flat in parameters]
+        if self._pool is None:
+            return np.array([_evaluate_job(job) for job in jobs])
+        chunk = max(1, len(jobs) // (self.workers * 4))
+        return np.array(list(self._pool.map(_evaluate_job, jobs, chunksize=chunk)))
+
+    def close(self):
+        """Shut the worker processes down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# =============================================================================
+# Training
+# =============================================================================
+
+def _centered_ranks(values):
+    """Fitness shaping: ranks mapped to [-0.5, 0.5]."""
+    ranks = np.empty(len(values))
+    ranks[np.argsort(values)] = np.arange(len(values))
+    return ranks / max(len(values) - 1, 1) - 0.5
+
+
+def train(runner, iterations=60, population=32, sigma=0.1, learning_rate=0.05, seed=0,
+          policy=None):
+    """
+    Improve a policy with antithetic evolution strategies.
+
+    Args:
+        runner (RolloutRunner): Evaluates the candidate policies
+        iterations (int): Update steps
+        population (int): Candidates per step (rounded up to an even number)
+        sigma (float): Standard deviation of the parameter noise
+        learning_rate (float): Step size
+        seed (int): Seed for the noise and the evaluation matches
+        policy (MLPPolicy): Starting point; random if omitted
+
+    Returns:
+        MLPPolicy: The trained policy
+    """
+    rng = np.random.default_rng(seed)
+    if policy is None:
+        policy = MLPPolicy.random(runner.hidden, rng)
+    theta = policy.flat
+    half = (population + 1) // 2
+    for iteration in range(iterations):
+        start = time.perf_counter()
+        noise = rng.standard_normal((half, theta.size))
+        candidates = np.concatenate([theta + sigma * noise, theta - sigma * noise])
+        fitness = runner.evaluate(list(candidates), seed=seed + iteration)
+        ranks = _centered_ranks(fitness)
+        theta = theta + learning_rate / (2 * half * sigma) * (ranks[:half] - ranks[half:]) @ noise
+        print(f"iteration {iteration + 1:4d}   mean return {fitness.mean():7.3f}   "
+              f"best {fitness.max():7.3f}   {time.perf_counter() - start:6.2f}s")
+    return MLPPolicy.from_flat(theta, runner.hidden)
+
+
+# =============================================================================
+# Command line
+# =============================================================================
+
+def benchmark(runner_matches=32, ticks=500):
+    """
+    Measure rollout throughput per worker count and the live per-tick cost.
+
+    Args:
+        runner_matches (int): Matches per evaluation
+        ticks (int): Ticks per evaluation
+
+    Returns:
+        dict: workers -> match-steps per second, plus ``policy_us_per_tick``
+    """
+    policy = MLPPolicy.random()
+    results = {}
+    counts = sorted({1, 2, 4, os.cpu_count() or 1})
+    for workers in counts:
+        with RolloutRunner(workers=workers, matches=runner_matches, ticks=ticks) as runner:
+            jobs = [policy.flat] * (4 * workers)
+            runner.evaluate(jobs[:workers])  # Start the workers
+            start = time.perf_counter()
+            runner.evaluate(jobs)
+            elapsed = time.perf_counter() - start
+        rate = len(jobs) * runner_matches * ticks / elapsed
+        results[workers] = rate
+        print(f"{workers:3d} workers   {rate / 1e6:6.2f}M match-steps/s")
+
+    simulation = PongSimulation(Config.DEFAULT_WIDTH, Config.DEFAULT_HEIGHT, Config)
+    opponent = PolicyOpponent(simulation, policy)
+    count = 20000
+    start = time.perf_counter()
+    for _ in range(count):
+        opponent.update(simulation.state)
+    cost = (time.perf_counter() - start) / count * 1e6
+    results["policy_us_per_tick"] = cost
+    print(f"PolicyOpponent.update: {cost:.2f} us/tick")
+    return results
+
+
+def parse_args(argv=None):
+    """
+    Parse the training command line.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Train, evaluate or benchmark a NumPy policy for the opponent paddle."
+    )
+    parser.add_argument("mode", choices=("train", "evaluate", "benchmark"))
+    parser.add_argument("--policy", default=Config.OPPONENT_POLICY_PATH,
+                        help="policy file written by train and read by evaluate")
+    parser.add_argument("--iterations", type=int, default=60)
+    parser.add_argument("--population", type=int, default=32)
+    parser.add_argument("--sigma", type=float, default=0.1)
+    parser.add_argument("--learning-rate", type=float, default=0.05)
+    parser.add_argument("--hidden", type=int, default=DEFAULT_HIDDEN)
+    parser.add_argument("--matches", type=int, default=32, help="matches per evaluation")
+    parser.add_argument("--ticks", type=int, default=2000, help="ticks per evaluation")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--resume", action="store_true",
+                        help="continue training from the existing policy file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.mode == "benchmark":
+        benchmark(args.matches, args.ticks)
+    else:
+        with RolloutRunner(workers=args.workers, matches=args.matches, ticks=args.ticks,
+                           hidden=args.hidden) as runner:
+            if args.mode == "train":
+                start = MLPPolicy.load(args.policy) if args.resume else None
+                trained = train(runner, args.iterations, args.population, args.sigma,
+                                args.learning_rate, args.seed, start)
+                trained.save(args.policy)
+                print(f"Saved {args.policy}")
+            else:
+                trained = MLPPolicy.load(args.policy)
+                runner.hidden = trained.hidden
+            # Fresh matches, not the ones used for training, by the live rules
+            policy_return, chase_return = (
+                evaluate_live(policy, args.matches, args.ticks, args.seed + 10**6)
+                for policy in (trained, None)
+            )
+            print(f"Mean return per {args.ticks} ticks: policy {policy_return:.3f}, "
+                  f"chase {chase_return:.3f}")
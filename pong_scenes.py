@@ -0,0 +1,260 @@
+"""
+Scene manager: one main loop for every screen of the game.
+
+Each screen (start menu, loading, calibration, match, game over) is a
+``Scene`` object holding its own state. ``SceneManager.run`` drives the
+current scene and switches to the next one as soon as a scene asks for it,
+without waiting for the next frame.
+
+Scenes come in two kinds:
+
+- Animated scenes (``fps`` > 0) update and draw every frame at that rate.
+- Idle scenes (``fps`` = 0) block in ``pygame.event.wait`` and only update
+  when something happens: input, a finished background task, a ``wake()``
+  from another thread or, if they ask for it, every ``wake_interval``
+  seconds. They only redraw after ``invalidate()``, so a menu nobody touches
+  costs no CPU at all.
+
+Slow work (opening the camera, loading models, flushing files) runs on a
+thread pool through ``SceneManager.run_task``; its completion callback runs
+on the main loop. Pygame's event queue and display belong to the main
+thread, which is why background work uses threads that post events rather
+than an asyncio loop that would have to poll for input.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+
+# Posted by wake() and by finished background tasks
+WAKE_EVENT = pygame.event.custom_type()
+TASK_DONE_EVENT = pygame.event.custom_type()
+
+
+def wake(event_type=WAKE_EVENT, **attributes):
+    """
+    Wake the main loop from any thread.
+
+    The current scene is invalidated and updated. Does nothing before the
+    display is initialized (the loop is not sleeping yet then).
+
+    Args:
+        event_type (int): Event to post
+        **attributes: Event attributes
+    """
+    try:
+        pygame.event.post(pygame.event.Event(event_type, **attributes))
+    except pygame.error:
+        pass
+
+
+class Scene:
+    """
+    One screen of the game. Subclasses override the hooks they need.
+
+    Attributes:
+        fps (int): Frame rate while shown, or 0 for an idle scene
+        wake_interval (float): Seconds an idle scene may sleep without
+            events, or None to sleep until one arrives
+        manager (SceneManager): Manager running the scene (set on enter)
+    """
+
+    fps = 0
+    wake_interval = None
+
+    def __init__(self):
+        self.manager = None
+        self.dirty = True
+
+    def invalidate(self):
+        """Redraw an idle scene on the next pass."""
+        self.dirty = True
+
+    def enter(self):
+        """Called when the scene becomes current."""
+
+    def exit(self):
+        """Called when the scene is left."""
+
+    def handle_event(self, event):
+        """
+        React to one Pygame event.
+
+        Args:
+            event (pygame.event.Event): The event
+        """
+
+    def update(self, dt):
+        """
+        Advance the scene's state.
+
+        Args:
+            dt (float): Seconds since the previous update
+        """
+
+    def draw(self):
+        """Draw the scene (every frame, or after ``invalidate`` when idle)."""
+
+    def end_frame(self, frame_time, work_time):
+        """
+        Called after the frame limiter of an animated scene.
+
+        Args:
+            frame_time (float): Seconds since the previous frame started
+            work_time (float): Seconds the frame was busy
+        """
+
+
+class SceneManager:
+    """
+    Runs scenes and background tasks.
+
+    Args:
+        workers (int): Threads for background tasks
+    """
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self.scene = None
+        self.frames = 0  # Frames drawn
+        self.wakeups = 0  # Passes of the loop
+        self._next = None
+        self._pending = False
+        self._executor = None
+        self._callbacks = {}
+
+    # -------------------------------------------------------------------------
+    # Scenes
+    # -------------------------------------------------------------------------
+
+    def switch(self, scene):
+        """
+        Make ``scene`` current as soon as the running hook returns.
+
+        Args:
+            scene (Scene): Next scene, or None to stop
+        """
+        self._next = scene
+        self._pending = True
+
+    def quit(self):
+        """Stop the loop after the running hook returns."""
+        self.switch(None)
+
+    def _apply_switch(self):
+        """Leave the current scene and enter the pending ones (enter may switch again)."""
+        while self._pending:
+            self._pending = False
+            if self.scene is not None:
+                self.scene.exit()
+            self.scene = self._next
+            if self.scene is not None:
+                self.scene.manager = self
+                self.scene.dirty = True
+                self.scene.enter()
+
+    def _events(self, scene):
+        """Pending events; idle scenes without anything to redraw sleep until one arrives."""
+        if scene.fps or scene.dirty:
+            return pygame.event.get()
+        timeout = 0 if scene.wake_interval is None else max(1, int(scene.wake_interval * 1000))
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def run(self, scene):
+        """
+        Run scenes until one switches to None.
+
+        Args:
+            scene (Scene): First scene
+        """
+        clock = pygame.time.Clock()
+        self.switch(scene)
+        while True:
+            if self._pending:
+                self._apply_switch()
+                if self.scene is None:
+                    return
+                # The new scene starts right away; its first frame has no elapsed time
+                clock.tick()
+                dt = 0.0
+                frame_start = last_update = time.perf_counter()
+            scene = self.scene
+
+            for event in self._events(scene):
+                if event.type == TASK_DONE_EVENT:
+                    self._finish_task(event.task)
+                    scene.invalidate()
+                elif event.type == WAKE_EVENT:
+                    scene.invalidate()
+                else:
+                    scene.handle_event(event)
+                if self._pending:
+                    break
+            if self._pending:
+                continue
+            self.wakeups += 1
+
+            if not scene.fps:
+                now = time.perf_counter()
+                dt, last_update = now - last_update, now
+            scene.update(dt)
+            if self._pending:
+                continue
+            if scene.fps or scene.dirty:
+                scene.dirty = False
+                scene.draw()
+                self.frames += 1
+            if scene.fps:
+                work_time = time.perf_counter() - frame_start
+                dt = clock.tick(scene.fps) / 1000.0
+                frame_start = time.perf_counter()
+                scene.end_frame(dt, work_time)
+
+    # -------------------------------------------------------------------------
+    # Background tasks
+    # -------------------------------------------------------------------------
+
+    def run_task(self, function, *args, then=None, **kwargs):
+        """
+        Run ``function`` on a worker thread.
+
+        Args:
+            function (callable): Work to run
+            *args: Positional arguments for ``function``
+            then (callable): Called with the finished future on the main loop
+            **kwargs: Keyword arguments for ``function``
+
+        Returns:
+            concurrent.futures.Future: The task
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix="scene-task")
+        future = self._executor.submit(function, *args, **kwargs)
+        self._callbacks[future] = then
+        future.add_done_callback(lambda done: wake(TASK_DONE_EVENT, task=done))
+        return future
+
+    def _finish_task(self, future):
+        then = self._callbacks.pop(future, None)
+        if then is not None:
+            then(future)
+        elif future.exception() is not None:
+            print(f"Warning: Background task failed: {future.exception()}")
+
+    def close(self):
+        """Wait for running background tasks and stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for future in list(self._callbacks):
+            self._finish_task(future)
@@ -0,0 +1,451 @@
+"""
+Headless Pong simulation with a fixed-timestep physics core.
+
+The simulation has no dependency on Pygame or the camera. ``PongSimulation``
+owns a ``PongState`` and advances it in fixed ticks of ``1 / Config.FPS``
+seconds; ``step(dt, player_input)`` feeds real frame time into an accumulator,
+runs as many ticks as fit and keeps the previous state around so renderers
+can interpolate between the last two ticks.
+
+All speeds are expressed in pixels per tick, matching the original
+frame-locked game where one frame was one physics update.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import random
+
+import numpy as np
+
+from pong_ai import create_opponent
+from pong_collision import overlaps, sweep_aabb, sweep_bounds
+
+
+# Event names returned by PongSimulation.tick()
+EVENT_WALL_BOUNCE = "wall_bounce"
+EVENT_PADDLE_HIT = "paddle_hit"
+EVENT_PLAYER_SCORED = "player_scored"
+EVENT_OPPONENT_SCORED = "opponent_scored"
+
+# Longest frame time fed into the accumulator; prevents a spiral of death
+# after long hitches (window drag, breakpoint, ...)
+MAX_FRAME_TIME = 0.25
+
+# Upper bound on contacts resolved within one swept tick
+MAX_SWEEP_CONTACTS = 4
+
+
+class TrailBuffer:
+    """
+    Ring buffer of the latest ball centers for the trail.
+
+    Pushing and copying cost the same for a five-point trail as for one with
+    hundreds of points, and ``newest`` hands renderers one NumPy array.
+    """
+
+    __slots__ = ("_points", "_head")
+
+    def __init__(self, capacity):
+        """
+        Args:
+            capacity (int): Points kept
+        """
+        self._points = np.zeros((capacity, 2))
+        self._head = 0  # Row of the newest point; older points follow it, wrapping around
+
+    def __len__(self):
+        return len(self._points)
+
+    def __iter__(self):
+        return iter(map(tuple, self.newest().tolist()))
+
+    def fill(self, x, y):
+        """
+        Set every point to one position.
+
+        Args:
+            x (float): Center x
+            y (float): Center y
+        """
+        self._points[:] = (x, y)
+        self._head = 0
+
+    def push(self, x, y):
+        """
+        Add the newest point, dropping the oldest.
+
+        Args:
+            x (float): Center x
+            y (float): Center y
+        """
+        capacity = len(self._points)
+        if capacity:
+            self._head = (self._head - 1) % capacity
+            self._points[self._head, 0] = x
+            self._points[self._head, 1] = y
+
+    def newest(self, count=None):
+        """
+        The latest points, newest first.
+
+        Args:
+            count (int): Points to return, or None for all of them
+
+        Returns:
+            numpy.ndarray: ``(count, 2)`` centers; a view into the buffer when
+            the points do not wrap around, so use it before the next ``push``
+        """
+        points = self._points
+        count = len(points) if count is None else min(count, len(points))
+        end = self._head + count
+        if end <= len(points):
+            return points[self._head:end]
+        return np.concatenate((points[self._head:], points[:end - len(points)]))
+
+    def copy(self):
+        """
+        Returns:
+            TrailBuffer: An independent copy
+        """
+        other = TrailBuffer.__new__(TrailBuffer)
+        other._points = self._points.copy()
+        other._head = self._head
+        return other
+
+
+class PongState:
+    """Complete, copyable state of one match. Positions are object centers."""
+
+    __slots__ = (
+        "ball_x", "ball_y", "ball_speed_x", "ball_speed_y",
+        "player_y", "opponent_y",
+        "player_score", "opponent_score",
+        "trail", "tick_count",
+    )
+
+    def __init__(self):
+        self.ball_x = 0.0
+        self.ball_y = 0.0
+        self.ball_speed_x = 0.0
+        self.ball_speed_y = 0.0
+        self.player_y = 0.0
+        self.opponent_y = 0.0
+        self.player_score = 0
+        self.opponent_score = 0
+        self.trail = TrailBuffer(0)  # Previous ball centers
+        self.tick_count = 0
+
+    def copy(self):
+        """
+        Return an independent copy of this state.
+
+        Returns:
+            PongState: The copy
+        """
+        other = PongState.__new__(PongState)
+        for name in PongState.__slots__:
+            setattr(other, name, getattr(self, name))
+        other.trail = self.trail.copy()
+        return other
+
+
+def _lerp(a, b, alpha):
+    return a + (b - a) * alpha
+
+
+class PongSimulation:
+    """
+    Display-free Pong rules engine.
+
+    Args:
+        width (int): Playfield width in pixels
+        height (int): Playfield height in pixels
+        config: Object exposing the ``Config`` game/ball/paddle attributes
+        rng (random.Random): Random source; a fresh unseeded one if omitted
+        two_player (bool): Right paddle follows ``opponent_input`` instead of
+            the computer; defaults to ``config.TWO_PLAYER``
+    """
+
+    def __init__(self, width, height, config, rng=None, two_player=None):
+        self.width = width
+        self.height = height
+        self.config = config
+        self.rng = rng if rng is not None else random.Random()
+
+        self.dt = 1.0 / config.FPS
+        self.accumulator = 0.0
+        self.winner = None  # "Player" or "Computer" once the match is decided
+
+        self.player_x = config.PADDLE_MARGIN
+        self.opponent_x = width - config.PADDLE_MARGIN - config.PADDLE_WIDTH
+        self.swept = config.SWEPT_COLLISIONS
+        self.speed_multiplier = config.BALL_SPEED_MULTIPLIER
+        # Per-tick smoothing of player input; 1.0 when the input is already filtered
+        self.input_smoothing = config.SMOOTHING_FACTOR
+        # Computer opponent; None when a second player drives the right paddle
+        self.opponent = None
+        # (paddle, offset) of the latest paddle contact: paddle is "player" or
+        # "opponent", offset the ball's distance from the paddle center in
+        # half paddle heights (-1 top edge .. 1 bottom edge)
+        self.last_hit = None
+        if not (config.TWO_PLAYER if two_player is None else two_player):
+            self.opponent = create_opponent(self, config.OPPONENT_AI, config.OPPONENT_DIFFICULTY)
+
+        self.state = PongState()
+        self.previous = self.state
+        self.reset_game()
+
+    # -------------------------------------------------------------------------
+    # Resetting
+    # -------------------------------------------------------------------------
+
+    def reset_game(self):
+        """Reset scores, speeds, and object positions for a new game."""
+        config = self.config
+        state = self.state
+        state.player_score = 0
+        state.opponent_score = 0
+        state.player_y = self.height / 2
+        state.opponent_y = self.height / 2
+        state.ball_x = self.width / 2
+        state.ball_y = self.height / 2
+        state.trail = TrailBuffer(config.TRAIL_COUNT)
+        state.trail.fill(state.ball_x, state.ball_y)
+        state.tick_count = 0
+
+        initial_speed = self.rng.randint(config.BALL_INITIAL_SPEED_MIN,
+                                         config.BALL_INITIAL_SPEED_MAX)
+        state.ball_speed_x = initial_speed * self.rng.choice([1, -1])
+        state.ball_speed_y = initial_speed * self.rng.choice([1, -1])
+
+        self.winner = None
+        self.accumulator = 0.0
+        self.previous = state.copy()
+        if self.opponent is not None:
+            self.opponent.reset()
+
+    def reset_ball(self):
+        """Center the ball after a point and flip its direction."""
+        state = self.state
+        state.ball_x = self.width / 2
+        state.ball_y = self.height / 2
+        state.ball_speed_x *= -1
+        state.ball_speed_y *= self.rng.choice([1, -1])
+
+    # -------------------------------------------------------------------------
+    # Stepping
+    # -------------------------------------------------------------------------
+
+    def step(self, dt, player_input=None, opponent_input=None):
+        """
+        Advance the simulation by real elapsed time using fixed ticks.
+
+        Args:
+            dt (float): Elapsed wall-clock time in seconds
+            player_input (float): Target paddle center y, or None for no input
+            opponent_input (float): Target right paddle center y in two-player
+                games, or None for no input
+
+        Returns:
+            list: Events produced by all ticks run during this call
+        """
+        self.accumulator += min(dt, MAX_FRAME_TIME)
+        events = []
+        while self.accumulator >= self.dt and self.winner is None:
+            self.accumulator -= self.dt
+            self.previous = self.state.copy()
+            events.extend(self.tick(player_input, opponent_input))
+        return events
+
+    @property
+    def alpha(self):
+        """float: Fraction of a tick left in the accumulator (0..1)."""
+        return min(1.0, self.accumulator / self.dt)
+
+    def tick(self, player_input=None, opponent_input=None):
+        """
+        Run exactly one fixed physics update.
+
+        Args:
+            player_input (float): Target paddle center y, or None for no input
+            opponent_input (float): Target right paddle center y; only used
+                when there is no computer opponent
+
+        Returns:
+            list: Events produced by this tick
+        """
+        config = self.config
+        state = self.state
+        events = []
+        half_ball = config.BALL_SIZE / 2
+        half_paddle = config.PADDLE_HEIGHT / 2
+
+        # Player control
+        if player_input is not None:
+            state.player_y += (player_input - state.player_y) * self.input_smoothing
+
+        # Opponent: computer AI or second player
+        if self.opponent is not None:
+            self.opponent.update(state)
+        elif opponent_input is not None:
+            state.opponent_y += (opponent_input - state.opponent_y) * self.input_smoothing
+
+        # Trail follows the ball
+        if config.TRAIL_COUNT:
+            state.trail.push(state.ball_x, state.ball_y)
+
+        # Move ball and resolve collisions
+        if self.swept:
+            events.extend(self._move_ball_swept())
+        else:
+            events.extend(self._move_ball_discrete())
+
+        # Scoring & win condition
+        if state.ball_x - half_ball <= 0:
+            state.opponent_score += 1
+            events.append(EVENT_OPPONENT_SCORED)
+            if state.opponent_score >= config.WINNING_SCORE:
+                self.winner = "Computer"
+            else:
+                self._score_reset()
+        if self.winner is None and state.ball_x + half_ball >= self.width:
+            state.player_score += 1
+            events.append(EVENT_PLAYER_SCORED)
+            if state.player_score >= config.WINNING_SCORE:
+                self.winner = "Player"
+            else:
+                self._score_reset()
+
+        # Paddle bounds
+        state.player_y = min(max(state.player_y, half_paddle), self.height - half_paddle)
+        state.opponent_y = min(max(state.opponent_y, half_paddle), self.height - half_paddle)
+
+        state.tick_count += 1
+        return events
+
+    def _move_ball_discrete(self):
+        """Move a full step, then test for overlaps (the original behavior)."""
+        state = self.state
+        half_ball = self.config.BALL_SIZE / 2
+        events = []
+
+        state.ball_x += state.ball_speed_x * self.speed_multiplier
+        state.ball_y += state.ball_speed_y * self.speed_multiplier
+
+        # Collisions: walls
+        if state.ball_y - half_ball <= 0 or state.ball_y + half_ball >= self.height:
+            state.ball_speed_y *= -1
+            events.append(EVENT_WALL_BOUNCE)
+
+        # Collisions: paddles
+        ball_box = self._ball_box()
+        if overlaps(ball_box, self._paddle_box(self.player_x, state.player_y)) or \
+                overlaps(ball_box, self._paddle_box(self.opponent_x, state.opponent_y)):
+            self._paddle_bounce()
+            events.append(EVENT_PADDLE_HIT)
+        return events
+
+    def _move_ball_swept(self):
+        """Move the ball through the tick, resolving each contact at its exact time."""
+        state = self.state
+        half_ball = self.config.BALL_SIZE / 2
+        # Each paddle only deflects a ball travelling toward its own goal
+        paddles = ((self._paddle_box(self.player_x, state.player_y), -1),
+                   (self._paddle_box(self.opponent_x, state.opponent_y), 1))
+        events = []
+        remaining = 1.0
+
+        for _ in range(MAX_SWEEP_CONTACTS):
+            dx = state.ball_speed_x * self.speed_multiplier * remaining
+            dy = state.ball_speed_y * self.speed_multiplier * remaining
+
+            contact_time = sweep_bounds(state.ball_y, dy, half_ball, self.height - half_ball)
+            paddle_contact = False
+            for paddle, goal_side in paddles:
+                if dx * goal_side <= 0:
+                    continue
+                hit = sweep_aabb(self._ball_box(), (dx, dy), paddle)
+                if hit is not None and (contact_time is None or hit[0] < contact_time):
+                    contact_time, paddle_contact = hit[0], True
+
+            if contact_time is None:
+                state.ball_x += dx
+                state.ball_y += dy
+                return events
+
+            state.ball_x += dx * contact_time
+            state.ball_y += dy * contact_time
+            remaining *= 1.0 - contact_time
+
+            if paddle_contact:
+                self._paddle_bounce()
+                events.append(EVENT_PADDLE_HIT)
+            else:
+                state.ball_speed_y *= -1
+                events.append(EVENT_WALL_BOUNCE)
+
+        # Out of contact budget (ball pinched between a wall and a paddle edge):
+        # drop the rest of the step rather than move without collision tests
+        return events
+
+    def _paddle_bounce(self):
+        """Reverse the ball and randomize its speed after a paddle hit."""
+        config = self.config
+        state = self.state
+        if state.ball_speed_x < 0:
+            paddle, paddle_y = "player", state.player_y
+        else:
+            paddle, paddle_y = "opponent", state.opponent_y
+        self.last_hit = (paddle, (state.ball_y - paddle_y) / (config.PADDLE_HEIGHT / 2))
+        state.ball_speed_x *= -1
+        new_speed_x = self.rng.randint(config.BALL_COLLISION_SPEED_MIN,
+                                       config.BALL_COLLISION_SPEED_MAX)
+        sign_x = 1 if state.ball_speed_x > 0 else -1
+        state.ball_speed_x = new_speed_x * sign_x
+        state.ball_speed_y += self.rng.uniform(-3, 3)
+
+        if abs(state.ball_speed_y) < config.BALL_MIN_VERTICAL_SPEED:
+            sign_y = 1 if state.ball_speed_y >= 0 else -1
+            state.ball_speed_y = config.BALL_MIN_VERTICAL_SPEED * sign_y
+
+    def _ball_box(self):
+        size = self.config.BALL_SIZE
+        return (self.state.ball_x - size / 2, self.state.ball_y - size / 2, size, size)
+
+    def _paddle_box(self, paddle_x, paddle_y):
+        config = self.config
+        return (paddle_x, paddle_y - config.PADDLE_HEIGHT / 2,
+                config.PADDLE_WIDTH, config.PADDLE_HEIGHT)
+
+    def _score_reset(self):
+        self.reset_ball()
+        # The ball teleports to the center; don't interpolate across the jump
+        self.previous.ball_x = self.state.ball_x
+        self.previous.ball_y = self.state.ball_y
+
+    # -------------------------------------------------------------------------
+    # Rendering support
+    # -------------------------------------------------------------------------
+
+    def interpolate(self, alpha=None):
+        """
+        Blend the last two ticks for smooth rendering between updates.
+
+        Args:
+            alpha (float): Blend factor; defaults to the accumulator remainder
+
+        Returns:
+            PongState: A new state positioned between the previous and current tick
+        """
+        if alpha is None:
+            alpha = self.alpha
+        prev = self.previous
+        cur = self.state
+        view = cur.copy()
+        view.ball_x = _lerp(prev.ball_x, cur.ball_x, alpha)
+        view.ball_y = _lerp(prev.ball_y, cur.ball_y, alpha)
+        view.player_y = _lerp(prev.player_y, cur.player_y, alpha)
+        view.opponent_y = _lerp(prev.opponent_y, cur.opponent_y, alpha)
+        return view
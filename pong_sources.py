@@ -0,0 +1,504 @@
+"""
+Frame sources, recorded sessions and session recording.
+
+Every frame source mimics the small part of ``cv2.VideoCapture`` the game
+uses (``read``, ``isOpened``, ``release``, ``set``, ``get``), so a live
+camera, a video file or a directory of images can feed the tracking
+pipeline interchangeably. ``RecordedHands`` stands in for the MediaPipe
+``Hands`` object and replays landmarks saved by ``SessionRecorder``, which
+makes the whole game pipeline reproducible without a camera or a model.
+
+A recorded session is two files sharing a base name:
+
+* ``<name>.avi`` - the raw (unmirrored) camera frames, MJPG encoded
+* ``<name>.npz`` - per-frame timestamps and landmarks, shaped
+  ``(frames, MAX_HANDS, 21, 3)`` with NaN for absent hands
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import glob
+import os
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+
+NUM_LANDMARKS = 21
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+# =============================================================================
+# FRAME SOURCES
+# =============================================================================
+
+class VideoFileSource:
+    """Frames from a video file, optionally looped and paced to its frame rate."""
+
+    def __init__(self, path, loop=False, realtime=False):
+        """
+        Args:
+            path (str): Video file to read
+            loop (bool): Restart from the first frame at the end of the file
+            realtime (bool): Deliver frames no faster than the file's frame rate
+        """
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self._capture = cv2.VideoCapture(path)
+        fps = self._capture.get(cv2.CAP_PROP_FPS) if self._capture.isOpened() else 0
+        self._interval = 1.0 / fps if fps and fps > 0 else 1.0 / 30
+        self._next_time = None
+
+    def read(self):
+        """
+        Returns:
+            tuple: (success, frame) like ``cv2.VideoCapture.read``
+        """
+        if self.realtime:
+            now = time.perf_counter()
+            if self._next_time is not None and now < self._next_time:
+                time.sleep(self._next_time - now)
+            self._next_time = max(now, self._next_time or now) + self._interval
+
+        success, frame = self._capture.read()
+        if not success and self.loop:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self._capture.read()
+        return success, frame
+
+    def isOpened(self):
+        return self._capture.isOpened()
+
+    def release(self):
+        self._capture.release()
+
+    def set(self, prop, value):
+        # Resolution and frame rate are fixed by the file
+        return False
+
+    def get(self, prop):
+        return self._capture.get(prop)
+
+
+class ImageSequenceSource:
+    """Frames from a directory (or glob pattern) of still images, in name order."""
+
+    def __init__(self, pattern, loop=False, preload=True):
+        """
+        Args:
+            pattern (str): Directory of images, or a glob pattern
+            loop (bool): Restart at the first image after the last one
+            preload (bool): Decode every image up front so reads cost nothing
+        """
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                     if name.lower().endswith(IMAGE_EXTENSIONS)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(paths)
+        self.loop = loop
+        self._frames = [cv2.imread(path) for path in self.paths] if preload else None
+        self._index = 0
+
+    def read(self):
+        """
+        Returns:
+            tuple: (success, frame) like ``cv2.VideoCapture.read``
+        """
+        if self._index >= len(self.paths):
+            if not self.loop or not self.paths:
+                return False, None
+            self._index = 0
+        index = self._index
+        self._index += 1
+        frame = self._frames[index] if self._frames is not None else cv2.imread(self.paths[index])
+        return frame is not None, frame
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def release(self):
+        self._frames = None
+        self.paths = []
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.paths))
+        return 0.0
+
+
+class BlankFrameSource:
+    """A fixed number of black frames; pairs with ``RecordedHands`` when no video exists."""
+
+    def __init__(self, count, width=640, height=480):
+        """
+        Args:
+            count (int): Number of frames to deliver
+            width (int): Frame width
+            height (int): Frame height
+        """
+        self.count = count
+        self._frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self._index = 0
+
+    def read(self):
+        if self._index >= self.count:
+            return False, None
+        self._index += 1
+        return True, self._frame
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        self._index = self.count
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        return 0.0
+
+
+def is_camera(spec):
+    """
+    Whether a source spec names a camera index rather than a file.
+
+    Args:
+        spec (int or str): Frame source spec
+
+    Returns:
+        bool: True for a camera index (also as a digit string)
+    """
+    return isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit())
+
+
+def open_frame_source(spec, loop=False, realtime=False, backend=cv2.CAP_ANY):
+    """
+    Open a camera index, video file or image directory.
+
+    Args:
+        spec (int or str): Camera index (also as a digit string), video path,
+            image directory or image glob pattern
+        loop (bool): Loop file-based sources
+        realtime (bool): Pace video files to their recorded frame rate
+        backend (int): OpenCV capture API (``cv2.CAP_*``) used for cameras
+
+    Returns:
+        object: A ``cv2.VideoCapture``-like frame source
+    """
+    if is_camera(spec):
+        return cv2.VideoCapture(int(spec), backend)
+    if os.path.isdir(spec) or any(ch in spec for ch in "*?["):
+        return ImageSequenceSource(spec, loop=loop)
+    return VideoFileSource(spec, loop=loop, realtime=realtime)
+
+
+def fourcc_text(code):
+    """
+    Four-character pixel format name of a ``CAP_PROP_FOURCC`` value.
+
+    Args:
+        code (float): Value reported by the source
+
+    Returns:
+        str: e.g. ``"MJPG"``, or ``""`` if the source reports none
+    """
+    code = int(code)
+    text = "".join(chr((code >> shift) & 0xFF) for shift in (0, 8, 16, 24))
+    return text if code > 0 and text.isprintable() else ""
+
+
+def capture_format(source):
+    """
+    Format a frame source actually delivers.
+
+    Args:
+        source: ``cv2.VideoCapture``-like frame source
+
+    Returns:
+        dict: ``width``, ``height``, ``fps``, ``fourcc`` and ``buffer_size``
+        (0 where the source does not report a value)
+    """
+    return {
+        "width": int(source.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(source.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": round(source.get(cv2.CAP_PROP_FPS), 2),
+        "fourcc": fourcc_text(source.get(cv2.CAP_PROP_FOURCC)),
+        "buffer_size": max(0, int(source.get(cv2.CAP_PROP_BUFFERSIZE))),
+    }
+
+
+def configure_capture(source, config):
+    """
+    Negotiate pixel format, resolution, frame rate and buffering with a frame source.
+
+    The pixel format goes first: many cameras (V4L2 in particular) only offer
+    their higher resolutions and frame rates as compressed MJPG. Sources that
+    cannot change these (files, image directories) ignore the request.
+
+    Args:
+        source: ``cv2.VideoCapture``-like frame source
+        config: Object exposing ``CAMERA_FOURCC``, ``CAMERA_WIDTH``,
+            ``CAMERA_HEIGHT``, ``CAMERA_FPS`` and ``CAMERA_BUFFER_SIZE``
+
+    Returns:
+        dict: The format the source settled on (see ``capture_format``)
+    """
+    if config.CAMERA_FOURCC:
+        source.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*config.CAMERA_FOURCC))
+    source.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
+    source.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
+    source.set(cv2.CAP_PROP_FPS, config.CAMERA_FPS)
+    if config.CAMERA_BUFFER_SIZE:
+        # Fewer queued buffers means the next read returns a fresher frame
+        source.set(cv2.CAP_PROP_BUFFERSIZE, config.CAMERA_BUFFER_SIZE)
+    return capture_format(source)
+
+
+# =============================================================================
+# RECORDED LANDMARKS
+# =============================================================================
+
+class _Landmark:
+    """Minimal stand-in for a MediaPipe NormalizedLandmark."""
+
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def HasField(self, name):
+        return False
+
+
+class _LandmarkList:
+    """Minimal stand-in for a MediaPipe NormalizedLandmarkList."""
+
+    __slots__ = ("landmark",)
+
+    def __init__(self, points):
+        self.landmark = [_Landmark(float(x), float(y), float(z)) for x, y, z in points]
+
+
+def synthetic_session(frames, fps=30, period=3.0, frame_size=(640, 480), hands=1):
+    """
+    Session of hands raising and lowering their index fingers periodically.
+
+    Args:
+        frames (int): Number of frames
+        fps (float): Simulated capture rate
+        period (float): Seconds per up-and-down cycle
+        frame_size (tuple): (width, height) of the frames
+        hands (int): 1 for a centered hand, 2 for one hand on each side
+            moving in opposite phase
+
+    Returns:
+        RecordedSession: In-memory session
+    """
+    timestamps = np.arange(frames) / fps
+    landmarks = np.full((frames, hands, NUM_LANDMARKS, 3), 0.5, dtype=np.float32)
+    landmarks[:, :, :, 2] = 0.0
+    for hand in range(hands):
+        phase = 0.5 + 0.5 * np.sin(2 * np.pi * timestamps / period + np.pi * hand)
+        if hands > 1:
+            landmarks[:, hand, :, 0] = 0.25 + 0.5 * hand
+        landmarks[:, hand, 0, 1] = 0.8  # Wrist
+        landmarks[:, hand, 8, 1] = 0.8 - 0.2 * phase  # Index fingertip
+    return RecordedSession.from_arrays(timestamps, landmarks, frame_size)
+
+
+def landmarks_to_array(hand_landmarks, max_hands):
+    """
+    Pack MediaPipe landmark lists into a fixed-size array.
+
+    Args:
+        hand_landmarks (list): Landmark lists for the detected hands
+        max_hands (int): Number of hand slots in the array
+
+    Returns:
+        numpy.ndarray: ``(max_hands, 21, 3)`` float32 array, NaN for missing hands
+    """
+    packed = np.full((max_hands, NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+    for slot, landmarks in enumerate(hand_landmarks[:max_hands]):
+        packed[slot] = [(point.x, point.y, point.z) for point in landmarks.landmark]
+    return packed
+
+
+def array_to_landmarks(packed):
+    """
+    Inverse of ``landmarks_to_array``.
+
+    Args:
+        packed (numpy.ndarray): ``(hands, 21, 3)`` array
+
+    Returns:
+        list: Landmark lists for every slot that holds a hand
+    """
+    return [_LandmarkList(hand) for hand in packed if not np.isnan(hand[0, 0])]
+
+
+class RecordedSession:
+    """Landmarks and timestamps of a recorded session, loaded from ``<name>.npz``."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Session base name, or the ``.npz`` / ``.avi`` file itself
+        """
+        self.base = os.path.splitext(path)[0]
+        with np.load(self.base + ".npz") as data:
+            self.timestamps = data["timestamps"]
+            self.landmarks = data["landmarks"]
+            self.frame_size = tuple(int(v) for v in data["frame_size"])
+
+    @classmethod
+    def from_arrays(cls, timestamps, landmarks, frame_size=(640, 480)):
+        """
+        Build an in-memory session (no files).
+
+        Args:
+            timestamps (numpy.ndarray): Capture time per frame
+            landmarks (numpy.ndarray): ``(frames, hands, 21, 3)`` landmarks
+            frame_size (tuple): (width, height) of the frames
+
+        Returns:
+            RecordedSession: The session
+        """
+        session = cls.__new__(cls)
+        session.base = None
+        session.timestamps = np.asarray(timestamps, dtype=np.float64)
+        session.landmarks = np.asarray(landmarks, dtype=np.float32)
+        session.frame_size = tuple(frame_size)
+        return session
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def video_path(self):
+        """str: The session's video file, or None if it was not recorded."""
+        if self.base is None:
+            return None
+        path = self.base + ".avi"
+        return path if os.path.exists(path) else None
+
+    def frame_source(self):
+        """
+        Frame source for the session: its video, or blank frames if there is none.
+
+        Returns:
+            object: A ``cv2.VideoCapture``-like frame source
+        """
+        if self.video_path:
+            return VideoFileSource(self.video_path)
+        width, height = self.frame_size
+        return BlankFrameSource(len(self), width, height)
+
+
+class RecordedHands:
+    """
+    Drop-in replacement for MediaPipe ``Hands`` that replays a recorded session.
+
+    Each ``process`` call returns the next recorded frame's landmarks, so it
+    must be called exactly once per frame (use it without a ``HandRegion``).
+    """
+
+    def __init__(self, session, loop=False):
+        """
+        Args:
+            session (RecordedSession): Session to replay
+            loop (bool): Start over after the last frame
+        """
+        self.session = session
+        self.loop = loop
+        self._index = 0
+
+    def process(self, image):
+        """
+        Args:
+            image (numpy.ndarray): Ignored; present for API compatibility
+
+        Returns:
+            object: Result with a ``multi_hand_landmarks`` attribute
+        """
+        if self._index >= len(self.session):
+            if not self.loop:
+                return SimpleNamespace(multi_hand_landmarks=None)
+            self._index = 0
+        hands = array_to_landmarks(self.session.landmarks[self._index])
+        self._index += 1
+        return SimpleNamespace(multi_hand_landmarks=hands or None)
+
+    def close(self):
+        self._index = len(self.session)
+
+
+# =============================================================================
+# RECORDING
+# =============================================================================
+
+class SessionRecorder:
+    """Records raw camera frames and detected landmarks of a live session."""
+
+    def __init__(self, path, max_hands=2, fps=30, record_video=True):
+        """
+        Args:
+            path (str): Session base name (``.avi``/``.npz`` are appended)
+            max_hands (int): Hand slots stored per frame
+            fps (int): Frame rate written into the video header
+            record_video (bool): Also store the frames, not only landmarks
+        """
+        self.base = os.path.splitext(path)[0]
+        self.max_hands = max_hands
+        self.fps = fps
+        self.record_video = record_video
+        self._writer = None
+        self._timestamps = []
+        self._landmarks = []
+        self._frame_size = (0, 0)
+
+    def record(self, frame, hand_landmarks, timestamp):
+        """
+        Store one frame.
+
+        Args:
+            frame (numpy.ndarray): Raw BGR frame as read from the camera
+            hand_landmarks (list): Landmarks detected in the frame
+            timestamp (float): Capture time (``time.perf_counter()``)
+        """
+        height, width = frame.shape[:2]
+        self._frame_size = (width, height)
+        if self.record_video:
+            if self._writer is None:
+                fourcc = cv2.VideoWriter_fourcc(*"MJPG")
+                self._writer = cv2.VideoWriter(self.base + ".avi", fourcc, self.fps,
+                                               (width, height))
+            self._writer.write(frame)
+        self._timestamps.append(timestamp)
+        self._landmarks.append(landmarks_to_array(hand_landmarks, self.max_hands))
+
+    def close(self):
+        """Finish the video and write the landmark file."""
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+        if not self._timestamps:
+            return
+        np.savez_compressed(
+            self.base + ".npz",
+            timestamps=np.asarray(self._timestamps, dtype=np.float64),
+            landmarks=np.stack(self._landmarks),
+            frame_size=np.asarray(self._frame_size, dtype=np.int32),
+        )
+        print(f"Recorded {len(self._timestamps)} frames to {self.base}.npz")
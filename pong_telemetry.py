@@ -0,0 +1,501 @@
+"""
+Match telemetry: per-frame samples and game events in compact binary files.
+
+Each game is stored as three files sharing a base name:
+
+- ``<base>.json``: metadata (start time, settings, winner, record layouts)
+- ``<base>.frames``: one ``FRAME_DTYPE`` record per rendered frame
+- ``<base>.events``: one ``EVENT_DTYPE`` record per game event
+
+The record files are plain arrays of fixed-size little-endian records,
+appended in chunks, so they can be opened with ``numpy.memmap`` without
+parsing and a crash loses at most the last unwritten chunk. The game thread
+only copies a tuple into a preallocated NumPy chunk; full chunks are written
+by a background thread.
+
+Run ``python pong_telemetry.py telemetry/`` to summarize every recorded game:
+rally lengths, where the ball meets the paddle, reaction times, tracking
+dropouts and frame timing.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import argparse
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from pong_simulation import EVENT_OPPONENT_SCORED, EVENT_PADDLE_HIT, EVENT_PLAYER_SCORED
+
+
+FORMAT_VERSION = 1
+
+# Per-frame samples. Times are seconds since the game started; missing values are NaN.
+#   target_y:          paddle target from the player's hand
+#   tracking_latency:  age of the hand result used this frame (capture to use)
+#   hands:             hands in the newest tracking result
+#   quality:           quality governor level (0 = full quality)
+FRAME_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("dt", "<f4"),
+    ("work", "<f4"),
+    ("ball_x", "<f4"),
+    ("ball_y", "<f4"),
+    ("player_y", "<f4"),
+    ("opponent_y", "<f4"),
+    ("target_y", "<f4"),
+    ("tracking_latency", "<f4"),
+    ("hands", "u1"),
+    ("quality", "u1"),
+])
+
+# Game events.
+#   kind:  index into EVENT_KINDS
+#   side:  0 player (left), 1 opponent (right), -1 neither
+#   value: hit offset on the paddle (-1 top .. 1 bottom), quality level, or NaN
+EVENT_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("kind", "u1"),
+    ("side", "i1"),
+    ("value", "<f4"),
+])
+
+EVENT_KINDS = (
+    "paddle_hit", "wall_bounce", "player_scored", "opponent_scored",
+    "tracking_lost", "tracking_found", "pause", "resume", "quality",
+)
+EVENT_CODES = {kind: code for code, kind in enumerate(EVENT_KINDS)}
+
+# Paddle movement (pixels) that counts as the player reacting to a return
+REACTION_DISTANCE = 20.0
+
+
+# =============================================================================
+# RECORDING
+# =============================================================================
+
+class _ChunkedStream:
+    """Fixed-dtype records collected in chunks and handed to the writer thread."""
+
+    def __init__(self, path, dtype, chunk_size, pending):
+        self.file = open(path, "wb")
+        self.dtype = dtype
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._pending = pending
+        self._chunk = np.empty(chunk_size, dtype=dtype)
+        self._used = 0
+
+    def append(self, record):
+        self._chunk[self._used] = record
+        self._used += 1
+        self.count += 1
+        if self._used == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._used:
+            self._pending.put((self.file, self._chunk[:self._used]))
+            self._chunk = np.empty(self.chunk_size, dtype=self.dtype)
+            self._used = 0
+
+
+class TelemetryRecorder:
+    """
+    Records one game's frames and events; files are written off the calling thread.
+
+    Args:
+        base (str): Path of the files without extension
+        metadata (dict): Extra values stored in the ``.json`` file
+        chunk_size (int): Records collected before a chunk is written
+    """
+
+    def __init__(self, base, metadata=None, chunk_size=1024):
+        directory = os.path.dirname(base)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.base = base
+        self.metadata = {
+            "version": FORMAT_VERSION,
+            "started": time.time(),
+            "frame_dtype": FRAME_DTYPE.descr,
+            "event_dtype": EVENT_DTYPE.descr,
+            "event_kinds": list(EVENT_KINDS),
+        }
+        self.metadata.update(metadata or {})
+        self._write_metadata()
+
+        self._start = time.perf_counter()
+        self._pending = queue.Queue()
+        self.frames = _ChunkedStream(base + ".frames", FRAME_DTYPE, chunk_size, self._pending)
+        self.events = _ChunkedStream(base + ".events", EVENT_DTYPE, chunk_size, self._pending)
+        self._writer = threading.Thread(target=self._write_chunks, name="TelemetryWriter",
+                                        daemon=True)
+        self._writer.start()
+
+    def _write_metadata(self):
+        tmp_path = self.base + ".json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.metadata, f, indent=2)
+        os.replace(tmp_path, self.base + ".json")
+
+    def _write_chunks(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            file, chunk = item
+            chunk.tofile(file)
+            file.flush()
+
+    def now(self):
+        """float: Seconds since the recorder was created."""
+        return time.perf_counter() - self._start
+
+    def frame(self, dt, work, state, target_y=None, tracking_latency=None, hands=0,
+              quality=0):
+        """
+        Record one rendered frame.
+
+        Args:
+            dt (float): Seconds since the previous frame
+            work (float): Busy part of the frame in seconds
+            state (PongState): Simulation state shown this frame
+            target_y (float): Player paddle target from the hand, or None
+            tracking_latency (float): Age of the hand result in seconds, or None
+            hands (int): Hands in the newest tracking result
+            quality (int): Quality governor level
+        """
+        self.frames.append((
+            self.now(), dt, work, state.ball_x, state.ball_y, state.player_y,
+            state.opponent_y,
+            np.nan if target_y is None else target_y,
+            np.nan if tracking_latency is None else tracking_latency,
+            hands, quality,
+        ))
+
+    def event(self, kind, side=-1, value=np.nan):
+        """
+        Record a game event.
+
+        Args:
+            kind (str): One of ``EVENT_KINDS``
+            side (int): 0 for the player, 1 for the opponent, -1 for neither
+            value (float): Event value (see ``EVENT_DTYPE``)
+        """
+        self.events.append((self.now(), EVENT_CODES[kind], side, value))
+
+    def simulation_events(self, events, simulation):
+        """
+        Record the events returned by a simulation step.
+
+        Args:
+            events (list): Event names from ``PongSimulation.step``
+            simulation (PongSimulation): The simulation (for the hit position)
+        """
+        for name in events:
+            if name == EVENT_PADDLE_HIT and simulation.last_hit is not None:
+                paddle, offset = simulation.last_hit
+                self.event(name, 0 if paddle == "player" else 1, offset)
+            elif name == EVENT_PLAYER_SCORED:
+                self.event(name, 0)
+            elif name == EVENT_OPPONENT_SCORED:
+                self.event(name, 1)
+            else:
+                self.event(name)
+
+    def close(self, **metadata):
+        """
+        Write the remaining records and finish the metadata file.
+
+        Args:
+            **metadata: Final values for the ``.json`` file, e.g. ``winner``
+        """
+        self.frames.flush()
+        self.events.flush()
+        self._pending.put(None)
+        self._writer.join()
+        self.frames.file.close()
+        self.events.file.close()
+        self.metadata.update(metadata)
+        self.metadata.update(duration=self.now(), frames=self.frames.count,
+                             events=self.events.count)
+        self._write_metadata()
+
+
+def recorder_for_game(directory, config):
+    """
+    Start recording a game into a new, time-stamped set of files.
+
+    Args:
+        directory (str): Folder holding the telemetry of all games
+        config: Object exposing the ``Config`` attributes stored with the game
+
+    Returns:
+        TelemetryRecorder: The recorder
+    """
+    name = time.strftime("game-%Y%m%d-%H%M%S")
+    base = os.path.join(directory, name)
+    suffix = 1
+    while os.path.exists(base + ".json"):
+        suffix += 1
+        base = os.path.join(directory, f"{name}-{suffix}")
+    return TelemetryRecorder(base, {
+        "fps": config.FPS,
+        "tracker": config.TRACKER_BACKEND,
+        "input_filter": config.INPUT_FILTER,
+        "opponent": config.OPPONENT_AI,
+        "difficulty": config.OPPONENT_DIFFICULTY,
+        "two_player": bool(config.TWO_PLAYER),
+        "net_role": config.NET_ROLE,
+    })
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+
+def _records(path, dtype):
+    """Memory-map a record file (ignoring a partly written last record)."""
+    count = os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+def load_session(base):
+    """
+    Open a recorded game without reading its records into memory.
+
+    Args:
+        base (str): Path without extension, or any of the game's files
+
+    Returns:
+        SimpleNamespace: ``meta`` dict, ``frames`` and ``events`` record arrays
+    """
+    for extension in (".json", ".frames", ".events"):
+        if base.endswith(extension):
+            base = base[:-len(extension)]
+    with open(base + ".json", "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported telemetry version {meta.get('version')!r} in {base}")
+    return SimpleNamespace(base=base, meta=meta,
+                           frames=_records(base + ".frames", FRAME_DTYPE),
+                           events=_records(base + ".events", EVENT_DTYPE))
+
+
+def find_sessions(paths):
+    """
+    Expand files, directories and glob patterns into game base names.
+
+    Args:
+        paths (list): Telemetry files, folders or patterns
+
+    Returns:
+        list: Sorted base names
+    """
+    bases = set()
+    for path in paths:
+        if os.path.isdir(path):
+            path = os.path.join(path, "*.json")
+        for match in glob.glob(path):
+            if match.endswith(".json"):
+                bases.add(match[:-len(".json")])
+    return sorted(bases)
+
+
+def rally_lengths(events):
+    """
+    Paddle hits in every finished rally.
+
+    Args:
+        events (numpy.ndarray): ``EVENT_DTYPE`` records of one game
+
+    Returns:
+        numpy.ndarray: Hits per rally
+    """
+    kinds = events["kind"]
+    points = (kinds == EVENT_CODES["player_scored"]) | (kinds == EVENT_CODES["opponent_scored"])
+    # Rally number of every event: points close the rally they end
+    rally = np.cumsum(points) - points
+    hits = rally[kinds == EVENT_CODES["paddle_hit"]]
+    return np.bincount(hits, minlength=int(points.sum()))[:int(points.sum())]
+
+
+def reaction_times(frames, events):
+    """
+    Time from each opponent return until the player's paddle starts moving.
+
+    Returns the player did not have to move for (no movement before the next
+    hit or point) are left out.
+
+    Args:
+        frames (numpy.ndarray): ``FRAME_DTYPE`` records of one game
+        events (numpy.ndarray): ``EVENT_DTYPE`` records of one game
+
+    Returns:
+        numpy.ndarray: Reaction times in seconds
+    """
+    kinds = events["kind"]
+    times = events["time"]
+    returns = times[(kinds == EVENT_CODES["paddle_hit"]) & (events["side"] == 1)]
+    ends = times[((kinds == EVENT_CODES["paddle_hit"]) & (events["side"] == 0)) |
+                 (kinds == EVENT_CODES["player_scored"]) |
+                 (kinds == EVENT_CODES["opponent_scored"])]
+    # Each return is answered (or lost) by the next player hit or point
+    end_times = np.append(ends, np.inf)[np.searchsorted(ends, returns, side="right")]
+    frame_times = frames["time"]
+    player_y = frames["player_y"]
+
+    reactions = []
+    starts = np.searchsorted(frame_times, returns)
+    stops = np.searchsorted(frame_times, end_times)
+    for start_time, start, stop in zip(returns, starts, stops):
+        moved = np.flatnonzero(np.abs(player_y[start:stop] - player_y[min(start, stop - 1)])
+                               > REACTION_DISTANCE) if start < stop else ()
+        if len(moved):
+            reactions.append(frame_times[start + moved[0]] - start_time)
+    return np.asarray(reactions, dtype=np.float64)
+
+
+def dropouts(events, duration):
+    """
+    Durations of the stretches without a tracked hand.
+
+    Args:
+        events (numpy.ndarray): ``EVENT_DTYPE`` records of one game
+        duration (float): Game length in seconds (closes a dropout left open)
+
+    Returns:
+        numpy.ndarray: Dropout durations in seconds
+    """
+    kinds = events["kind"]
+    lost = events["time"][kinds == EVENT_CODES["tracking_lost"]]
+    found = events["time"][kinds == EVENT_CODES["tracking_found"]]
+    # A dropout ends with the next "found" event, or with the game
+    ends = np.append(found, duration)[np.searchsorted(found, lost)]
+    return ends - lost
+
+
+def summarize(sessions):
+    """
+    Aggregate statistics over many recorded games.
+
+    Args:
+        sessions (list): Games from ``load_session``
+
+    Returns:
+        dict: Aggregated statistics
+    """
+    def percentiles(values, scale=1.0):
+        if len(values) == 0:
+            return {"count": 0}
+        values = np.asarray(values, dtype=np.float64) * scale
+        return {"count": int(len(values)), "mean": float(values.mean()),
+                "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)), "max": float(values.max())}
+
+    rallies, offsets, reactions, gaps, frame_times, latencies = [], [], [], [], [], []
+    winners = {}
+    play_time = 0.0
+    late_frames = total_frames = 0
+    for session in sessions:
+        meta, frames, events = session.meta, session.frames, session.events
+        duration = float(meta.get("duration", frames["time"][-1] if len(frames) else 0.0))
+        play_time += duration
+        winner = meta.get("winner", "unfinished")
+        winners[winner] = winners.get(winner, 0) + 1
+
+        rallies.append(rally_lengths(events))
+        hits = events[(events["kind"] == EVENT_CODES["paddle_hit"]) & (events["side"] == 0)]
+        offsets.append(hits["value"])
+        reactions.append(reaction_times(frames, events))
+        gaps.append(dropouts(events, duration))
+        frame_times.append(frames["dt"])
+        latency = frames["tracking_latency"]
+        latencies.append(latency[~np.isnan(latency)])
+        budget = 1.0 / meta.get("fps", 60)
+        late_frames += int(np.count_nonzero(frames["dt"] > budget * 1.5))
+        total_frames += len(frames)
+
+    def joined(parts):
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    offsets = joined(offsets)
+    offsets = offsets[~np.isnan(offsets)]
+    histogram, _ = np.histogram(np.clip(offsets, -1.0, 1.0), bins=5, range=(-1.0, 1.0))
+    gaps = joined(gaps)
+    return {
+        "games": len(sessions),
+        "play_minutes": play_time / 60.0,
+        "winners": winners,
+        "rally_hits": percentiles(joined(rallies)),
+        "hit_offsets": histogram.tolist(),
+        "reaction_ms": percentiles(joined(reactions), 1000.0),
+        "dropouts_per_minute": len(gaps) / (play_time / 60.0) if play_time else 0.0,
+        "dropout_ms": percentiles(gaps, 1000.0),
+        "tracking_latency_ms": percentiles(joined(latencies), 1000.0),
+        "frame_ms": percentiles(joined(frame_times), 1000.0),
+        "late_frame_share": late_frames / total_frames if total_frames else 0.0,
+    }
+
+
+def print_summary(summary):
+    """
+    Print ``summarize`` results as a readable report.
+
+    Args:
+        summary (dict): Aggregated statistics
+    """
+    print(f"{summary['games']} games, {summary['play_minutes']:.1f} minutes played")
+    print("Winners: " + ", ".join(f"{name} {count}"
+                                  for name, count in sorted(summary["winners"].items())))
+    for key, label in (("rally_hits", "Hits per rally"), ("reaction_ms", "Reaction (ms)"),
+                       ("dropout_ms", "Dropouts (ms)"),
+                       ("tracking_latency_ms", "Tracking latency (ms)"),
+                       ("frame_ms", "Frame time (ms)")):
+        values = summary[key]
+        if values["count"] == 0:
+            print(f"{label:<24}no data")
+            continue
+        print(f"{label:<24}n={values['count']:<8}mean {values['mean']:8.2f}   "
+              f"p50 {values['p50']:8.2f}   p95 {values['p95']:8.2f}   max {values['max']:8.2f}")
+    print(f"Dropouts per minute     {summary['dropouts_per_minute']:.2f}")
+    print(f"Late frames             {summary['late_frame_share']:.2%}")
+    print("Player hits along the paddle (top -> bottom): "
+          + " ".join(str(count) for count in summary["hit_offsets"]))
+
+
+def parse_args(argv=None):
+    """
+    Parse the telemetry summary command line.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Summarize recorded Pong telemetry.")
+    parser.add_argument("paths", nargs="+",
+                        help="telemetry folders, .json files or glob patterns")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    summary = summarize([load_session(base) for base in find_sessions(args.paths)])
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
@@ -0,0 +1,464 @@
+"""
+Interchangeable hand-tracking backends.
+
+Every backend implements the ``HandTracker`` interface, the same
+``process(rgb_image)`` call as MediaPipe's legacy ``Hands`` solution, so the
+tracking pipeline, the benchmark and the replayed sessions all drive them the
+same way:
+
+- ``"mediapipe"``: MediaPipe Hands (legacy solution API), synchronous
+- ``"mediapipe_tasks"``: MediaPipe Tasks ``HandLandmarker`` in ``LIVE_STREAM``
+  mode. Frames are submitted with ``detect_async`` and results arrive on
+  MediaPipe's own thread, so ``process`` returns immediately with the newest
+  completed result (usually one or two frames old). Needs the
+  ``hand_landmarker.task`` model file.
+- ``"color"``: skin-color segmentation and contour analysis with OpenCV only.
+  It finds the palm center and the highest point of the hand, which is all the
+  game needs, at a fraction of the CPU cost. It is sensitive to lighting and
+  skin-colored backgrounds and cannot recognize gestures.
+
+The backend is chosen with ``Config.TRACKER_BACKEND``. Run
+``python pong_trackers.py --video clip.mp4`` to compare the latency, CPU use
+and jitter of the backends on the same recorded footage.
+
+Author: ekagansahin
+Repository: https://github.com/ekagansahin/hand-controlled-pong
+License: MIT
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+
+TRACKERS = ("mediapipe", "mediapipe_tasks", "color")
+
+NUM_LANDMARKS = 21
+
+# Pairs of landmark indices drawn as the hand skeleton (same as MediaPipe's)
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+# Result of ``HandTracker.process``, shaped like MediaPipe's legacy results.
+#   multi_hand_landmarks: list of hands, each with a ``landmark`` list of 21 points
+#   multi_handedness:     per hand, ``classification[0].label`` is "Left"/"Right"
+TrackerOutput = namedtuple("TrackerOutput", ["multi_hand_landmarks", "multi_handedness"])
+
+_WRIST = 0
+_INDEX_TIP = 8
+
+
+def draw_hand(frame, hand_landmarks, color=(0, 255, 0)):
+    """
+    Draw a hand skeleton with OpenCV (for backends without MediaPipe drawing).
+
+    Args:
+        frame (numpy.ndarray): BGR image drawn on in place
+        hand_landmarks: Landmark list of a single hand
+        color (tuple): BGR line color
+    """
+    height, width = frame.shape[:2]
+    points = [(int(point.x * width), int(point.y * height))
+              for point in hand_landmarks.landmark]
+    for start, end in HAND_CONNECTIONS:
+        cv2.line(frame, points[start], points[end], color, 2)
+    for point in points:
+        cv2.circle(frame, point, 3, (0, 0, 255), -1)
+
+
+def _landmark_list(points):
+    """Landmark list with a mutable ``x``/``y``/``z`` object per point."""
+    return SimpleNamespace(
+        landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points]
+    )
+
+
+def _handedness(label):
+    """Handedness entry shaped like MediaPipe's ``ClassificationList``."""
+    return SimpleNamespace(classification=[SimpleNamespace(label=label)])
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class HandTracker:
+    """
+    Interface of the hand-tracking backends.
+
+    Attributes:
+        name (str): Backend name, one of ``TRACKERS``
+        supports_region (bool): Results belong to the image just passed in,
+            so inference can be cropped to a ``HandRegion``
+        full_landmarks (bool): All 21 landmarks are meaningful (gestures work)
+        mp_hands: ``mp.solutions.hands`` for MediaPipe drawing, or None
+        mp_drawing: ``mp.solutions.drawing_utils``, or None to draw with ``draw_hand``
+        lag (float): Seconds between the newest submitted image and the image
+            the last returned result belongs to (0 for synchronous backends)
+        fresh (bool): The last returned result had not been returned before
+            (always True for synchronous backends)
+    """
+
+    name = None
+    supports_region = True
+    full_landmarks = True
+    mp_hands = None
+    mp_drawing = None
+    lag = 0.0
+    fresh = True
+
+    def process(self, rgb_image):
+        """
+        Find hands in an image.
+
+        Args:
+            rgb_image (numpy.ndarray): RGB image
+
+        Returns:
+            TrackerOutput: Detected hands (or an object with the same attributes)
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release the backend's resources."""
+
+
+class MediaPipeHandsTracker(HandTracker):
+    """MediaPipe Hands through the legacy ``mp.solutions`` API."""
+
+    name = "mediapipe"
+
+    def __init__(self, config, max_hands=1):
+        """
+        Args:
+            config: Object exposing the ``Config`` tracking attributes
+            max_hands (int): Most hands reported per image
+        """
+        import mediapipe as mp  # Slow to import: only when this backend is used
+
+        self.mp_hands = mp.solutions.hands
+        self.mp_drawing = mp.solutions.drawing_utils
+        self.hands = self.mp_hands.Hands(
+            min_detection_confidence=config.MIN_DETECTION_CONFIDENCE,
+            min_tracking_confidence=config.MIN_TRACKING_CONFIDENCE,
+            max_num_hands=max_hands
+        )
+
+    def process(self, rgb_image):
+        return self.hands.process(rgb_image)
+
+    def close(self):
+        self.hands.close()
+
+
+class MediaPipeTasksTracker(HandTracker):
+    """
+    MediaPipe Tasks ``HandLandmarker`` running asynchronously in ``LIVE_STREAM`` mode.
+
+    Results are computed off the calling thread and may skip frames when
+    inference is slower than the frame rate, so they cannot be mapped back
+    through a crop window (``supports_region`` is False).
+    """
+
+    name = "mediapipe_tasks"
+    supports_region = False
+
+    def __init__(self, config, max_hands=1):
+        """
+        Args:
+            config: Object exposing the ``Config`` tracking attributes
+            max_hands (int): Most hands reported per image
+        """
+        import mediapipe as mp
+        from mediapipe.tasks import python as mp_tasks
+        from mediapipe.tasks.python import vision
+
+        self._mp = mp
+        self._lock = threading.Lock()
+        self._latest = TrackerOutput([], [])
+        self._latest_ms = None
+        self._returned_ms = None  # Image timestamp of the result returned last
+        self._last_ms = -1
+        options = vision.HandLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=config.TRACKER_MODEL_PATH),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=max_hands,
+            min_hand_detection_confidence=config.MIN_DETECTION_CONFIDENCE,
+            min_hand_presence_confidence=config.MIN_DETECTION_CONFIDENCE,
+            min_tracking_confidence=config.MIN_TRACKING_CONFIDENCE,
+            result_callback=self._on_result
+        )
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """Store a finished result (called on MediaPipe's thread)."""
+        hands = [_landmark_list((point.x, point.y, point.z) for point in hand)
+                 for hand in result.hand_landmarks]
+        labels = [_handedness(categories[0].category_name if categories else None)
+                  for categories in result.handedness]
+        with self._lock:
+            self._latest = TrackerOutput(hands, labels)
+            self._latest_ms = timestamp_ms
+
+    def process(self, rgb_image):
+        # Timestamps must strictly increase, even for images submitted within 1 ms
+        timestamp_ms = max(int(time.perf_counter() * 1000), self._last_ms + 1)
+        self._last_ms = timestamp_ms
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB,
+                               data=np.ascontiguousarray(rgb_image))
+        self.landmarker.detect_async(image, timestamp_ms)
+        with self._lock:
+            latest, latest_ms = self._latest, self._latest_ms
+        self.lag = (timestamp_ms - latest_ms) / 1000.0 if latest_ms is not None else 0.0
+        self.fresh = latest_ms is not None and latest_ms != self._returned_ms
+        self._returned_ms = latest_ms
+        return latest
+
+    def close(self):
+        self.landmarker.close()
+
+
+class ColorTracker(HandTracker):
+    """
+    Skin-color hand tracker built on OpenCV only.
+
+    Each hand is the largest skin-colored blob (YCrCb thresholds). The palm
+    center, the point deepest inside the blob, stands in for the wrist and the
+    blob's highest point for the index fingertip; the other landmarks are
+    placed on the palm center.
+    """
+
+    name = "color"
+    full_landmarks = False
+
+    def __init__(self, config, max_hands=1):
+        """
+        Args:
+            config: Object exposing the ``COLOR_TRACKER_*`` attributes
+            max_hands (int): Most hands reported per image
+        """
+        self.max_hands = max_hands
+        self.lower = np.array(config.COLOR_TRACKER_LOWER, dtype=np.uint8)
+        self.upper = np.array(config.COLOR_TRACKER_UPPER, dtype=np.uint8)
+        self.width = config.COLOR_TRACKER_WIDTH
+        self.min_area = config.COLOR_TRACKER_MIN_AREA
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+    def process(self, rgb_image):
+        # Segment a small copy: the game only needs coarse positions
+        height, width = rgb_image.shape[:2]
+        scale = min(1.0, self.width / width)
+        if scale < 1.0:
+            rgb_image = cv2.resize(rgb_image, None, fx=scale, fy=scale,
+                                   interpolation=cv2.INTER_AREA)
+            height, width = rgb_image.shape[:2]
+        ycrcb = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2YCrCb)
+        mask = cv2.inRange(ycrcb, self.lower, self.upper)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._kernel)
+
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        min_area = self.min_area * width * height
+        blobs = sorted((c for c in contours if cv2.contourArea(c) >= min_area),
+                       key=cv2.contourArea, reverse=True)[:self.max_hands]
+
+        hands = []
+        for contour in blobs:
+            x, y, w, h = cv2.boundingRect(contour)
+            blob = np.zeros((h, w), dtype=np.uint8)
+            cv2.drawContours(blob, [contour], -1, 255, -1, offset=(-x, -y))
+            _, _, _, (palm_x, palm_y) = cv2.minMaxLoc(
+                cv2.distanceTransform(blob, cv2.DIST_L2, 3)
+            )
+            top = contour[contour[:, 0, 1].argmin(), 0]
+
+            points = np.full((NUM_LANDMARKS, 3), 0.0)
+            points[:, 0] = (x + palm_x) / width
+            points[:, 1] = (y + palm_y) / height
+            points[_INDEX_TIP, :2] = (top[0] / width, top[1] / height)
+            hands.append(_landmark_list(points))
+        return TrackerOutput(hands, [_handedness(None) for _ in hands])
+
+
+def create_tracker(name, config, max_hands=1):
+    """
+    Build the hand-tracking backend selected by name.
+
+    Args:
+        name (str): One of ``TRACKERS``
+        config: Object exposing the ``Config`` tracking attributes
+        max_hands (int): Most hands reported per image
+
+    Returns:
+        HandTracker: The backend
+    """
+    if name == "mediapipe":
+        return MediaPipeHandsTracker(config, max_hands)
+    if name == "mediapipe_tasks":
+        return MediaPipeTasksTracker(config, max_hands)
+    if name == "color":
+        return ColorTracker(config, max_hands)
+    raise ValueError(f"Unknown tracker {name!r}; expected one of {', '.join(TRACKERS)}")
+
+
+# =============================================================================
+# COMPARISON
+# =============================================================================
+
+def measure_tracker(tracker, source, frames=None, reference=None):
+    """
+    Run a tracker over every frame of a source and measure it.
+
+    Jitter is the RMS second difference of the finger measure over
+    consecutive detections: hand motion is smooth at camera rates, so what
+    remains is mostly frame-to-frame noise of the tracker.
+
+    Args:
+        tracker (HandTracker): Backend to measure
+        source: ``cv2.VideoCapture``-like frame source
+        frames (int): Stop after this many frames, or None for all
+        reference (RecordedSession): Recorded landmarks to compare against, or None
+
+    Returns:
+        dict: Latency percentiles (ms), CPU use, detection rate, jitter,
+        result lag and, with a reference, the mean finger measure error
+    """
+    from pong_pipeline import finger_diff
+
+    latencies = []
+    lags = []
+    diffs = []
+    errors = []
+    count = detected = 0
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    while frames is None or count < frames:
+        success, frame = source.read()
+        if not success:
+            break
+        rgb_image = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+        start = time.perf_counter()
+        results = tracker.process(rgb_image)
+        latencies.append(time.perf_counter() - start)
+        lags.append(tracker.lag)
+
+        hands = results.multi_hand_landmarks or []
+        diff = finger_diff(hands[0]) if hands else np.nan
+        diffs.append(diff)
+        detected += bool(hands)
+        if reference is not None and count < len(reference) and hands:
+            expected = reference.landmarks[count, 0]
+            if not np.isnan(expected[0, 0]):
+                errors.append(abs(diff - (expected[_WRIST, 1] - expected[_INDEX_TIP, 1])))
+        count += 1
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    latencies = np.array(latencies) * 1000.0
+    signal = np.array(diffs, dtype=np.float64)
+    second = signal[2:] - 2 * signal[1:-1] + signal[:-2]
+    second = second[~np.isnan(second)]
+    return {
+        "frames": count,
+        "detection_rate": detected / count if count else 0.0,
+        "mean_ms": float(latencies.mean()) if count else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50)) if count else 0.0,
+        "p95_ms": float(np.percentile(latencies, 95)) if count else 0.0,
+        "cpu_ms_per_frame": cpu / count * 1000.0 if count else 0.0,
+        "cpu_percent": cpu / wall * 100.0 if wall else 0.0,
+        "jitter": float(np.sqrt(np.mean(second ** 2))) if len(second) else float("nan"),
+        "lag_ms": float(np.mean(lags)) * 1000.0 if lags else 0.0,
+        "error": float(np.mean(errors)) if errors else float("nan"),
+    }
+
+
+def compare_trackers(args):
+    """
+    Measure every selected backend on the same footage and print a table.
+
+    Args:
+        args (argparse.Namespace): Parsed command line
+
+    Returns:
+        dict: backend -> ``measure_tracker`` statistics
+    """
+    from pong_config import Config
+    from pong_sources import RecordedSession, open_frame_source
+
+    reference = RecordedSession(args.session) if args.session else None
+
+    def open_source():
+        if reference is not None:
+            if args.realtime and reference.video_path:
+                return open_frame_source(reference.video_path, realtime=True)
+            return reference.frame_source()
+        return open_frame_source(args.video or args.images, realtime=args.realtime)
+
+    results = {}
+    print(f"{'backend':<17}{'detect':>8}{'mean':>8}{'p50':>8}{'p95':>8}"
+          f"{'cpu/f':>8}{'cpu%':>7}{'jitter':>9}{'lag':>8}{'error':>8}")
+    for name in args.backends:
+        try:
+            tracker = create_tracker(name, Config, args.hands)
+        except (ImportError, RuntimeError, ValueError) as e:
+            print(f"{name:<17}unavailable: {e}")
+            continue
+        source = open_source()
+        if not source.isOpened():
+            print(f"Error: Could not open the footage for {name}")
+            sys.exit(1)
+        try:
+            stats = measure_tracker(tracker, source, args.frames, reference)
+        finally:
+            source.release()
+            tracker.close()
+        results[name] = stats
+        print(f"{name:<17}{stats['detection_rate']:8.1%}{stats['mean_ms']:8.2f}"
+              f"{stats['p50_ms']:8.2f}{stats['p95_ms']:8.2f}{stats['cpu_ms_per_frame']:8.2f}"
+              f"{stats['cpu_percent']:7.0f}{stats['jitter']:9.4f}{stats['lag_ms']:8.1f}"
+              f"{stats['error']:8.4f}")
+    print("(times in ms; cpu/f and cpu% include frame decoding; "
+          "jitter and error in normalized finger measure units)")
+    return results
+
+
+def parse_args(argv=None):
+    """
+    Parse the tracker comparison command line.
+
+    Args:
+        argv (list): Arguments to parse, or None for ``sys.argv``
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare hand-tracking backends on recorded footage."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--session",
+                        help="recorded session base name; its landmarks are the reference")
+    source.add_argument("--video", help="video file")
+    source.add_argument("--images", help="image directory or glob pattern")
+    parser.add_argument("--backends", nargs="+", choices=TRACKERS, default=list(TRACKERS),
+                        help="backends to compare (default: all)")
+    parser.add_argument("--frames", type=int, help="stop after this many frames")
+    parser.add_argument("--hands", type=int, choices=(1, 2), default=1,
+                        help="hands to track")
+    parser.add_argument("--realtime", action="store_true",
+                        help="deliver frames at the footage's frame rate (fair for async backends)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    compare_trackers(parse_args())
@@ -21,6 +21,6 @@ echo   - Move your index finger up/down to control the paddle
 echo   - P: Pause/unpause
 echo   - Q: Quit
 echo.
-python pong_game.py
+python pong_game.py %*
 pause
 
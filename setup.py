@@ -22,7 +22,31 @@ setup(
     long_description=long_description,
     long_description_content_type='text/markdown',
     url='https://github.com/ekagansahin/hand-controlled-pong',
-    py_modules=['pong_game'],
+    py_modules=[
+        'pong_game',
+        'pong_config',
+        'pong_pipeline',
+        'pong_simulation',
+        'pong_batch',
+        'pong_collision',
+        'pong_frames',
+        'pong_render',
+        'pong_profiler',
+        'pong_sources',
+        'pong_benchmark',
+        'pong_filters',
+        'pong_calibration',
+        'pong_ai',
+        'pong_net',
+        'pong_gestures',
+        'pong_trackers',
+        'pong_governor',
+        'pong_telemetry',
+        'pong_rl',
+        'pong_scenes',
+        'pong_replay',
+        'pong_capture',
+    ],
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: End Users/Desktop',